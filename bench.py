@@ -0,0 +1,404 @@
+import sys
+import os
+import gc
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+from itertools import count
+
+# ==== FIX DES IMPORTS ====
+CURRENT_FILE = os.path.abspath(__file__)
+PROJECT_PATH = os.path.dirname(CURRENT_FILE)
+PARENT_PATH = os.path.dirname(PROJECT_PATH)
+
+if PROJECT_PATH not in sys.path:
+    sys.path.append(PROJECT_PATH)
+if PARENT_PATH not in sys.path:
+    sys.path.append(PARENT_PATH)
+# ==========================
+
+from settings import (
+    BENCH_MIN_TIME, BENCH_REPEAT, BENCH_THRESHOLD, BENCH_BASELINE,
+    BENCH_MEMORY_THRESHOLD, BENCH_MEMORY_SLACK,
+)
+
+# ------------------------------------------------------
+# Banc d'essai des chemins chauds
+#
+# Chaque benchmark est une fonction de préparation qui renvoie l'opération
+# à mesurer (sans argument). On mesure le débit (opérations / s, médiane
+# de BENCH_REPEAT séries d'au moins BENCH_MIN_TIME s) et la mémoire
+# allouée au pic pendant une série (tracemalloc, mesuré à part).
+#
+# python main.py bench --save    : écrit la référence (BENCH_BASELINE)
+# python main.py bench           : compare à la référence, code de sortie 1
+#                                  si un débit baisse ou si un pic mémoire
+#                                  monte au-delà du seuil, 2 sans référence
+# ------------------------------------------------------
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Enregistre une fonction de préparation sous `name`."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+# ------------------------------------------------------
+# Catalogue : tirage des 3 cartes
+# ------------------------------------------------------
+def _pick_setup(side, row, col):
+    def setup():
+        from rooms_catalog import pick_random_rooms
+        from utils.rng import CounterRandom
+        rng = CounterRandom(0)
+        return lambda: pick_random_rooms(side, row, col, rng=rng)
+    return setup
+
+
+def _register_picks():
+    from utils.direction import Direction
+    from settings import MAP_ROWS, MAP_COLS
+    # case intérieure, case au bord (côté d'entrée libre), coin
+    cells = {
+        "interior": (MAP_ROWS // 2, MAP_COLS // 2),
+        "edge": (MAP_ROWS // 2, 0),
+        "corner": (0, 0),
+    }
+    for side in Direction:
+        for kind, (row, col) in cells.items():
+            benchmark(f"pick.{side.name.lower()}.{kind}")(_pick_setup(side, row, col))
+
+
+_register_picks()
+
+
+# ------------------------------------------------------
+# Règles
+# ------------------------------------------------------
+@benchmark("rules.on_enter")
+def _on_enter():
+    from models import Room, Inventory
+    from utils.rng import CounterRandom
+    room = Room("Garden", color="green")
+    inventory = Inventory()
+    rng = CounterRandom(0)
+    return lambda: room.on_enter(inventory, rng)
+
+
+def _corridor():
+    """Manoir avec une salle au-dessus du départ, ouverte des deux côtés."""
+    from maison import Maison
+    from models import Room, Door, Player, Inventory
+    from utils.direction import Direction
+    from utils.lock_state import LockState
+    maison = Maison(seed=0)
+    r, c = maison.start
+    maison.place_room(r - 1, c, Room("Hall", doors=[
+        Door(Direction.TOP, LockState.UNLOCKED),
+        Door(Direction.BOTTOM, LockState.UNLOCKED),
+    ]))
+    return maison, Player(r, c), Inventory()
+
+
+@benchmark("rules.can_move")
+def _can_move():
+    maison, player, inventory = _corridor()
+
+    def op():
+        maison.can_move(player, inventory, -1, 0)
+        maison.can_move(player, inventory, 0, 1)
+    return op
+
+
+@benchmark("rules.move")
+def _move():
+    maison, player, inventory = _corridor()
+    start_row = player.row
+
+    def op():
+        # aller-retour entre le départ et la salle du dessus
+        maison.move(player, inventory, -1 if player.row == start_row else 1, 0)
+        if inventory.steps < 10:
+            inventory.steps = 1000
+    return op
+
+
+# ------------------------------------------------------
+# Parties complètes sans affichage
+# ------------------------------------------------------
+@benchmark("game.random")
+def _game_random():
+    from simulate import play_game
+    from policies import get_policy
+    policy = get_policy("random")
+    seeds = count()
+    return lambda: play_game(next(seeds), policy)
+
+
+@benchmark("game.random.no_prune")
+def _game_random_no_prune():
+    from simulate import play_game
+    from policies import get_policy
+    policy = get_policy("random")
+    seeds = count()
+    return lambda: play_game(next(seeds), policy, end_hopeless=False)
+
+
+# ------------------------------------------------------
+# Partie perdue d'avance ? (vérifiée après chaque pas)
+# ------------------------------------------------------
+def _hopeless_setup(rows, cols):
+    def setup():
+        from engine import Engine
+        from solver import goal_reachable
+        # depuis le départ : tout le manoir sépare le joueur de l'antichambre
+        engine = Engine(0, size=(rows, cols))
+        maison, inventory, player = engine.maison, engine.inventory, engine.player
+        return lambda: goal_reachable(maison, inventory, player)
+    return setup
+
+
+def _register_hopeless():
+    from settings import MAP_ROWS, MAP_COLS
+    for rows, cols in ((MAP_ROWS, MAP_COLS), (100, 100), (1000, 1000), (3000, 3000)):
+        benchmark(f"solver.hopeless.{rows}x{cols}")(_hopeless_setup(rows, cols))
+
+
+_register_hopeless()
+
+
+# ------------------------------------------------------
+# Déplacement automatique : arbre des plus courts chemins
+# ------------------------------------------------------
+def _explored(rooms, rows=40, cols=40):
+    """Grand manoir où `rooms` salles ont été posées au hasard depuis la frontière."""
+    import random
+    from maison import Maison
+    from rooms_catalog import pick_random_rooms
+    from utils.direction import DELTAS
+    from utils.rng import CounterRandom
+    maison = Maison(seed=0, rows=rows, cols=cols)
+    rng = random.Random(0)
+    draws = CounterRandom(0)
+    for _ in range(rooms):
+        if not maison.frontier:
+            break
+        (r, c, direction), _ = rng.choice(list(maison.frontier.items()))
+        dr, dc = DELTAS[direction]
+        room = pick_random_rooms(direction, r + dr, c + dc, rng=draws, rows=rows, cols=cols)[0]
+        maison.place_room(r + dr, c + dc, room)
+    return maison
+
+
+@benchmark("path.tree.build")
+def _path_tree_build():
+    from pathing import PathTree
+    maison = _explored(600)
+    return lambda: PathTree(maison, maison.start, False, True)
+
+
+@benchmark("path.tree.add_room")
+def _path_tree_add_room():
+    from pathing import PathTree
+    maison = _explored(600)
+    tree = PathTree(maison, maison.start, False, True)
+    # dernière salle posée : on retire puis on réinsère sa case
+    r, c = maison.placements[-1]
+    label = tree.best.get((r, c))
+
+    def op():
+        if label is not None:
+            del tree.best[(r, c)]
+        tree.add_room(maison, r, c)
+    return op
+
+
+# ------------------------------------------------------
+# Rendu (pilote vidéo "dummy" de SDL)
+# ------------------------------------------------------
+def _init_display():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from settings import WIDTH, HEIGHT
+    pygame.display.init()
+    pygame.font.init()
+    return pygame.Surface((WIDTH, HEIGHT))
+
+
+@benchmark("render.maison_draw")
+def _maison_draw():
+    screen = _init_display()
+    from engine import Engine
+    from policies import get_policy
+    import random
+    # un manoir à moitié exploré
+    engine = Engine(0, end_hopeless=False)
+    policy = get_policy("random")
+    rng = random.Random(0)
+    for _ in range(40):
+        if engine.is_over():
+            break
+        engine.step(policy(engine, rng))
+    maison = engine.maison
+    return lambda: maison.draw(screen)
+
+
+@benchmark("render.draw_card")
+def _draw_card():
+    screen = _init_display()
+    from engine import Engine
+    from room_picker import RoomPicker
+    from rooms_catalog import ROOM_DEFS, _make_room
+    from utils.rng import CounterRandom
+    picker = RoomPicker(Engine(0))
+    room = _make_room(ROOM_DEFS[0], 2, CounterRandom(0))
+    return lambda: picker.draw_card(screen, room, 100, 100, True)
+
+
+# ------------------------------------------------------
+# Mesure
+# ------------------------------------------------------
+def _timed(op, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        op()
+    return time.perf_counter() - start
+
+
+def measure(setup, min_time=BENCH_MIN_TIME, repeat=BENCH_REPEAT):
+    """Débit médian (opérations / s) et pic mémoire d'une série (octets)."""
+    op = setup()
+    # calibration : assez d'opérations pour durer min_time
+    n = 1
+    while True:
+        elapsed = _timed(op, n)
+        if elapsed >= min_time / 4:
+            n = max(1, int(n * min_time / elapsed))
+            break
+        n *= 4
+
+    gc.collect()
+    rates = sorted(n / _timed(op, n) for _ in range(repeat))
+
+    tracemalloc.start()
+    _timed(op, max(1, n // 10))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"ops_per_sec": rates[len(rates) // 2], "peak_bytes": peak, "ops": n}
+
+
+def run(names=None, min_time=BENCH_MIN_TIME, repeat=BENCH_REPEAT, verbose=True):
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if names and not any(name.startswith(prefix) for prefix in names):
+            continue
+        result = measure(setup, min_time, repeat)
+        results[name] = result
+        if verbose:
+            print(f"{name:<28} {result['ops_per_sec']:>12,.0f} op/s "
+                  f"{result['peak_bytes'] / 1024:>9.1f} Kio")
+    return results
+
+
+def compare(results, baseline, threshold=BENCH_THRESHOLD,
+            memory_threshold=BENCH_MEMORY_THRESHOLD, memory_slack=BENCH_MEMORY_SLACK):
+    """
+    Régressions par rapport à la référence : [(nom, mesure, ratio)], avec
+    mesure "débit" (baisse de plus de `threshold`) ou "pic mémoire" (en
+    hausse de plus de `memory_threshold` et d'au moins `memory_slack` octets).
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None:
+            continue
+        ratio = result["ops_per_sec"] / reference["ops_per_sec"]
+        if ratio < 1 - threshold:
+            regressions.append((name, "débit", ratio))
+        peak, reference_peak = result["peak_bytes"], reference.get("peak_bytes")
+        if reference_peak is None:
+            continue
+        if (peak > reference_peak * (1 + memory_threshold)
+                and peak - reference_peak >= memory_slack):
+            regressions.append((name, "pic mémoire", peak / max(reference_peak, 1)))
+    return regressions
+
+
+def save_baseline(path, results):
+    data = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+# ------------------------------------------------------
+# Ligne de commande : python main.py bench [--save] [préfixes…]
+# ------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="bench",
+        description="Mesure les chemins chauds et les compare à une référence.",
+    )
+    parser.add_argument("names", nargs="*",
+                        help="préfixes des benchmarks à lancer (ex. pick rules)")
+    parser.add_argument("--baseline", default=BENCH_BASELINE,
+                        help="fichier JSON de référence")
+    parser.add_argument("--save", action="store_true",
+                        help="enregistrer les résultats comme nouvelle référence")
+    parser.add_argument("--threshold", type=float, default=BENCH_THRESHOLD,
+                        help="baisse de débit tolérée (0.2 = 20 %%)")
+    parser.add_argument("--memory-threshold", type=float, default=BENCH_MEMORY_THRESHOLD,
+                        help="hausse du pic mémoire tolérée (0.5 = 50 %%)")
+    parser.add_argument("--min-time", type=float, default=BENCH_MIN_TIME,
+                        help="durée minimale d'une série, en secondes")
+    parser.add_argument("--repeat", type=int, default=BENCH_REPEAT,
+                        help="nombre de séries (on garde la médiane)")
+    parser.add_argument("--list", action="store_true",
+                        help="lister les benchmarks")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name in BENCHMARKS:
+            print(name)
+        return 0
+
+    results = run(args.names, args.min_time, args.repeat)
+
+    if args.save:
+        baseline = {}
+        if args.names and os.path.exists(args.baseline):
+            # sélection partielle : on garde les autres références
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f).get("results", {})
+        baseline.update(results)
+        save_baseline(args.baseline, baseline)
+        print(f"Référence enregistrée dans {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"Pas de référence ({args.baseline}) : lancer avec --save.")
+        return 2
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    regressions = compare(results, baseline, args.threshold, args.memory_threshold)
+    for name, metric, ratio in regressions:
+        print(f"RÉGRESSION {name} : {ratio:.0%} du {metric} de référence")
+    if regressions:
+        return 1
+    print(f"Aucune régression au-delà de {args.threshold:.0%} (débit) "
+          f"et {args.memory_threshold:.0%} (mémoire).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
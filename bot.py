@@ -0,0 +1,203 @@
+import sys
+import os
+import math
+import time
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+# ==== FIX DES IMPORTS ====
+CURRENT_FILE = os.path.abspath(__file__)
+PROJECT_PATH = os.path.dirname(CURRENT_FILE)
+PARENT_PATH = os.path.dirname(PROJECT_PATH)
+
+if PROJECT_PATH not in sys.path:
+    sys.path.append(PROJECT_PATH)
+if PARENT_PATH not in sys.path:
+    sys.path.append(PARENT_PATH)
+# ==========================
+
+from engine import Engine, OUTCOME_WIN
+from policies import greedy_policy
+
+# Constante d'exploration UCT (récompenses dans [0, 1])
+UCT_C = 0.7
+# Longueur maximale d'une partie simulée depuis une feuille
+ROLLOUT_DEPTH = 60
+# Part d'actions aléatoires dans la politique de simulation
+ROLLOUT_EPSILON = 0.2
+
+
+# ------------------------------------------------------
+# Arbre de recherche
+# ------------------------------------------------------
+class _Node:
+    """
+    Nœud de décision. Chaque action mène à un nœud de hasard implicite :
+    ses enfants sont les positions obtenues (tirage des salles, verrous,
+    trouvailles de Room.on_enter), retrouvées via la table de transposition.
+    """
+    __slots__ = ("visits", "edges")
+
+    def __init__(self, actions):
+        self.visits = 0
+        # action -> [visites, somme des récompenses]
+        self.edges = {action: [0, 0.0] for action in actions}
+
+    def select(self):
+        """Action UCT (les actions jamais essayées d'abord)."""
+        log_n = math.log(self.visits + 1)
+        best, best_score = None, -1.0
+        for action, (n, total) in self.edges.items():
+            if n == 0:
+                return action
+            score = total / n + UCT_C * math.sqrt(log_n / n)
+            if score > best_score:
+                best, best_score = action, score
+        return best
+
+
+def _reward(engine):
+    """1 pour une victoire, sinon un petit bonus selon la hauteur atteinte."""
+    if engine.outcome == OUTCOME_WIN:
+        return 1.0
+    rows = engine.maison.rows
+    return 0.1 * (rows - 1 - engine.player.row) / max(1, rows - 1)
+
+
+def _rollout(engine, rng):
+    for _ in range(ROLLOUT_DEPTH):
+        if engine.is_over():
+            break
+        if rng.random() < ROLLOUT_EPSILON:
+            action = rng.choice(engine.legal_actions())
+        else:
+            action = greedy_policy(engine, rng)
+        engine.step(action)
+    return _reward(engine)
+
+
+def search(root, time_budget, seed=0, iterations=None):
+    """
+    MCTS depuis l'instantané `root` pendant `time_budget` secondes (ou
+    `iterations` itérations). Chaque itération rejoue la position avec un
+    nouveau hasard, ce qui échantillonne les nœuds de hasard.
+
+    Renvoie les statistiques de la racine : {action: (visites, somme)}.
+    """
+    rng = random.Random(seed)
+    engine = Engine(end_hopeless=False)
+    table = {}
+
+    engine.restore(root)
+    root_node = _Node(engine.legal_actions())
+    table[root] = root_node
+
+    deadline = time.perf_counter() + time_budget
+    done = 0
+    while True:
+        if iterations is not None:
+            if done >= iterations:
+                break
+        elif time.perf_counter() >= deadline:
+            break
+        done += 1
+
+        engine.restore(root)
+        engine.reseed(rng.getrandbits(64))
+
+        node = root_node
+        path = []
+        while True:
+            if engine.is_over():
+                reward = _reward(engine)
+                break
+            action = node.select()
+            path.append((node, action))
+            engine.step(action)
+
+            state = engine.snapshot()
+            child = table.get(state)
+            if child is None:
+                table[state] = _Node(engine.legal_actions())
+                reward = _rollout(engine, rng)
+                break
+            node = child
+
+        for visited, action in path:
+            visited.visits += 1
+            edge = visited.edges[action]
+            edge[0] += 1
+            edge[1] += reward
+
+    return {action: tuple(edge) for action, edge in root_node.edges.items()}
+
+
+def _search_task(args):
+    root, time_budget, seed, iterations = args
+    return search(root, time_budget, seed, iterations)
+
+
+# ------------------------------------------------------
+# Bot
+# ------------------------------------------------------
+class MCTSBot:
+    """
+    Joueur automatique : choisit la direction (phase carte) et la carte
+    (phase de tirage) par MCTS.
+
+    - time_budget : temps de réflexion par coup, en secondes ;
+    - workers : recherches indépendantes en parallèle sur un pool de
+      processus (parallélisme à la racine), fusionnées par visites.
+    """
+
+    def __init__(self, time_budget=0.02, workers=1, seed=0, iterations=None):
+        self.time_budget = time_budget
+        self.workers = workers
+        self.iterations = iterations
+        self.rng = random.Random(seed)
+        self.pool = None
+        if workers > 1:
+            self.pool = ProcessPoolExecutor(max_workers=workers)
+
+    def choose(self, engine):
+        actions = engine.legal_actions()
+        if len(actions) == 1:
+            return actions[0]
+
+        root = engine.snapshot()
+        tasks = [
+            (root, self.time_budget, self.rng.getrandbits(64), self.iterations)
+            for _ in range(self.workers)
+        ]
+        if self.pool is None:
+            results = [_search_task(tasks[0])]
+        else:
+            results = list(self.pool.map(_search_task, tasks))
+
+        visits = {}
+        for stats in results:
+            for action, (n, _) in stats.items():
+                visits[action] = visits.get(action, 0) + n
+        return max(actions, key=lambda a: visits.get(a, 0))
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_POLICY_BOT = None
+
+
+def mcts_policy(engine, rng):
+    """Politique pour simulate : un bot MCTS mono-processus par worker."""
+    global _POLICY_BOT
+    if _POLICY_BOT is None:
+        _POLICY_BOT = MCTSBot(seed=rng.getrandbits(32))
+    return _POLICY_BOT.choose(engine)
@@ -0,0 +1,74 @@
+from settings import TILE_SIZE, CAMERA_MARGIN
+
+
+# ------------------------------------------------------
+# Caméra : fenêtre de cases visibles sur un grand manoir
+# ------------------------------------------------------
+class Camera:
+    """
+    Fenêtre de view_rows x view_cols cases sur un manoir rows x cols.
+    (row, col) est la case affichée en haut à gauche ; la caméra défile
+    quand le joueur s'approche à moins de `margin` cases d'un bord.
+    Un manoir plus petit que la fenêtre est affiché en entier, sans défiler.
+    """
+    __slots__ = ("rows", "cols", "view_rows", "view_cols", "margin", "row", "col")
+
+    def __init__(self, view_rows, view_cols, rows, cols, margin=CAMERA_MARGIN):
+        self.rows = rows
+        self.cols = cols
+        self.view_rows = min(view_rows, rows)
+        self.view_cols = min(view_cols, cols)
+        # la marge ne peut pas dépasser la moitié de la fenêtre
+        self.margin = max(0, min(margin, (min(self.view_rows, self.view_cols) - 1) // 2))
+        self.row = 0
+        self.col = 0
+
+    def center_on(self, r, c):
+        self.row = self._clamp(r - self.view_rows // 2, self.rows - self.view_rows)
+        self.col = self._clamp(c - self.view_cols // 2, self.cols - self.view_cols)
+
+    def follow(self, r, c):
+        """Fait défiler la vue pour garder (r, c) loin des bords ; vrai si elle a bougé."""
+        row, col = self.row, self.col
+        m = self.margin
+        if r < row + m:
+            row = r - m
+        elif r > row + self.view_rows - 1 - m:
+            row = r - self.view_rows + 1 + m
+        if c < col + m:
+            col = c - m
+        elif c > col + self.view_cols - 1 - m:
+            col = c - self.view_cols + 1 + m
+        row = self._clamp(row, self.rows - self.view_rows)
+        col = self._clamp(col, self.cols - self.view_cols)
+
+        moved = (row, col) != (self.row, self.col)
+        self.row, self.col = row, col
+        return moved
+
+    @staticmethod
+    def _clamp(value, high):
+        return max(0, min(value, high))
+
+    # --------------------------------------------------
+    def visible_cells(self):
+        """Cases visibles, ligne par ligne."""
+        for r in range(self.row, self.row + self.view_rows):
+            for c in range(self.col, self.col + self.view_cols):
+                yield r, c
+
+    def contains(self, r, c):
+        return (self.row <= r < self.row + self.view_rows
+                and self.col <= c < self.col + self.view_cols)
+
+    def to_screen(self, r, c):
+        """Coin haut-gauche de la case (r, c) à l'écran, en pixels."""
+        return (c - self.col) * TILE_SIZE, (r - self.row) * TILE_SIZE
+
+    def from_screen(self, x, y):
+        """Case visible sous le pixel (x, y), ou None."""
+        if x < 0 or y < 0:
+            return None
+        r = self.row + y // TILE_SIZE
+        c = self.col + x // TILE_SIZE
+        return (r, c) if self.contains(r, c) else None
@@ -0,0 +1,135 @@
+import sys
+import struct
+from array import array
+
+# ------------------------------------------------------
+# Stockage creux de la grille, par blocs
+#
+# La grille est découpée en blocs de CHUNK_SIZE x CHUNK_SIZE cases, chacun
+# un array('I') de codes de case. Un bloc n'est alloué qu'à la première
+# salle posée dedans : la mémoire suit la partie explorée, pas la taille
+# du manoir. Un petit manoir tient dans un seul bloc à sa taille exacte.
+# ------------------------------------------------------
+CHUNK_SIZE = 32
+
+_HEADER = struct.Struct("<3i")
+_CHUNK_KEY = struct.Struct("<I")
+# les blocs sont sérialisés en petit-boutiste, quelle que soit la machine
+_SWAP = sys.byteorder == "big"
+
+
+class ChunkedCells:
+    """Codes de case d'un manoir rows x cols (0 = case vide)."""
+    __slots__ = (
+        "rows", "cols", "chunk_rows", "chunk_cols", "stride", "chunks", "count", "flat",
+    )
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.chunk_rows = min(CHUNK_SIZE, rows)
+        self.chunk_cols = min(CHUNK_SIZE, cols)
+        # nombre de blocs par ligne de blocs
+        self.stride = -(-cols // self.chunk_cols)
+        self.chunks = {}
+        # nombre de cases non vides
+        self.count = 0
+        # manoir d'un seul bloc : alloué d'emblée et lu directement
+        self.flat = None
+        if rows <= CHUNK_SIZE and cols <= CHUNK_SIZE:
+            self.flat = self._new_chunk(0)
+
+    def _new_chunk(self, key):
+        chunk = array("I", bytes(4 * self.chunk_rows * self.chunk_cols))
+        self.chunks[key] = chunk
+        return chunk
+
+    # --------------------------------------------------
+    def get(self, r, c):
+        flat = self.flat
+        if flat is not None:
+            return flat[r * self.cols + c]
+        cr, ir = divmod(r, self.chunk_rows)
+        cc, ic = divmod(c, self.chunk_cols)
+        chunk = self.chunks.get(cr * self.stride + cc)
+        if chunk is None:
+            return 0
+        return chunk[ir * self.chunk_cols + ic]
+
+    def set(self, r, c, code):
+        cr, ir = divmod(r, self.chunk_rows)
+        cc, ic = divmod(c, self.chunk_cols)
+        key = cr * self.stride + cc
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            if code == 0:
+                return
+            chunk = self._new_chunk(key)
+        i = ir * self.chunk_cols + ic
+        if not chunk[i]:
+            self.count += code != 0
+        elif not code:
+            self.count -= 1
+        chunk[i] = code
+
+    def items(self):
+        """(r, c, code) de toutes les cases non vides."""
+        for key, chunk in self.chunks.items():
+            cr, cc = divmod(key, self.stride)
+            r0, c0 = cr * self.chunk_rows, cc * self.chunk_cols
+            for i, code in enumerate(chunk):
+                if code:
+                    ir, ic = divmod(i, self.chunk_cols)
+                    yield r0 + ir, c0 + ic, code
+
+    def __len__(self):
+        return self.count
+
+    def map_codes(self, convert):
+        """Remplace chaque code non nul par `convert(code)`, sur place."""
+        for chunk in self.chunks.values():
+            for i, code in enumerate(chunk):
+                if code:
+                    chunk[i] = convert(code)
+
+    @property
+    def nbytes(self):
+        """Mémoire occupée par les blocs alloués."""
+        return sum(chunk.itemsize * len(chunk) for chunk in self.chunks.values())
+
+    # --------------------------------------------------
+    def tobytes(self):
+        """
+        Forme canonique compacte (taille, nombre de salles, blocs triés,
+        codes en petit-boutiste) : deux grilles égales donnent les mêmes
+        octets, ce qui sert au hash des instantanés.
+        """
+        parts = [_HEADER.pack(self.rows, self.cols, self.count)]
+        for key in sorted(self.chunks):
+            chunk = self.chunks[key]
+            if _SWAP:
+                chunk = array("I", chunk)
+                chunk.byteswap()
+            parts.append(_CHUNK_KEY.pack(key))
+            parts.append(chunk.tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def frombytes(cls, data):
+        rows, cols, count = _HEADER.unpack_from(data)
+        cells = cls(rows, cols)
+        cells.count = count
+        size = 4 * cells.chunk_rows * cells.chunk_cols
+        pos = _HEADER.size
+        while pos < len(data):
+            (key,) = _CHUNK_KEY.unpack_from(data, pos)
+            pos += _CHUNK_KEY.size
+            chunk = array("I")
+            chunk.frombytes(data[pos:pos + size])
+            if _SWAP:
+                chunk.byteswap()
+            pos += size
+            cells.chunks[key] = chunk
+        if cells.flat is not None:
+            cells.flat = cells.chunks[0]
+        return cells
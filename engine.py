@@ -0,0 +1,311 @@
+import sys
+import os
+
+# ==== FIX DES IMPORTS ====
+CURRENT_FILE = os.path.abspath(__file__)
+PROJECT_PATH = os.path.dirname(CURRENT_FILE)
+PARENT_PATH = os.path.dirname(PROJECT_PATH)
+
+if PROJECT_PATH not in sys.path:
+    sys.path.append(PROJECT_PATH)
+if PARENT_PATH not in sys.path:
+    sys.path.append(PARENT_PATH)
+# ==========================
+
+from maison import Maison
+from models import Player, Inventory
+from rooms_catalog import pick_random_rooms
+from snapshot import GameState
+from settings import END_HOPELESS_RUNS, MAP_ROWS, MAP_COLS
+from utils.direction import DELTAS
+from utils.rng import RngService, ROOM_DRAW, LOOT
+from utils.door_bits import door_level, cell_doors
+from events import (
+    EventBus, DoorOpened, KeySpent, MoveBlocked, RoomPlaced, NotEnoughGems,
+    RoomsRerolled, GameOver,
+)
+
+
+# ------------------------------------------------------
+# Phases de la partie
+# ------------------------------------------------------
+PHASE_MAP = "MAP"        # le joueur choisit une direction
+PHASE_PICK = "PICK"      # le joueur choisit une salle parmi 3 cartes
+PHASE_OVER = "OVER"      # partie terminée
+
+# Issues possibles
+OUTCOME_WIN = "WIN"
+OUTCOME_NO_STEPS = "NO_STEPS"
+OUTCOME_STUCK = "STUCK"
+OUTCOME_HOPELESS = "HOPELESS"    # antichambre devenue inatteignable
+
+# Types d'actions : (MOVE, Direction), (PICK, index), (REROLL,)
+MOVE = "MOVE"
+PICK = "PICK"
+REROLL = "REROLL"
+
+
+def draw_rooms_for(key):
+    """Calcule le tirage identifié par `Engine.draw_key` (sans toucher au moteur)."""
+    seed, r, c, direction, index, rows, cols = key
+    stream = RngService(seed).stream(ROOM_DRAW, r, c, index=index)
+    return pick_random_rooms(direction, r, c, rng=stream, rows=rows, cols=cols)
+
+
+# ------------------------------------------------------
+# ENGINE (règles du jeu, sans pygame)
+# ------------------------------------------------------
+class Engine:
+    """
+    Moteur de jeu sans affichage.
+
+    Il regroupe le manoir, le joueur et l'inventaire et expose une API
+    par étapes : `reset(seed)`, `legal_actions()` et `step(action)`.
+    `Game` et `RoomPicker` ne sont que des interfaces pygame au-dessus.
+
+    Ce qui se passe (trouvailles, portes, salles posées, fin de partie)
+    est publié sur `self.events` ; sans sink abonné, rien n'est construit.
+    """
+
+    def __init__(self, seed=None, end_hopeless=END_HOPELESS_RUNS, rng=None, events=None,
+                 size=None):
+        # arrêt anticipé des parties perdues d'avance
+        self.end_hopeless = end_hopeless
+        # taille du manoir (lignes, colonnes)
+        self.size = tuple(size) if size is not None else (MAP_ROWS, MAP_COLS)
+        self.events = events if events is not None else EventBus()
+        # tirages calculés d'avance (voir pregen.py) : draw_key -> salles
+        self.prefetched = {}
+        self.maison = None
+        self.player = None
+        self.inventory = None
+        self.reset(seed, rng)
+
+    # --------------------------------------------------
+    def reset(self, seed=None, rng=None):
+        """
+        Recommence une partie. Une même graine rejoue la même partie ; sans
+        graine, elle est tirée au hasard et gardée dans `self.seed`.
+        `rng` permet d'injecter un RngService déjà construit.
+        """
+        if rng is None:
+            rng = RngService(seed)
+        self.seed = rng.seed
+        self.maison = Maison(rng=rng, rows=self.size[0], cols=self.size[1])
+        self.player = Player(*self.maison.start)
+        self.inventory = Inventory()
+
+        self.phase = PHASE_MAP
+        self.outcome = None
+        # Nombre de pas consommés depuis le début de la partie
+        self.steps_used = 0
+        # Nombre de tirages de salles (nouvelle case ou relance)
+        self.draws = 0
+
+        # Tirage en cours (phase PICK)
+        self.pending_rooms = []
+        self.pending_cell = None
+        self.pending_dir = None
+
+        self._check_end()
+        return self
+
+    @property
+    def rng(self):
+        """Service de hasard utilisé pour tous les tirages de la partie."""
+        return self.maison.rng
+
+    def reseed(self, seed):
+        """
+        Remplace la suite des tirages à venir (sans toucher à l'état du
+        plateau) : utile pour échantillonner d'autres hasards possibles.
+        """
+        self.rng.reseed(seed)
+
+    def is_over(self):
+        return self.phase == PHASE_OVER
+
+    def snapshot(self):
+        """Instantané léger de la partie (voir snapshot.GameState)."""
+        return GameState.capture(self)
+
+    def restore(self, state):
+        """Revient à un instantané pris avec `snapshot()`."""
+        return state.restore(self)
+
+    # --------------------------------------------------
+    def legal_actions(self):
+        """Liste des actions jouables dans l'état courant."""
+        if self.phase == PHASE_MAP:
+            actions = []
+            for direction, (dr, dc) in DELTAS.items():
+                if self.maison.can_move(self.player, self.inventory, dr, dc):
+                    actions.append((MOVE, direction))
+            return actions
+
+        if self.phase == PHASE_PICK:
+            actions = [
+                (PICK, i)
+                for i, room in enumerate(self.pending_rooms)
+                if room.cost <= self.inventory.gems
+            ]
+            if self.inventory.dice > 0:
+                actions.append((REROLL,))
+            return actions
+
+        return []
+
+    # --------------------------------------------------
+    def step(self, action):
+        """
+        Applique une action et renvoie un code décrivant ce qui s'est passé :
+        "MOVED", "NEW_ROOM", "BLOCKED", "PLACED", "NOT_ENOUGH_GEMS",
+        "REROLLED", "NO_DICE" ou "INVALID".
+        """
+        kind = action[0]
+
+        if self.phase == PHASE_MAP and kind == MOVE:
+            return self._step_move(action[1])
+
+        if self.phase == PHASE_PICK and kind == PICK:
+            return self._step_pick(action[1])
+
+        if self.phase == PHASE_PICK and kind == REROLL:
+            return self._step_reroll()
+
+        return "INVALID"
+
+    def _step_move(self, direction):
+        dr, dc = DELTAS[direction]
+        row, col = self.player.row, self.player.col
+        keys = self.inventory.keys
+        result = self.maison.move(self.player, self.inventory, dr, dc)
+
+        if self.events.active and result is not False:
+            self._emit_door(row, col, direction, keys)
+
+        # ---- CAS 1 : déplacement vers une salle déjà existante ----
+        if result is True:
+            self.steps_used += 1
+            self._check_end()
+            return "MOVED"
+
+        # ---- CAS 2 : nouvelle salle → tirage de 3 cartes ----
+        if isinstance(result, tuple) and result[0] == "NEW_ROOM":
+            r, c = result[1], result[2]
+            self.phase = PHASE_PICK
+            self.pending_cell = (r, c)
+            self.pending_dir = direction
+            self.pending_rooms = self._draw_rooms()
+            self._check_end()
+            return "NEW_ROOM"
+
+        # ---- CAS 3 : déplacement impossible ----
+        if self.events.active:
+            self.events.emit(MoveBlocked(row, col, direction))
+        return "BLOCKED"
+
+    def _emit_door(self, row, col, direction, keys_before):
+        level = door_level(cell_doors(self.maison.code_at(row, col)), direction)
+        self.events.emit(DoorOpened(row, col, direction, level))
+        if self.inventory.keys < keys_before:
+            self.events.emit(KeySpent(row, col, direction, self.inventory.keys))
+
+    def _step_pick(self, index):
+        room = self.pending_rooms[index]
+        if room.cost > self.inventory.gems:
+            if self.events.active:
+                self.events.emit(NotEnoughGems(room.cost, self.inventory.gems))
+            return "NOT_ENOUGH_GEMS"
+        if room.cost > 0:
+            self.inventory.gems -= room.cost
+
+        # on place la nouvelle salle et on s'y déplace
+        r, c = self.pending_cell
+        self.maison.place_room(r, c, room)
+        self.player.row = r
+        self.player.col = c
+        self.inventory.use_step()
+        self.steps_used += 1
+        if self.events.active:
+            self.events.emit(RoomPlaced(r, c, room.name, room.cost))
+        # effets d'entrée dans la nouvelle pièce
+        room.on_enter(self.inventory, self.rng.stream(LOOT, r, c), self.events)
+
+        self._clear_pending()
+        self._check_end()
+        return "PLACED"
+
+    def _step_reroll(self):
+        if self.inventory.dice <= 0:
+            return "NO_DICE"
+        self.inventory.dice -= 1
+        self.pending_rooms = self._draw_rooms()
+        if self.events.active:
+            self.events.emit(RoomsRerolled(self.inventory.dice))
+        self._check_end()
+        return "REROLLED"
+
+    def cancel_pick(self):
+        """
+        Abandonne le tirage en cours (fenêtre du sélecteur fermée).
+        La porte reste ouverte mais aucune salle n'est posée.
+        """
+        if self.phase != PHASE_PICK:
+            return
+        self._clear_pending()
+        self._check_end()
+
+    # --------------------------------------------------
+    def draw_key(self, r, c, direction):
+        """
+        Tout ce dont dépend le prochain tirage de la case (r, c) entrée en
+        allant vers `direction` : deux tirages de même clé sont identiques.
+        """
+        return (self.rng.seed, r, c, direction,
+                self.rng.next_index(ROOM_DRAW, r, c), self.maison.rows, self.maison.cols)
+
+    def _draw_rooms(self):
+        r, c = self.pending_cell
+        self.draws += 1
+        if self.prefetched:
+            rooms = self.prefetched.pop(self.draw_key(r, c, self.pending_dir), None)
+            if rooms is not None:
+                # la case compte ce tirage comme s'il venait d'être fait
+                self.rng.stream(ROOM_DRAW, r, c)
+                return rooms
+        stream = self.rng.stream(ROOM_DRAW, r, c)
+        return pick_random_rooms(
+            self.pending_dir, r, c, rng=stream,
+            rows=self.maison.rows, cols=self.maison.cols,
+        )
+
+    def _clear_pending(self):
+        self.phase = PHASE_MAP
+        self.pending_rooms = []
+        self.pending_cell = None
+        self.pending_dir = None
+
+    def _check_end(self):
+        """Met à jour la phase si la partie est gagnée ou perdue."""
+        if (self.player.row, self.player.col) == self.maison.goal:
+            self._finish(OUTCOME_WIN)
+        elif self.inventory.steps <= 0:
+            self._finish(OUTCOME_NO_STEPS)
+        elif self.phase == PHASE_MAP:
+            # aucune porte de la frontière ni l'antichambre atteignables
+            if not self.maison.can_progress(self.player, self.inventory):
+                self._finish(OUTCOME_STUCK)
+            elif self.end_hopeless and not self.maison.goal_reachable(
+                self.player, self.inventory
+            ):
+                self._finish(OUTCOME_HOPELESS)
+        elif not self.legal_actions():
+            # aucune carte abordable et pas de dé
+            self._finish(OUTCOME_STUCK)
+
+    def _finish(self, outcome):
+        self.phase = PHASE_OVER
+        self.outcome = outcome
+        if self.events.active:
+            self.events.emit(GameOver(outcome, self.steps_used))
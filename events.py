@@ -0,0 +1,282 @@
+from collections import deque
+from enum import Enum
+
+# ------------------------------------------------------
+# Événements de jeu
+#
+# Les règles ne font plus de print() : elles émettent des événements
+# typés sur le bus du moteur, et ce sont les "sinks" abonnés qui décident
+# quoi en faire (rien, console, fichier, journal à l'écran).
+# ------------------------------------------------------
+class GameEvent:
+    """Événement de base : `text()` donne le message pour le joueur."""
+    __slots__ = ()
+
+    def text(self):
+        return ""
+
+    def to_dict(self):
+        data = {"type": type(self).__name__}
+        for field in self.__slots__:
+            value = getattr(self, field)
+            data[field] = value.name if isinstance(value, Enum) else value
+        return data
+
+    def __repr__(self):
+        fields = ", ".join(f"{f}={getattr(self, f)!r}" for f in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class LootFound(GameEvent):
+    """Trouvaille en entrant dans une salle (voir loot.py)."""
+    __slots__ = ("room", "field", "amount", "message")
+
+    def __init__(self, room, field, amount, message):
+        self.room = room
+        self.field = field          # champ de l'inventaire modifié
+        self.amount = amount        # quantité, ou True pour un objet permanent
+        self.message = message
+
+    def text(self):
+        return self.message.format(name=self.room)
+
+
+class DoorOpened(GameEvent):
+    __slots__ = ("row", "col", "direction", "level")
+
+    def __init__(self, row, col, direction, level):
+        self.row = row
+        self.col = col
+        self.direction = direction
+        self.level = level          # 0, 1 ou 2
+
+
+class KeySpent(GameEvent):
+    __slots__ = ("row", "col", "direction", "keys_left")
+
+    def __init__(self, row, col, direction, keys_left):
+        self.row = row
+        self.col = col
+        self.direction = direction
+        self.keys_left = keys_left
+
+    def text(self):
+        return f"Vous utilisez une clé ({self.keys_left} restante(s))."
+
+
+class MoveBlocked(GameEvent):
+    __slots__ = ("row", "col", "direction")
+
+    def __init__(self, row, col, direction):
+        self.row = row
+        self.col = col
+        self.direction = direction
+
+    def text(self):
+        return ("Déplacement impossible dans cette direction "
+                "(pas de porte, porte verrouillée ou bord de la carte).")
+
+
+class RoomPlaced(GameEvent):
+    __slots__ = ("row", "col", "room", "cost")
+
+    def __init__(self, row, col, room, cost):
+        self.row = row
+        self.col = col
+        self.room = room
+        self.cost = cost
+
+    def text(self):
+        if self.cost > 0:
+            return f"{self.room} posée : {self.cost} gemme(s) dépensée(s)."
+        return ""
+
+
+class NotEnoughGems(GameEvent):
+    __slots__ = ("cost", "gems")
+
+    def __init__(self, cost, gems):
+        self.cost = cost
+        self.gems = gems
+
+    def text(self):
+        return "Pas assez de gemmes pour cette salle."
+
+
+class RoomsRerolled(GameEvent):
+    __slots__ = ("dice_left",)
+
+    def __init__(self, dice_left):
+        self.dice_left = dice_left
+
+    def text(self):
+        return "Nouveau tirage de salles (dé dépensé)."
+
+
+class ShopPurchase(GameEvent):
+    """Passage au magasin (spent = 0 : rien acheté)."""
+    __slots__ = ("spent", "keys", "steps")
+
+    def __init__(self, spent, keys, steps):
+        self.spent = spent
+        self.keys = keys
+        self.steps = steps
+
+    def text(self):
+        if self.spent == 0:
+            # import tardif : models importe ce module
+            from models import SHOP_PRICES
+            return ("Le magasin est silencieux : vous n'avez pas assez de pièces "
+                    f"({SHOP_PRICES['key']} pour une clé, {SHOP_PRICES['steps_pack']} "
+                    f"pour {SHOP_PRICES['steps_per_pack']} pas).")
+        bought = []
+        if self.keys:
+            bought.append(f"{self.keys} clé(s)")
+        if self.steps:
+            bought.append(f"{self.steps} pas")
+        return f"Vous dépensez {self.spent} pièce(s) au magasin : {' et '.join(bought)}."
+
+
+_OUTCOME_TEXT = {
+    "WIN": "VICTOIRE ! Vous avez atteint l'Antechamber.",
+    "NO_STEPS": "PERDU - Plus de pas !",
+    "STUCK": "PERDU - Vous êtes bloqué, aucune porte ne peut être ouverte.",
+    "HOPELESS": "PERDU - L'antichambre n'est plus atteignable.",
+}
+
+
+class GameOver(GameEvent):
+    __slots__ = ("outcome", "steps_used")
+
+    def __init__(self, outcome, steps_used):
+        self.outcome = outcome
+        self.steps_used = steps_used
+
+    def text(self):
+        return _OUTCOME_TEXT.get(self.outcome, "")
+
+
+class Notice(GameEvent):
+    """Message d'interface sans effet sur la partie."""
+    __slots__ = ("message",)
+
+    def __init__(self, message):
+        self.message = message
+
+    def text(self):
+        return self.message
+
+
+# ------------------------------------------------------
+# Sinks
+# ------------------------------------------------------
+class NullSink:
+    """Ignore tout (simulations) : le bus ne construit même plus les événements."""
+    enabled = False
+
+    def handle(self, event):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class ConsoleSink(NullSink):
+    """Affiche le message de chaque événement dans la console."""
+    enabled = True
+
+    def handle(self, event):
+        text = event.text()
+        if text:
+            print(text)
+
+
+class FileSink(NullSink):
+    """
+    Écrit les événements en JSON (une ligne par événement) par paquets de
+    `batch_size` lignes, au lieu d'une écriture par événement.
+    """
+    enabled = True
+
+    def __init__(self, path, batch_size=256):
+        self.file = open(path, "a", encoding="utf-8")
+        self.batch_size = batch_size
+        self.buffer = []
+
+    def handle(self, event):
+        import json
+        self.buffer.append(json.dumps(event.to_dict(), ensure_ascii=False))
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.file.write("\n".join(self.buffer) + "\n")
+            self.buffer.clear()
+        self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.flush()
+            self.file.close()
+            self.file = None
+
+
+class MessageLog(NullSink):
+    """Derniers messages, pour le journal affiché à l'écran."""
+    enabled = True
+
+    def __init__(self, maxlen=6):
+        self.lines = deque(maxlen=maxlen)
+        # augmente à chaque nouveau message (pour ne redessiner qu'au besoin)
+        self.version = 0
+
+    def handle(self, event):
+        text = event.text()
+        if text:
+            self.lines.append(text)
+            self.version += 1
+
+
+# ------------------------------------------------------
+# Bus
+# ------------------------------------------------------
+class EventBus:
+    """
+    Distribue les événements aux sinks abonnés.
+
+    `active` est faux tant qu'aucun sink ne veut d'événements : les
+    émetteurs testent ce drapeau avant de construire l'événement, ce qui
+    rend le bus gratuit pendant les simulations.
+    """
+    __slots__ = ("sinks", "active")
+
+    def __init__(self, sinks=()):
+        self.sinks = []
+        self.active = False
+        for sink in sinks:
+            self.subscribe(sink)
+
+    def subscribe(self, sink):
+        self.sinks.append(sink)
+        self.active = any(s.enabled for s in self.sinks)
+        return sink
+
+    def unsubscribe(self, sink):
+        self.sinks.remove(sink)
+        self.active = any(s.enabled for s in self.sinks)
+
+    def emit(self, event):
+        for sink in self.sinks:
+            sink.handle(event)
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
@@ -1,5 +1,6 @@
 import sys
 import os
+import time
 import pygame
 
 # ==== FIX PATH ====
@@ -14,181 +15,249 @@ if PARENT_PATH not in sys.path:
 # ===================
 
 from settings import *
-from maison import Maison
-from models import Player, Inventory
+from engine import Engine, MOVE
 from utils.direction import Direction
+from events import EventBus, ConsoleSink, MessageLog, Notice
+from utils.input import next_events, DRAW_READY, WALK_STEP
+from utils.fonts import preload_fonts
+from utils.startup import STARTUP
 
 
 class Game:
-    def __init__(self):
-        pygame.init()
+    def __init__(self, seed=None, record=RECORD_REPLAYS, trace=None, startup_report=False,
+                 log_console=LOG_TO_CONSOLE):
+        STARTUP.mark("imports")
+        # seulement l'affichage et les polices (pas d'audio, de manettes…)
+        pygame.display.init()
+        pygame.font.init()
+        STARTUP.mark("display init")
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("Projet POO - Manoir")
         self.clock = pygame.time.Clock()
+        STARTUP.mark("window")
+        preload_fonts()
+        STARTUP.mark("fonts")
+        # rapport des temps de démarrage après la première image
+        self.startup_report = startup_report
 
-        self.maison = Maison()
-        self.player = Player(MAP_ROWS - 1, MAP_COLS // 2)
-        self.inventory = Inventory()
+        # Messages de la partie : journal à l'écran (+ console)
+        self.message_log = MessageLog(MESSAGE_LOG_LINES)
+        self.events = EventBus([self.message_log])
+        if log_console:
+            self.events.subscribe(ConsoleSink())
+
+        # Toutes les règles passent par le moteur sans affichage
+        self.engine = Engine(seed, events=self.events)
 
         # Direction courante choisie avec ZQSD
         self.selected_direction = None
 
-    # ---------------------------------------------------
-    def draw_direction_arrow(self):
-        """Dessine une flèche dans la direction sélectionnée."""
-        if self.selected_direction is None:
-            return
+        # Bot MCTS qui joue à la place du joueur (touche B)
+        self.bot = None
+
+        # Déplacement automatique vers une salle cliquée (voir pathing.py),
+        # chemins créés au premier clic
+        self.paths = None
+        self.walk = []
+
+        # Modules d'affichage importés ici : "import game" reste léger
+        from renderer import MapRenderer
+        from scenes import SceneStack, MapScene
+        from profiler import FrameProfiler, ProfilerOverlay
+
+        # Rendu incrémental de la carte (fond en cache + zones modifiées)
+        self.renderer = MapRenderer(self.screen, self.maison, self.message_log)
+
+        # Enregistrement des entrées (rejouable avec python main.py replay)
+        self.recorder = None
+        if record:
+            from replay import ReplayRecorder
+            name = f"{time.strftime('%Y%m%d-%H%M%S')}-{self.engine.seed}.replay"
+            self.recorder = ReplayRecorder(os.path.join(REPLAY_DIR, name), self.engine)
+
+        # Temps de chaque phase de l'image (calque : F3, trace sur disque)
+        self.profiler = FrameProfiler(trace_path=trace or PROFILE_TRACE)
+        self.profiler_overlay = ProfilerOverlay(self.profiler)
+
+        # Tirages des portes atteignables calculés en tâche de fond
+        self.prefetcher = None
+        if PREGEN_DRAWS:
+            from pregen import DrawPrefetcher
+            self.prefetcher = DrawPrefetcher(
+                self.engine, on_ready=self._draw_ready, render=self._prerender_cards
+            )
 
-        x = self.player.col * TILE_SIZE + TILE_SIZE // 2
-        y = self.player.row * TILE_SIZE + TILE_SIZE // 2
-
-        if self.selected_direction == Direction.TOP:
-            end = (x, y - TILE_SIZE // 2)
-        elif self.selected_direction == Direction.BOTTOM:
-            end = (x, y + TILE_SIZE // 2)
-        elif self.selected_direction == Direction.LEFT:
-            end = (x - TILE_SIZE // 2, y)
-        elif self.selected_direction == Direction.RIGHT:
-            end = (x + TILE_SIZE // 2, y)
-        else:
-            return
+        # Écrans du jeu : carte, puis sélecteur / fin de partie par-dessus
+        self.scenes = SceneStack()
+        self.scenes.push(MapScene(self))
+        STARTUP.mark("game setup")
+
+    @property
+    def maison(self):
+        return self.engine.maison
 
-        pygame.draw.line(self.screen, WHITE, (x, y), end, 5)
+    @property
+    def player(self):
+        return self.engine.player
+
+    @property
+    def inventory(self):
+        return self.engine.inventory
 
     # ---------------------------------------------------
+    def select_direction(self, direction):
+        self.selected_direction = direction
+        if self.recorder is not None:
+            from replay import OP_DIR
+            self.recorder.record(OP_DIR, direction.value)
+
     def try_move(self):
         """Valide le déplacement lorsqu'on appuie sur ESPACE."""
+        if self.recorder is not None:
+            from replay import OP_CONFIRM
+            self.recorder.record(OP_CONFIRM)
+
         if self.selected_direction is None:
-            print("Choisis d'abord une direction avec Z, Q, S ou D.")
+            if self.recorder is not None:
+                self.recorder.checkpoint(None, 0)
+            self.events.emit(Notice("Choisis d'abord une direction avec Z, Q, S ou D."))
             return
 
-        # Traduire la direction en (dr, dc)
-        dr = dc = 0
-        if self.selected_direction == Direction.TOP:
-            dr = -1
-        elif self.selected_direction == Direction.BOTTOM:
-            dr = 1
-        elif self.selected_direction == Direction.LEFT:
-            dc = -1
-        elif self.selected_direction == Direction.RIGHT:
-            dc = 1
-
-        result = self.maison.move(self.player, self.inventory, dr, dc)
+        result = self.engine.step((MOVE, self.selected_direction))
+        if result == "BLOCKED":
+            # on force le joueur à re-choisir une direction
+            self.selected_direction = None
+        if self.recorder is not None:
+            self.recorder.checkpoint(self.selected_direction, 0)
 
         # ---- CAS 1 : déplacement vers une salle déjà existante ----
-        if result is True:
-            return
+        if result == "MOVED":
+            return result
 
         # ---- CAS 2 : création d'une nouvelle salle ----
-        if isinstance(result, tuple) and result[0] == "NEW_ROOM":
-            r, c = result[1], result[2]
-
+        if result == "NEW_ROOM":
             from room_picker import RoomPicker
-            picker = RoomPicker(self.inventory, self.selected_direction, r, c)
-            choice = picker.run(self.screen)
-
-            if choice:
-                # on place la nouvelle room
-                self.maison.grid[r][c] = choice
-                # on se déplace dedans
-                self.player.row = r
-                self.player.col = c
-                self.inventory.use_step()
-                # effets d'entrée dans la nouvelle pièce
-                choice.on_enter(self.inventory, self.maison.random)
+            # le sélecteur pose lui-même la salle via le moteur, puis
+            # rend la main à la carte
+            self.scenes.push(RoomPicker(self.engine, self.bot, self.recorder))
+            return result
 
-            return
+        # ---- CAS 3 : déplacement impossible (annoncé par le moteur) ----
+        return result
 
-        # ---- CAS 3 : déplacement impossible ----
-        print("Déplacement impossible dans cette direction (pas de porte, porte verrouillée ou bord de la carte).")
-        # on force le joueur à re-choisir une direction
-        self.selected_direction = None
+    # ---------------------------------------------------
+    def walk_to(self, r, c):
+        """
+        Déplacement automatique vers la salle posée (r, c) par le chemin le
+        moins coûteux. Les pas sont joués comme des entrées ZQSD + ESPACE
+        (donc enregistrés dans le replay), un toutes les AUTOWALK_STEP_MS.
+        """
+        self.stop_walk()
+        if (r, c) == (self.player.row, self.player.col):
+            return
+        if self.paths is None:
+            from pathing import PathCache
+            self.paths = PathCache()
+        route = self.paths.route(self.maison, self.player, self.inventory, (r, c))
+        if route is None:
+            self.events.emit(Notice("Aucun chemin praticable vers cette salle."))
+            return
+        self.walk = route.directions
+        self.walk.reverse()
+        pygame.time.set_timer(WALK_STEP, AUTOWALK_STEP_MS)
+        self.events.emit(Notice(
+            f"Trajet : {route.steps} pas, {route.keys} clé(s)."
+        ))
+
+    def walk_step(self):
+        """Fait le pas suivant du déplacement automatique."""
+        if not self.walk:
+            self.stop_walk()
+            return
+        self.select_direction(self.walk.pop())
+        if self.try_move() != "MOVED" or not self.walk or self.engine.is_over():
+            self.stop_walk()
 
+    def stop_walk(self):
+        if self.walk:
+            self.walk = []
+        pygame.time.set_timer(WALK_STEP, 0)
 
     # ---------------------------------------------------
-    def draw_inventory(self):
-        font = pygame.font.SysFont("arial", 22)
-        status_text = (
-            f"Steps: {self.inventory.steps} | "
-            f"Keys: {self.inventory.keys} | "
-            f"Gems: {self.inventory.gems} | "
-            f"Dice: {self.inventory.dice} | "
-            f"Coins: {self.inventory.coins}"
-        )
-        txt = font.render(status_text, True, WHITE)
-        self.screen.blit(txt, (10, HEIGHT - 40))
+    def toggle_bot(self):
+        if self.bot is None:
+            from bot import MCTSBot
+            self.bot = MCTSBot()
+            self.events.emit(Notice("Bot activé."))
+        else:
+            self.bot.close()
+            self.bot = None
+            self.events.emit(Notice("Bot désactivé."))
 
-    # ---------------------------------------------------
-    def run(self):
-        running = True
-
-        while running:
-            self.clock.tick(FPS)
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-
-                # Sélection de direction avec ZQSD
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        running = False
-
-                    if event.key == pygame.K_z:
-                        self.selected_direction = Direction.TOP
-                    if event.key == pygame.K_s:
-                        self.selected_direction = Direction.BOTTOM
-                    if event.key == pygame.K_q:
-                        self.selected_direction = Direction.LEFT
-                    if event.key == pygame.K_d:
-                        self.selected_direction = Direction.RIGHT
-
-                    # Validation du déplacement
-                    if event.key == pygame.K_SPACE:
-                        self.try_move()
-
-            # Conditions de fin
-            if self.inventory.steps <= 0:
-                print("PERDU - Plus de pas !")
-                running = False
-            # Défaite si aucune porte n'est jouable depuis la salle actuelle
-            if running:  # seulement si on n'a pas déjà perdu sur les pas
-                moves_possible = False
-                for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                    if self.maison.can_move(self.player, self.inventory, dr, dc):
-                        moves_possible = True
-                        break
-
-                if not moves_possible:
-                    print("PERDU - Vous êtes bloqué, aucune porte ne peut être ouverte.")
-                    running = False
-
-            if self.player.row == 0 and self.player.col == MAP_COLS // 2:
-                print("VICTOIRE ! Vous avez atteint l'Antechamber.")
-                running = False
-
-            # Affichage
-            self.screen.fill(BLACK)
-            self.maison.draw(self.screen)
-            self.draw_inventory()
-
-            # Joueur
-            pygame.draw.circle(
-                self.screen,
-                RED,
-                (
-                    self.player.col * TILE_SIZE + TILE_SIZE // 2,
-                    self.player.row * TILE_SIZE + TILE_SIZE // 2,
-                ),
-                15,
-            )
+    def _draw_ready(self, key):
+        # appelée depuis le thread de pré-calcul : seulement poster
+        pygame.event.post(pygame.event.Event(DRAW_READY))
 
-            # Flèche de direction
-            self.draw_direction_arrow()
+    def _prerender_cards(self, rooms):
+        from room_picker import prerender_cards
+        prerender_cards(rooms, self.inventory.gems)
 
-            pygame.display.flip()
+    def first_frame(self):
+        STARTUP.mark("first frame")
+        if self.startup_report:
+            STARTUP.print_report()
+        if STARTUP_LOG:
+            STARTUP.append_log(STARTUP_LOG)
 
+    # ---------------------------------------------------
+    def run(self):
+        """
+        Boucle principale unique : une horloge, une lecture des entrées par
+        image, passées à la scène du dessus de la pile.
+        """
+        scenes = self.scenes
+        profiler = self.profiler
+        overlay = self.profiler_overlay
+        while scenes:
+            # "input" comprend l'attente de la prochaine image (ou entrée)
+            profiler.begin_frame()
+            events = next_events(self.clock, scenes.fps, scenes.busy)
+            for event in events:
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    overlay.toggle()
+            profiler.lap("input")
+
+            name = type(scenes.top).__name__
+            scenes.dispatch(events)
+            profiler.lap("update." + name)
+            if not scenes:
+                profiler.end_frame()
+                break
+
+            # Affichage : seules les zones modifiées sont envoyées à l'écran
+            name = type(scenes.top).__name__
+            rects = scenes.draw(self.screen)
+            profiler.lap("draw." + name)
+            if overlay.visible:
+                # la scène a pu repeindre sous le calque
+                force = any(overlay.rect.colliderect(rect) for rect in rects)
+                rects.extend(overlay.draw(self.screen, force))
+                profiler.lap("overlay")
+            if rects:
+                pygame.display.update(rects)
+            profiler.lap("present")
+            profiler.end_frame()
+            if profiler.frame == 1:
+                self.first_frame()
+
+        if profiler.trace is not None:
+            profiler.print_report()
+        profiler.close()
+        if self.prefetcher is not None:
+            self.prefetcher.close()
+        if self.bot is not None:
+            self.bot.close()
+        if self.recorder is not None:
+            self.recorder.close()
+        self.events.close()
         pygame.quit()
-
-
-
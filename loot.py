@@ -0,0 +1,230 @@
+import sys
+import os
+import bisect
+
+# ==== FIX DES IMPORTS ====
+CURRENT_FILE = os.path.abspath(__file__)
+PROJECT_PATH = os.path.dirname(CURRENT_FILE)
+PARENT_PATH = os.path.dirname(PROJECT_PATH)
+
+if PROJECT_PATH not in sys.path:
+    sys.path.append(PROJECT_PATH)
+if PARENT_PATH not in sys.path:
+    sys.path.append(PARENT_PATH)
+# ==========================
+
+from settings import ROOM_COLORS
+
+# ------------------------------------------------------
+# Règles des trouvailles (Room.on_enter)
+# ------------------------------------------------------
+# chance de trouver quelque chose en entrant, selon la couleur
+BASE_CHANCE = {
+    "green": 0.40,    # jardins -> riches en loot
+    "purple": 0.35,   # chambres -> souvent de la nourriture
+    "blue": 0.20,
+    "yellow": 0.25,
+    "red": 0.25,
+}
+DEFAULT_CHANCE = 0.15
+# Patte de lapin => plus de chances globales
+RABBIT_FOOT_FACTOR = 1.5
+# part des trouvailles qui sont un objet permanent
+PERMANENT_CHANCE = 0.15
+
+# objets permanents, équiprobables : (champ de l'inventaire, message)
+PERMANENTS = [
+    ("has_lockpick", "Vous trouvez un kit de crochetage dans {name} !"),
+    ("has_metal_detector", "Vous trouvez un détecteur de métaux dans {name} !"),
+    ("has_rabbit_foot", "Vous trouvez une patte de lapin dans {name} !"),
+]
+
+# consommables : poids de base (coin a à peu près la même chance que la nourriture)
+CONSUMABLE_WEIGHTS = {"gem": 2, "key": 2, "dice": 1, "food": 3, "coin": 2}
+# Détecteur de métaux : plus de clés et de gemmes
+METAL_DETECTOR_BONUS = {"gem": 2, "key": 2}
+# Jardins : plus de gemmes / nourriture
+GARDEN_BONUS = {"gem": 1, "food": 1}
+
+COIN_AMOUNTS = (1, 2, 3)   # équiprobables
+
+# nourriture : (probabilité, pas gagnés, message)
+FOODS = [
+    (0.2, 2, "Vous mangez une pomme (+2 pas)."),
+    (0.2, 3, "Vous mangez une banane (+3 pas)."),
+    (0.3, 10, "Vous mangez un gâteau (+10 pas)."),
+    (0.2, 15, "Vous mangez un sandwich (+15 pas)."),
+    (0.1, 25, "Vous mangez un repas complet (+25 pas)."),
+]
+
+# ressources suivies par les espérances
+RESOURCES = ("steps", "gems", "keys", "coins", "dice")
+
+
+class LootOutcome:
+    """Une issue possible : champ de l'inventaire modifié, quantité, message."""
+    __slots__ = ("field", "amount", "message")
+
+    def __init__(self, field, amount, message):
+        self.field = field          # None = rien trouvé
+        self.amount = amount        # entier, ou True pour un objet permanent
+        self.message = message
+
+    def apply(self, inventory):
+        if self.field is None:
+            return
+        if self.amount is True:
+            setattr(inventory, self.field, True)
+        else:
+            setattr(inventory, self.field, getattr(inventory, self.field) + self.amount)
+
+    def __repr__(self):
+        return f"LootOutcome({self.field}, {self.amount})"
+
+
+NOTHING = LootOutcome(None, 0, None)
+
+
+# ------------------------------------------------------
+# Table exacte des issues
+# ------------------------------------------------------
+class LootTable:
+    """
+    Loi complète des trouvailles pour une couleur de salle et un état des
+    objets permanents : issues, probabilités exactes, espérances, et
+    tirage par inversion (une seule valeur aléatoire par entrée).
+    """
+
+    def __init__(self, color, has_rabbit_foot=False, has_metal_detector=False):
+        self.key = (color, has_rabbit_foot, has_metal_detector)
+
+        chance = BASE_CHANCE.get(color, DEFAULT_CHANCE)
+        if has_rabbit_foot:
+            chance *= RABBIT_FOOT_FACTOR
+        chance = min(chance, 1.0)
+
+        weights = dict(CONSUMABLE_WEIGHTS)
+        if has_metal_detector:
+            for loot, bonus in METAL_DETECTOR_BONUS.items():
+                weights[loot] += bonus
+        if color == "green":
+            for loot, bonus in GARDEN_BONUS.items():
+                weights[loot] += bonus
+        total_weight = sum(weights.values())
+
+        outcomes = [(1 - chance, NOTHING)]
+        permanent = chance * PERMANENT_CHANCE
+        for field, message in PERMANENTS:
+            outcomes.append((permanent / len(PERMANENTS), LootOutcome(field, True, message)))
+
+        consumable = chance - permanent
+        for loot, weight in weights.items():
+            p = consumable * weight / total_weight
+            if loot == "gem":
+                outcomes.append((p, LootOutcome("gems", 1, "Vous trouvez une gemme dans {name}.")))
+            elif loot == "key":
+                outcomes.append((p, LootOutcome("keys", 1, "Vous trouvez une clé dans {name}.")))
+            elif loot == "dice":
+                outcomes.append((p, LootOutcome("dice", 1, "Vous trouvez un dé dans {name}.")))
+            elif loot == "coin":
+                for amount in COIN_AMOUNTS:
+                    outcomes.append((p / len(COIN_AMOUNTS), LootOutcome(
+                        "coins", amount, f"Vous trouvez {amount} pièce(s) dans {{name}}."
+                    )))
+            else:
+                for food_p, steps, message in FOODS:
+                    outcomes.append((p * food_p, LootOutcome("steps", steps, message)))
+
+        outcomes = [(p, o) for p, o in outcomes if p > 0]
+        self.probabilities = tuple(p for p, _ in outcomes)
+        self.outcomes = tuple(o for _, o in outcomes)
+        self.cum = []
+        total = 0.0
+        for p in self.probabilities:
+            total += p
+            self.cum.append(total)
+        self.total = total
+        self._cum_array = None
+
+    # --------------------------------------------------
+    def expected(self):
+        """
+        Espérances par entrée dans une salle : ressources gagnées
+        (steps, gems, keys, coins, dice) et probabilité de trouver
+        chaque objet permanent.
+        """
+        result = {resource: 0.0 for resource in RESOURCES}
+        for field, _ in PERMANENTS:
+            result[field] = 0.0
+        for p, outcome in zip(self.probabilities, self.outcomes):
+            if outcome.field is None:
+                continue
+            result[outcome.field] += p * (1 if outcome.amount is True else outcome.amount)
+        return result
+
+    def yields(self, resource):
+        """Quantité de `resource` apportée par chaque issue (ordre de self.outcomes)."""
+        return [
+            o.amount if o.field == resource and o.amount is not True else 0
+            for o in self.outcomes
+        ]
+
+    # --------------------------------------------------
+    def sample(self, rng):
+        """Tire une issue avec une seule valeur de rng.random()."""
+        i = bisect.bisect_right(self.cum, rng.random() * self.total)
+        return self.outcomes[min(i, len(self.outcomes) - 1)]
+
+    def sample_many(self, n, rng):
+        """
+        Tire n issues d'un coup et renvoie leurs indices dans self.outcomes.
+        Avec un numpy.random.Generator, le tirage est vectorisé (tableau
+        NumPy) ; sinon, liste Python avec un random.Random.
+        """
+        if hasattr(rng, "integers"):
+            import numpy as np
+            if self._cum_array is None:
+                self._cum_array = np.array(self.cum)
+            u = rng.random(n) * self.total
+            return np.minimum(np.searchsorted(self._cum_array, u, side="right"),
+                              len(self.outcomes) - 1)
+
+        cum, total, last = self.cum, self.total, len(self.outcomes) - 1
+        return [min(bisect.bisect_right(cum, rng.random() * total), last) for _ in range(n)]
+
+
+# Tables de toutes les combinaisons (couleur, patte de lapin, détecteur)
+LOOT_TABLES = {}
+
+
+def loot_table(color, has_rabbit_foot=False, has_metal_detector=False):
+    """Table des trouvailles (construite une fois par combinaison)."""
+    key = (color, bool(has_rabbit_foot), bool(has_metal_detector))
+    table = LOOT_TABLES.get(key)
+    if table is None:
+        table = LootTable(*key)
+        LOOT_TABLES[key] = table
+    return table
+
+
+for _color in ROOM_COLORS:
+    for _rabbit in (False, True):
+        for _metal in (False, True):
+            loot_table(_color, _rabbit, _metal)
+
+
+# ------------------------------------------------------
+# Rendement attendu, pour l'équilibrage : python main.py loot
+# ------------------------------------------------------
+def print_expected_table():
+    print(f"{'couleur':<8} {'lapin':<6} {'détect.':<8} "
+          + " ".join(f"{r:>6}" for r in RESOURCES) + "  permanent")
+    for (color, rabbit, metal), table in sorted(LOOT_TABLES.items()):
+        exp = table.expected()
+        permanent = sum(exp[field] for field, _ in PERMANENTS)
+        print(f"{color:<8} {'oui' if rabbit else 'non':<6} {'oui' if metal else 'non':<8} "
+              + " ".join(f"{exp[r]:6.3f}" for r in RESOURCES) + f"  {permanent:9.3f}")
+
+
+if __name__ == "__main__":
+    print_expected_table()
@@ -1,5 +1,49 @@
-from game import Game
+import sys
+
+# en premier : date le début du démarrage (voir --startup-report)
+from utils.startup import STARTUP
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
+    # python main.py simulate ... : simulation sans affichage
+    if len(sys.argv) > 1 and sys.argv[1] == "simulate":
+        from simulate import main as simulate_main
+        simulate_main(sys.argv[2:])
+    # python main.py sweep -P inventory.steps=[50,70,90] : équilibrage
+    elif len(sys.argv) > 1 and sys.argv[1] == "sweep":
+        from sweep import main as sweep_main
+        sweep_main(sys.argv[2:])
+    # python main.py results : résumé de la base de résultats (simulate/sweep --db)
+    elif len(sys.argv) > 1 and sys.argv[1] == "results":
+        from results import main as results_main
+        results_main(sys.argv[2:])
+    # python main.py replay partie.replay : rejoue une partie enregistrée
+    elif len(sys.argv) > 1 and sys.argv[1] == "replay":
+        from replay import main as replay_main
+        replay_main(sys.argv[2:])
+    # python main.py bench : banc d'essai, comparé à la référence
+    elif len(sys.argv) > 1 and sys.argv[1] == "bench":
+        from bench import main as bench_main
+        sys.exit(bench_main(sys.argv[2:]))
+    # python main.py loot : rendement attendu des salles (équilibrage)
+    elif len(sys.argv) > 1 and sys.argv[1] == "loot":
+        from loot import print_expected_table
+        print_expected_table()
+    else:
+        # python main.py --trace images.json : trace de chaque image
+        # (CSV, ou format Chrome si le fichier finit par .json)
+        trace = None
+        if "--trace" in sys.argv[1:-1]:
+            trace = sys.argv[sys.argv.index("--trace") + 1]
+        # python main.py --startup-report : temps de chaque étape du démarrage
+        startup_report = "--startup-report" in sys.argv[1:]
+        from game import Game
+        from settings import RECORD_REPLAYS, LOG_TO_CONSOLE
+        # python main.py --record : enregistre la partie (dossier replays/)
+        # python main.py --log : copie les messages de la partie dans la console
+        game = Game(
+            trace=trace,
+            startup_report=startup_report,
+            record=RECORD_REPLAYS or "--record" in sys.argv[1:],
+            log_console=LOG_TO_CONSOLE or "--log" in sys.argv[1:],
+        )
+        game.run()
@@ -1,6 +1,6 @@
 import sys
 import os
-import random
+from collections import deque
 
 # ==== FIX DES IMPORTS ====
 CURRENT_FILE = os.path.abspath(__file__)
@@ -14,21 +14,81 @@ if PARENT_PATH not in sys.path:
     sys.path.append(PARENT_PATH)
 # ==========================
 
-from models import Room, Door
-from utils.direction import Direction
+from models import Room, Door, can_open_level, open_level
+from utils.direction import Direction, DELTAS
 from utils.lock_state import LockState
+from utils.door_bits import door_level, cell_doors, door_keys
+from utils.rng import RngService
+from chunks import ChunkedCells
+from solver import goal_reachable, step_budget
 from settings import MAP_ROWS, MAP_COLS
 
+# (dr, dc) -> Direction
+DIRECTION_OF_DELTA = {delta: direction for direction, delta in DELTAS.items()}
 
-class Maison:
-    def __init__(self):
-        # Création de la grille vide
-        self.grid = [[None for _ in range(MAP_COLS)] for _ in range(MAP_ROWS)]
-        self.random = random.Random()
 
-        # Position du Start (ligne du bas, colonne centrale)
-        start_row = MAP_ROWS - 1
-        start_col = MAP_COLS // 2
+# ------------------------------------------------------
+# Vue "liste de listes" de la grille compacte
+# ------------------------------------------------------
+class _GridRow:
+    __slots__ = ("maison", "row")
+
+    def __init__(self, maison, row):
+        self.maison = maison
+        self.row = row
+
+    def __len__(self):
+        return self.maison.cols
+
+    def __getitem__(self, col):
+        if not 0 <= col < self.maison.cols:
+            raise IndexError(col)
+        return self.maison.room_at(self.row, col)
+
+    def __setitem__(self, col, room):
+        self.maison.place_room(self.row, col, room)
+
+
+class _GridView:
+    """`maison.grid[r][c]` renvoie la Room posée (ou None), comme avant."""
+    __slots__ = ("maison",)
+
+    def __init__(self, maison):
+        self.maison = maison
+
+    def __len__(self):
+        return self.maison.rows
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.maison.rows:
+            raise IndexError(row)
+        return _GridRow(self.maison, row)
+
+
+class Maison:
+    def __init__(self, seed=None, rng=None, rows=MAP_ROWS, cols=MAP_COLS):
+        # Grille compacte et creuse : un code par case (type de salle << 8 |
+        # portes), 0 pour une case vide, stockée par blocs alloués à la
+        # demande. Les objets Room ne sont qu'une vue dessus.
+        self.cells = ChunkedCells(rows, cols)
+        self._rooms = {}
+        self.grid = _GridView(self)
+        self._set_size(rows, cols)
+
+        # Index des portes : portes des salles posées qui donnent sur une
+        # case inexplorée, (r, c, direction) -> niveau de verrou
+        self.frontier = {}
+        # (r, c, clés, kit) -> (cases atteignables, progrès possible)
+        self._reach_cache = {}
+        # (r, c, clés, kit) -> (plus grand budget de pas sans issue, plus
+        # petit budget avec issue), voir goal_reachable
+        self._goal_cache = {}
+
+        # Service de hasard de la partie (injectable) : tirages par case,
+        # une même graine rejoue la même partie
+        self.rng = rng if rng is not None else RngService(seed)
+
+        start_row, start_col = self.start
 
         # ----- Salle de départ -----
         entrance = Room(
@@ -36,7 +96,7 @@ class Maison:
             color="blue",
             doors=[Door(Direction.TOP, LockState.UNLOCKED)]
         )
-        self.grid[start_row][start_col] = entrance
+        self._set_room(start_row, start_col, entrance)
 
         # ----- Salle d'arrivée -----
         antechamber = Room(
@@ -44,8 +104,184 @@ class Maison:
             color="purple",
             doors=[Door(Direction.BOTTOM, LockState.DOUBLE_LOCKED)]
         )
-        self.grid[0][MAP_COLS // 2] = antechamber
+        self._set_room(self.goal[0], self.goal[1], antechamber)
+
+        # Cases posées pendant la partie, dans l'ordre (pour l'affichage
+        # incrémental) ; `version` augmente à chaque modification.
+        self.placements = []
+        self.version = 0
+
+    def _set_size(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        # Start : ligne du bas, colonne centrale ; antichambre : en face
+        self.start = (rows - 1, cols // 2)
+        self.goal = (0, cols // 2)
+
+    # ======================================================
+    # Accès aux cases
+    # ======================================================
+    def in_bounds(self, r, c):
+        return 0 <= r < self.rows and 0 <= c < self.cols
+
+    def code_at(self, r, c):
+        return self.cells.get(r, c)
+
+    def room_at(self, r, c):
+        """Vue objet de la case (None si inexplorée)."""
+        code = self.cells.get(r, c)
+        if code == 0:
+            return None
+        index = r * self.cols + c
+        room = self._rooms.get(index)
+        if room is None:
+            room = Room.from_code(code)
+            self._rooms[index] = room
+        return room
 
+    # ======================================================
+    # Pose d'une nouvelle salle
+    # ======================================================
+    def place_room(self, r, c, room):
+        self._set_room(r, c, room)
+        self.placements.append((r, c))
+        self.version += 1
+
+    def _set_room(self, r, c, room):
+        """Pose la salle et met à jour l'index des portes."""
+        self.cells.set(r, c, room.code)
+        self._rooms[r * self.cols + c] = room
+
+        # la case n'est plus inexplorée
+        for direction, (dr, dc) in DELTAS.items():
+            self.frontier.pop((r - dr, c - dc, direction), None)
+
+        # nouvelles portes vers des cases vides
+        for door in room.doors:
+            dr, dc = DELTAS[door.direction]
+            r2, c2 = r + dr, c + dc
+            if self.in_bounds(r2, c2) and self.code_at(r2, c2) == 0:
+                self.frontier[(r, c, door.direction)] = door.lock_state.value
+
+        # la forme du manoir a changé : les accessibilités sont à refaire
+        self._reach_cache.clear()
+        self._goal_cache.clear()
+
+    def load_cells(self, cells, frontier=None):
+        """
+        Remplace toute la grille (ChunkedCells, restauration d'un
+        instantané) et reconstruit l'index des portes, sauf s'il est fourni.
+        L'affichage doit ensuite être entièrement redessiné.
+        """
+        if (cells.rows, cells.cols) != (self.rows, self.cols):
+            self._set_size(cells.rows, cells.cols)
+        self.cells = cells
+        self._rooms = {}
+        self._reach_cache.clear()
+        self._goal_cache.clear()
+        self.placements = []
+        self.version += 1
+
+        if frontier is not None:
+            self.frontier = dict(frontier)
+            return
+
+        self.frontier = {}
+        for r, c, code in cells.items():
+            for direction, (dr, dc) in DELTAS.items():
+                if door_level(cell_doors(code), direction) < 0:
+                    continue
+                r2, c2 = r + dr, c + dc
+                if self.in_bounds(r2, c2) and self.code_at(r2, c2) == 0:
+                    self.frontier[(r, c, direction)] = door_level(cell_doors(code), direction)
+
+    # ======================================================
+    # Le joueur peut-il encore progresser ?
+    # ======================================================
+    def reachable(self, player, inventory):
+        """
+        Renvoie (cases atteignables, progrès possible) depuis la position du
+        joueur. Chaque porte franchie consomme ses clés (mêmes règles que
+        Door.open) : les cases atteignables sont un dict case -> clés
+        restantes au mieux en y arrivant. Le progrès est possible si
+        l'antichambre est atteignable ou si une porte de la frontière peut
+        être ouverte avec les clés qui restent devant elle.
+
+        Les pas ne sont pas comptés (la partie s'arrête d'elle-même quand
+        ils sont épuisés, voir OUTCOME_NO_STEPS).
+
+        Le résultat est mis en cache par (position, clés, kit) : tant
+        qu'aucune salle n'est posée, la requête est une simple lecture.
+        """
+        key = (player.row, player.col, inventory.keys, inventory.has_lockpick)
+        result = self._reach_cache.get(key)
+        if result is None:
+            result = self._explore(player.row, player.col, inventory.keys, inventory.has_lockpick)
+            self._reach_cache[key] = result
+        return result
+
+    def can_progress(self, player, inventory):
+        return self.reachable(player, inventory)[1]
+
+    def goal_reachable(self, player, inventory):
+        """
+        L'antichambre reste-t-elle atteignable, même en explorant (voir
+        solver.goal_reachable) ?
+
+        À position, clés et kit donnés, le verdict ne dépend que du budget
+        de pas (solver.step_budget) et ne peut que s'améliorer quand il
+        grandit : le cache garde les budgets déjà tranchés, et la
+        recherche n'est refaite que pour un budget encore inconnu ou
+        après la pose d'une salle.
+        """
+        key = (player.row, player.col, inventory.keys, inventory.has_lockpick)
+        budget = step_budget(inventory)
+        lost, found = self._goal_cache.get(key, (-1, None))
+        if budget <= lost:
+            return False
+        if found is not None and budget >= found:
+            return True
+        result = goal_reachable(self, inventory, player)
+        if result:
+            found = budget if found is None else min(found, budget)
+        else:
+            lost = budget
+        self._goal_cache[key] = (lost, found)
+        return result
+
+    def _explore(self, row, col, keys, lockpick):
+        # parcours 0-1 sur les clés dépensées : une case est gardée avec
+        # le plus de clés restantes possible
+        code_at = self.cells.get
+        left = {(row, col): keys}
+        queue = deque([(row, col, keys)])
+        while queue:
+            r, c, k = queue.popleft()
+            if k < left[(r, c)]:
+                continue
+            mask = cell_doors(code_at(r, c))
+            for direction, (dr, dc) in DELTAS.items():
+                level = door_level(mask, direction)
+                if level < 0:
+                    continue
+                cost = door_keys(level, lockpick)
+                if cost > k:
+                    continue
+                r2, c2 = r + dr, c + dc
+                if not self.in_bounds(r2, c2) or not code_at(r2, c2):
+                    continue
+                if left.get((r2, c2), -1) < k - cost:
+                    left[(r2, c2)] = k - cost
+                    if cost:
+                        queue.append((r2, c2, k - cost))
+                    else:
+                        queue.appendleft((r2, c2, k))
+
+        progress = self.goal in left or any(
+            (r, c) in left and door_keys(lock, lockpick) <= left[(r, c)]
+            for (r, c, _), lock in self.frontier.items()
+        )
+        return left, progress
 
     # ======================================================
     # Vérifie si on peut se déplacer
@@ -55,28 +291,15 @@ class Maison:
         c2 = player.col + dc
 
         # Limites du manoir
-        if not (0 <= r2 < MAP_ROWS and 0 <= c2 < MAP_COLS):
+        if not self.in_bounds(r2, c2):
             return False
 
-        current = self.grid[player.row][player.col]
-        target = self.grid[r2][c2]
-
-        # Trouver direction
-        if dr == -1:
-            direction = Direction.TOP
-        elif dr == 1:
-            direction = Direction.BOTTOM
-        elif dc == -1:
-            direction = Direction.LEFT
-        else:
-            direction = Direction.RIGHT
-
         # Vérifier la porte
-        door = current.get_door(direction)
-        if door:
-            return door.can_open(inventory)
-
-        return False
+        mask = cell_doors(self.code_at(player.row, player.col))
+        level = door_level(mask, DIRECTION_OF_DELTA[(dr, dc)])
+        if level < 0:
+            return False
+        return can_open_level(level, inventory)
 
 
     # ======================================================
@@ -87,39 +310,28 @@ class Maison:
         c2 = player.col + dc
 
         # Limites : hors map
-        if not (0 <= r2 < MAP_ROWS and 0 <= c2 < MAP_COLS):
+        if not self.in_bounds(r2, c2):
             return False
 
-        current = self.grid[player.row][player.col]
-
-        # Trouver direction
-        if dr == -1:
-            direction = Direction.TOP
-        elif dr == 1:
-            direction = Direction.BOTTOM
-        elif dc == -1:
-            direction = Direction.LEFT
-        else:
-            direction = Direction.RIGHT
-
-        door = current.get_door(direction)
-        if door is None:
+        direction = DIRECTION_OF_DELTA[(dr, dc)]
+        level = door_level(cell_doors(self.code_at(player.row, player.col)), direction)
+        if level < 0:
             return False
 
         # ---- CAS 1 : La salle existe déjà → mouvement normal ----
-        if self.grid[r2][c2] is not None:
-            if door.open(inventory):
+        if self.code_at(r2, c2):
+            if open_level(level, inventory):
                 player.move(dr, dc)
                 inventory.use_step()
                 return True
             return False
 
         # ---- CAS 2 : La salle n'existe pas encore → tirage ----
-        if not door.can_open(inventory):
+        if not can_open_level(level, inventory):
             return False
 
         # Ouverture de la porte
-        door.open(inventory)
+        open_level(level, inventory)
 
         # On renvoie un code spécial pour dire "nouvelle salle"
         return ("NEW_ROOM", r2, c2)
@@ -128,20 +340,33 @@ class Maison:
     # ======================================================
     # Affichage de la grille
     # ======================================================
-    def draw(self, screen):
+    def draw(self, screen, camera=None):
+        """Dessine les cases visibles par la caméra (tout le manoir sans caméra)."""
+        if camera is not None:
+            for r, c in camera.visible_cells():
+                self.draw_cell(screen, r, c, camera)
+            return
+        for r in range(self.rows):
+            for c in range(self.cols):
+                self.draw_cell(screen, r, c)
+
+    def draw_cell(self, screen, r, c, camera=None):
+        """Dessine une seule case et renvoie le rectangle touché."""
         import pygame
         from settings import TILE_SIZE, GREY
 
-        for r in range(MAP_ROWS):
-            for c in range(MAP_COLS):
-                x = c * TILE_SIZE
-                y = r * TILE_SIZE
-                room = self.grid[r][c]
+        if camera is not None:
+            x, y = camera.to_screen(r, c)
+        else:
+            x = c * TILE_SIZE
+            y = r * TILE_SIZE
+        room = self.room_at(r, c)
 
-                if room is None:
-                    pygame.draw.rect(screen, GREY, (x, y, TILE_SIZE, TILE_SIZE), 1)
-                else:
-                    room.draw(screen, x, y)
+        if room is None:
+            pygame.draw.rect(screen, GREY, (x, y, TILE_SIZE, TILE_SIZE), 1)
+        else:
+            room.draw(screen, x, y)
+        return pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
 
 
 
@@ -1,6 +1,5 @@
 import sys
 import os
-import pygame
 
 # ==== FIX DES IMPORTS ====
 CURRENT_FILE = os.path.abspath(__file__)
@@ -15,76 +14,171 @@ if PARENT_PATH not in sys.path:
 
 from utils.direction import Direction
 from utils.lock_state import LockState
+from utils.door_bits import pack_doors, unpack_doors, door_level, cell_code, cell_type, cell_doors
 from settings import ROOM_COLORS, TILE_SIZE, BLACK, WHITE
+from loot import loot_table
+from events import LootFound, ShopPurchase
+
+
+# ------------------------------------------------------
+# Règles d'ouverture par niveau de verrou (0, 1 ou 2)
+# ------------------------------------------------------
+def can_open_level(level, inventory):
+    """Vérifie si une porte de ce niveau peut être ouverte."""
+    if level == 0:
+        return True
+
+    if level == 1:
+        # soit une clé, soit un kit de crochetage
+        return inventory.keys > 0 or inventory.has_lockpick
+
+    if level == 2:
+        # toujours besoin d'une clé
+        return inventory.keys > 0
+
+    return False
+
+
+def open_level(level, inventory):
+    """Ouvre une porte de ce niveau et consomme les ressources si besoin."""
+    if not can_open_level(level, inventory):
+        return False
+
+    # Niveau 1 : si pas de kit de crochetage, consomme une clé
+    if level == 1:
+        if not inventory.has_lockpick:
+            inventory.keys -= 1
+
+    # Niveau 2 : consomme toujours une clé
+    if level == 2:
+        inventory.keys -= 1
+
+    return True
 
 
 # ------------------------------------------------------
 # DOOR (porte)
 # ------------------------------------------------------
 class Door:
+    __slots__ = ("direction", "lock_state")
+
     def __init__(self, direction: Direction, lock_state: LockState):
         self.direction = direction
         self.lock_state = lock_state
 
     def can_open(self, inventory):
         """Vérifie si la porte peut être ouverte."""
-        if self.lock_state == LockState.UNLOCKED:
-            return True
+        return can_open_level(self.lock_state.value, inventory)
 
-        if self.lock_state == LockState.LOCKED:
-            # soit une clé, soit un kit de crochetage
-            return inventory.keys > 0 or inventory.has_lockpick
+    def open(self, inventory):
+        """Ouvre la porte et consomme les ressources si besoin."""
+        return open_level(self.lock_state.value, inventory)
 
-        if self.lock_state == LockState.DOUBLE_LOCKED:
-            # toujours besoin d'une clé
-            return inventory.keys > 0
 
-        return False
+# ------------------------------------------------------
+# ROOM TYPE (partie commune d'un type de salle)
+# ------------------------------------------------------
+class RoomType:
+    """
+    Nom, couleur, coût et rareté d'un type de salle. Une seule instance
+    par type (poids mouche), partagée par toutes les salles posées.
+    """
+    __slots__ = ("id", "name", "color", "cost", "rarity")
+
+    def __init__(self, type_id, name, color, cost, rarity):
+        self.id = type_id
+        self.name = name
+        self.color = color
+        self.cost = cost
+        self.rarity = rarity
 
-    def open(self, inventory):
-        """Ouvre la porte et consomme les ressources si besoin."""
-        if not self.can_open(inventory):
-            return False
 
-        # Niveau 1 : si pas de kit de crochetage, consomme une clé
-        if self.lock_state == LockState.LOCKED:
-            if not inventory.has_lockpick:
-                inventory.keys -= 1
+# id 0 réservé à la case vide dans les codes de case
+ROOM_TYPES = [None]
+_ROOM_TYPE_IDS = {}
 
-        # Niveau 2 : consomme toujours une clé
-        if self.lock_state == LockState.DOUBLE_LOCKED:
-            inventory.keys -= 1
 
-        return True
+def room_type(name, color="blue", cost=0, rarity=0):
+    """Retourne (en le créant au besoin) le type de salle partagé."""
+    key = (name, color, cost, rarity)
+    kind = _ROOM_TYPE_IDS.get(key)
+    if kind is None:
+        kind = RoomType(len(ROOM_TYPES), name, color, cost, rarity)
+        ROOM_TYPES.append(kind)
+        _ROOM_TYPE_IDS[key] = kind
+    return kind
 
 
 # ------------------------------------------------------
 # ROOM (salle)
 # ------------------------------------------------------
+# Magasin : prix d'une clé, prix d'un lot de pas et pas par lot, en
+# pièces (réglables, voir sweep.py)
+SHOP_PRICES = {"key": 3, "steps_pack": 2, "steps_per_pack": 10}
+
+
 class Room:
+    """
+    Vue objet d'une case : un type partagé (`kind`) et les portes, gardées
+    à la fois sous forme de liste de Door et d'entier compact (`door_mask`).
+    """
+    __slots__ = ("kind", "doors", "door_mask")
+
     def __init__(self, name, color="blue", cost=0, rarity=0, doors=None):
-        self.name = name
-        self.color = color          # blue / green / yellow / purple / orange / red
-        self.cost = cost            # coût en gemmes
-        self.rarity = rarity        # entier 0..3
+        # name / color (blue, green, ...) / cost en gemmes / rarity 0..3
+        self.kind = room_type(name, color, cost, rarity)
         self.doors = doors if doors else []
+        self.door_mask = pack_doors(self.doors)
+
+    @classmethod
+    def from_code(cls, code):
+        """Reconstruit la vue objet à partir d'un code de case."""
+        room = cls.__new__(cls)
+        room.kind = ROOM_TYPES[cell_type(code)]
+        room.door_mask = cell_doors(code)
+        room.doors = [Door(d, lock) for d, lock in unpack_doors(room.door_mask)]
+        return room
+
+    @property
+    def code(self):
+        return cell_code(self.kind.id, self.door_mask)
+
+    @property
+    def name(self):
+        return self.kind.name
+
+    @property
+    def color(self):
+        return self.kind.color
+
+    @property
+    def cost(self):
+        return self.kind.cost
+
+    @property
+    def rarity(self):
+        return self.kind.rarity
 
     def get_color(self):
         """Retourne la couleur RGB de la salle."""
         return ROOM_COLORS[self.color]
 
     def draw(self, screen, x, y):
+        import pygame
+        from utils.fonts import render_text
+
         # Fond
         pygame.draw.rect(screen, self.get_color(), (x, y, TILE_SIZE, TILE_SIZE))
         # Bordure
         pygame.draw.rect(screen, BLACK, (x, y, TILE_SIZE, TILE_SIZE), 2)
         # Nom
-        font = pygame.font.SysFont("arial", 16)
-        txt = font.render(self.name, True, WHITE)
+        txt = render_text(self.name, WHITE, 16)
         screen.blit(txt, (x + 5, y + 5))
 
     def get_door(self, direction: Direction):
         """Retourne la porte correspondant à la direction demandée."""
+        if door_level(self.door_mask, direction) < 0:
+            return None
         for d in self.doors:
             if d.direction == direction:
                 return d
@@ -93,146 +187,82 @@ class Room:
     # --------------------------------------------------
     # Effets / loot quand on entre dans la salle
     # --------------------------------------------------
-    def on_enter(self, inventory, rng):
+    def on_enter(self, inventory, rng, events=None):
         """
         Quand le joueur entre dans la salle, il y a une certaine probabilité
         de trouver quelque chose : nourriture, gemmes, clés, dés, objets permanents.
-        On fait un truc simple mais conforme à l'énoncé.
+        La loi exacte, par couleur et objets permanents, est précalculée
+        dans loot.py : un seul tirage suffit.
+
+        `events` : bus (events.EventBus) qui reçoit les trouvailles.
         """
         # Effet spécial : salle de magasin
         if self.name == "Shop":
-            self.apply_shop_effect(inventory)
-            return
-        # chance de base de trouver quelque chose
-        base = 0.15
-        if self.color == "green":
-            base = 0.40   # jardins -> riches en loot
-        elif self.color == "purple":
-            base = 0.35   # chambres -> souvent de la nourriture
-        elif self.color == "blue":
-            base = 0.20
-        elif self.color == "yellow":
-            base = 0.25
-        elif self.color == "red":
-            base = 0.25
-
-        # Patte de lapin => plus de chances globales
-        if inventory.has_rabbit_foot:
-            base *= 1.5
-
-        if rng.random() > base:
-            return  # rien trouvé
-
-        # Petit tirage : permanent ou consommable
-        roll = rng.random()
-
-        # Une petite chance de tomber sur un objet permanent
-        if roll > 0.85:
-            item = rng.choice(["lockpick", "metal", "rabbit"])
-            if item == "lockpick":
-                inventory.has_lockpick = True
-                print(f"Vous trouvez un kit de crochetage dans {self.name} !")
-            elif item == "metal":
-                inventory.has_metal_detector = True
-                print(f"Vous trouvez un détecteur de métaux dans {self.name} !")
-            else:
-                inventory.has_rabbit_foot = True
-                print(f"Vous trouvez une patte de lapin dans {self.name} !")
+            self.apply_shop_effect(inventory, events)
             return
 
-        # Sinon : objet consommable
-        options = ["gem", "key", "dice", "food", "coin"]
-        weights = [2, 2, 1, 3, 2]  # coin a à peu près la même chance que la nourriture
-
-
-        # Détecteur de métaux : plus de clés et de gemmes
-        if inventory.has_metal_detector:
-            weights[0] += 2  # gemmes
-            weights[1] += 2  # clés
-
-        # Jardins : plus de gemmes / nourriture
-        if self.color == "green":
-            weights[0] += 1
-            weights[3] += 1
-
-        loot = rng.choices(options, weights=weights, k=1)[0]
-
-        if loot == "gem":
-            inventory.gems += 1
-            print(f"Vous trouvez une gemme dans {self.name}.")
-        elif loot == "key":
-            inventory.keys += 1
-            print(f"Vous trouvez une clé dans {self.name}.")
-        elif loot == "dice":
-            inventory.dice += 1
-            print(f"Vous trouvez un dé dans {self.name}.")
-        elif loot == "coin":
-            amount = rng.randint(1, 3)
-            inventory.add_coins(amount)
-            print(f"Vous trouvez {amount} pièce(s) dans {self.name}.")
-        else:  # nourriture -> on choisit un type
-            food_roll = rng.random()
-            if food_roll < 0.2:
-                inventory.add_steps(2)   # pomme
-                print("Vous mangez une pomme (+2 pas).")
-            elif food_roll < 0.4:
-                inventory.add_steps(3)   # banane
-                print("Vous mangez une banane (+3 pas).")
-            elif food_roll < 0.7:
-                inventory.add_steps(10)  # gâteau
-                print("Vous mangez un gâteau (+10 pas).")
-            elif food_roll < 0.9:
-                inventory.add_steps(15)  # sandwich
-                print("Vous mangez un sandwich (+15 pas).")
-            else:
-                inventory.add_steps(25)  # repas
-                print("Vous mangez un repas complet (+25 pas).")
-    def apply_shop_effect(self, inventory):
+        table = loot_table(self.color, inventory.has_rabbit_foot, inventory.has_metal_detector)
+        outcome = table.sample(rng)
+        outcome.apply(inventory)
+        if outcome.field is not None and events is not None and events.active:
+            events.emit(LootFound(self.name, outcome.field, outcome.amount, outcome.message))
+
+    def apply_shop_effect(self, inventory, events=None):
         """
-        Magasin simple :
-        - 3 pièces => 1 clé
-        - 2 pièces => 10 pas
+        Magasin simple (prix dans SHOP_PRICES) :
+        - SHOP_PRICES["key"] pièces => 1 clé
+        - SHOP_PRICES["steps_pack"] pièces => SHOP_PRICES["steps_per_pack"] pas
 
         On dépense toutes les pièces possibles dans cet ordre :
         d'abord les clés, puis les pas.
         """
-        something_bought = False
+        key_price = SHOP_PRICES["key"]
+        pack_price = SHOP_PRICES["steps_pack"]
+        spent = 0
+        nb_keys = 0
+        gained_steps = 0
 
         # Acheter des clés d'abord
-        if inventory.coins >= 3:
-            nb_keys = inventory.coins // 3
-            spent = nb_keys * 3
-            inventory.use_coins(spent)
+        if inventory.coins >= key_price:
+            nb_keys = inventory.coins // key_price
+            inventory.use_coins(nb_keys * key_price)
             inventory.keys += nb_keys
-            print(f"Vous dépensez {spent} pièce(s) au magasin et achetez {nb_keys} clé(s).")
-            something_bought = True
+            spent += nb_keys * key_price
 
         # Puis utiliser les pièces restantes en pas
-        if inventory.coins >= 2:
-            nb_packs = inventory.coins // 2
-            spent = nb_packs * 2
-            inventory.use_coins(spent)
-            gained_steps = nb_packs * 10
+        if inventory.coins >= pack_price:
+            nb_packs = inventory.coins // pack_price
+            inventory.use_coins(nb_packs * pack_price)
+            gained_steps = nb_packs * SHOP_PRICES["steps_per_pack"]
             inventory.steps += gained_steps
-            print(f"Vous dépensez {spent} pièce(s) au magasin et gagnez {gained_steps} pas.")
-            something_bought = True
+            spent += nb_packs * pack_price
 
-        if not something_bought:
-            print("Le magasin est silencieux : vous n'avez pas assez de pièces (3 pour une clé, 2 pour 10 pas).")
+        if events is not None and events.active:
+            events.emit(ShopPurchase(spent, nb_keys, gained_steps))
 
 
 
 # ------------------------------------------------------
 # INVENTORY (inventaire du joueur)
 # ------------------------------------------------------
+# Consommables au début de la partie (réglables, voir sweep.py)
+STARTING_INVENTORY = {"steps": 70, "keys": 0, "gems": 2, "coins": 0, "dice": 0}
+
+
 class Inventory:
+    __slots__ = (
+        "steps", "keys", "gems", "coins", "dice",
+        "has_lockpick", "has_metal_detector", "has_rabbit_foot",
+    )
+
     def __init__(self):
         # consommables
-        self.steps = 70
-        self.keys = 0
-        self.gems = 2
-        self.coins = 0
-        self.dice = 0
+        start = STARTING_INVENTORY
+        self.steps = start["steps"]
+        self.keys = start["keys"]
+        self.gems = start["gems"]
+        self.coins = start["coins"]
+        self.dice = start["dice"]
 
         # permanents
         self.has_lockpick = False
@@ -263,6 +293,8 @@ class Inventory:
 # PLAYER (joueur)
 # ------------------------------------------------------
 class Player:
+    __slots__ = ("row", "col")
+
     def __init__(self, start_row, start_col):
         self.row = start_row
         self.col = start_col
@@ -0,0 +1,245 @@
+import sys
+import os
+import heapq
+from collections import OrderedDict
+
+# ==== FIX DES IMPORTS ====
+CURRENT_FILE = os.path.abspath(__file__)
+PROJECT_PATH = os.path.dirname(CURRENT_FILE)
+PARENT_PATH = os.path.dirname(PROJECT_PATH)
+
+if PROJECT_PATH not in sys.path:
+    sys.path.append(PROJECT_PATH)
+if PARENT_PATH not in sys.path:
+    sys.path.append(PARENT_PATH)
+# ==========================
+
+from settings import AUTOWALK_KEY_COST, AUTOWALK_TREES
+from utils.direction import DIRECTIONS, DIRECTION_STEPS
+from utils.door_bits import known_doors, door_keys
+
+
+# ------------------------------------------------------
+# Plus courts chemins dans la partie explorée (déplacement automatique)
+#
+# On ne passe que par des portes entre salles déjà posées : aucun tirage
+# en route. Franchir une porte coûte un pas, plus une clé si Door.open en
+# consomme une (verrou double, ou simple sans kit de crochetage) ; une clé
+# vaut AUTOWALK_KEY_COST pas dans le coût total.
+#
+# Un arbre des plus courts chemins par case de départ est gardé en cache.
+# Poser une salle ne fait qu'ajouter une case et ses portes : les coûts ne
+# peuvent que baisser, on les propage depuis la nouvelle case au lieu de
+# tout recalculer.
+# ------------------------------------------------------
+class Route:
+    """Chemin vers une salle posée : directions à suivre et ressources dépensées."""
+    __slots__ = ("directions", "steps", "keys")
+
+    def __init__(self, directions, steps, keys):
+        self.directions = directions
+        self.steps = steps
+        self.keys = keys
+
+    def __repr__(self):
+        return f"Route(steps={self.steps}, keys={self.keys})"
+
+
+class PathTree:
+    """
+    Arbre des plus courts chemins depuis `source` dans les salles posées.
+
+    - lockpick : le joueur a le kit (les verrous simples sont gratuits) ;
+    - has_keys : les portes qui demandent une clé sont utilisables.
+
+    best[(r, c)] = (coût, pas, clés) ; parent[(r, c)] = (case précédente,
+    valeur de la direction prise).
+    """
+    __slots__ = ("source", "lockpick", "has_keys", "best", "parent", "version", "placed")
+
+    def __init__(self, maison, source, lockpick, has_keys):
+        self.source = source
+        self.lockpick = lockpick
+        self.has_keys = has_keys
+        self.best = {source: (0, 0, 0)}
+        self.parent = {source: None}
+        self.version = maison.version
+        self.placed = len(maison.placements)
+        self._relax(maison, [(0, 0, 0, source)])
+
+    def _relax(self, maison, queue):
+        """Dijkstra à partir des cases de `queue` (coût, pas, clés, case)."""
+        heapq.heapify(queue)
+        code_at = maison.cells.get
+        rows, cols = maison.rows, maison.cols
+        best, parent = self.best, self.parent
+        lockpick, has_keys = self.lockpick, self.has_keys
+
+        while queue:
+            cost, steps, keys, cell = heapq.heappop(queue)
+            if best[cell] < (cost, steps, keys):
+                continue
+            r, c = cell
+            for direction, level in known_doors(code_at(r, c)):
+                dr, dc, _ = DIRECTION_STEPS[direction]
+                r2, c2 = r + dr, c + dc
+                if not (0 <= r2 < rows and 0 <= c2 < cols) or not code_at(r2, c2):
+                    continue
+                spent = door_keys(level, lockpick)
+                if spent and not has_keys:
+                    continue
+                label = (cost + 1 + spent * AUTOWALK_KEY_COST, steps + 1, keys + spent)
+                old = best.get((r2, c2))
+                if old is None or label < old:
+                    best[(r2, c2)] = label
+                    parent[(r2, c2)] = (cell, direction)
+                    heapq.heappush(queue, (*label, (r2, c2)))
+
+    def add_room(self, maison, r, c):
+        """Prend en compte la salle posée en (r, c)."""
+        code_at = maison.cells.get
+        rows, cols = maison.rows, maison.cols
+        # meilleure entrée dans la nouvelle case depuis une voisine atteinte
+        label = None
+        for direction, (dr, dc, _) in enumerate(DIRECTION_STEPS):
+            r0, c0 = r - dr, c - dc
+            if not (0 <= r0 < rows and 0 <= c0 < cols):
+                continue
+            origin = self.best.get((r0, c0))
+            if origin is None:
+                continue
+            for door, level in known_doors(code_at(r0, c0)):
+                if door != direction:
+                    continue
+                spent = door_keys(level, self.lockpick)
+                if spent and not self.has_keys:
+                    continue
+                candidate = (origin[0] + 1 + spent * AUTOWALK_KEY_COST,
+                             origin[1] + 1, origin[2] + spent)
+                if label is None or candidate < label:
+                    label = candidate
+                    self.parent[(r, c)] = ((r0, c0), direction)
+        if label is None:
+            return
+        self.best[(r, c)] = label
+        self._relax(maison, [(*label, (r, c))])
+
+    def sync(self, maison):
+        """
+        Rattrape les salles posées depuis la dernière requête ; faux si le
+        manoir a changé autrement (instantané restauré…) et qu'il faut
+        reconstruire l'arbre.
+        """
+        placements = maison.placements
+        new = len(placements) - self.placed
+        if maison.version - self.version != new or new < 0:
+            return False
+        for r, c in placements[self.placed:]:
+            self.add_room(maison, r, c)
+        self.version = maison.version
+        self.placed = len(placements)
+        return True
+
+    def route(self, target):
+        """Route vers `target`, ou None si elle n'est pas atteignable."""
+        label = self.best.get(target)
+        if label is None:
+            return None
+        directions = []
+        cell = target
+        while self.parent[cell] is not None:
+            cell, direction = self.parent[cell]
+            directions.append(DIRECTIONS[direction])
+        directions.reverse()
+        return Route(directions, label[1], label[2])
+
+
+# ------------------------------------------------------
+# Cache des arbres
+# ------------------------------------------------------
+class PathCache:
+    """Arbres des AUTOWALK_TREES dernières cases de départ (LRU)."""
+
+    def __init__(self, maxsize=AUTOWALK_TREES):
+        self.maxsize = maxsize
+        self.trees = OrderedDict()
+        self.maison = None
+        self.hits = 0
+        self.misses = 0
+
+    def tree(self, maison, player, inventory):
+        if maison is not self.maison:
+            self.trees.clear()
+            self.maison = maison
+        key = ((player.row, player.col), inventory.has_lockpick, inventory.keys > 0)
+        tree = self.trees.get(key)
+        if tree is not None and tree.sync(maison):
+            self.hits += 1
+            self.trees.move_to_end(key)
+            return tree
+
+        self.misses += 1
+        tree = PathTree(maison, key[0], key[1], key[2])
+        self.trees[key] = tree
+        self.trees.move_to_end(key)
+        if len(self.trees) > self.maxsize:
+            self.trees.popitem(last=False)
+        return tree
+
+    def route(self, maison, player, inventory, target):
+        """
+        Chemin le moins coûteux vers la salle `target` que l'inventaire
+        permet de parcourir (pas et clés), ou None.
+        """
+        if not maison.code_at(*target):
+            return None
+        route = self.tree(maison, player, inventory).route(target)
+        if route is not None and route.keys > inventory.keys:
+            # l'arbre suppose des clés à volonté : recherche exacte, rare
+            route = bounded_route(maison, player, inventory, target)
+        # arriver sans pas restant perd la partie, sauf dans l'antichambre
+        if route is None:
+            return None
+        if route.steps >= inventory.steps and target != maison.goal:
+            return None
+        return route
+
+
+def bounded_route(maison, player, inventory, target):
+    """Comme PathTree.route, en suivant les clés restantes (sans cache)."""
+    code_at = maison.cells.get
+    rows, cols = maison.rows, maison.cols
+    lockpick = inventory.has_lockpick
+    start = (player.row, player.col, inventory.keys)
+    best = {start: (0, 0)}
+    parent = {start: None}
+    queue = [(0, 0, start)]
+
+    while queue:
+        cost, steps, state = heapq.heappop(queue)
+        if best[state] < (cost, steps):
+            continue
+        r, c, keys = state
+        if (r, c) == target:
+            directions = []
+            while parent[state] is not None:
+                state, direction = parent[state]
+                directions.append(DIRECTIONS[direction])
+            directions.reverse()
+            return Route(directions, steps, inventory.keys - keys)
+
+        for direction, level in known_doors(code_at(r, c)):
+            dr, dc, _ = DIRECTION_STEPS[direction]
+            r2, c2 = r + dr, c + dc
+            if not (0 <= r2 < rows and 0 <= c2 < cols) or not code_at(r2, c2):
+                continue
+            spent = door_keys(level, lockpick)
+            if spent > keys:
+                continue
+            nxt = (r2, c2, keys - spent)
+            label = (cost + 1 + spent * AUTOWALK_KEY_COST, steps + 1)
+            if label < best.get(nxt, (label[0] + 1, 0)):
+                best[nxt] = label
+                parent[nxt] = (state, direction)
+                heapq.heappush(queue, (*label, nxt))
+    return None
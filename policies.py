@@ -0,0 +1,74 @@
+import sys
+import os
+import importlib
+
+# ==== FIX DES IMPORTS ====
+CURRENT_FILE = os.path.abspath(__file__)
+PROJECT_PATH = os.path.dirname(CURRENT_FILE)
+PARENT_PATH = os.path.dirname(PROJECT_PATH)
+
+if PROJECT_PATH not in sys.path:
+    sys.path.append(PROJECT_PATH)
+if PARENT_PATH not in sys.path:
+    sys.path.append(PARENT_PATH)
+# ==========================
+
+from engine import MOVE, PICK, REROLL, PHASE_PICK
+from utils.direction import DELTAS
+
+
+# ------------------------------------------------------
+# Politiques de jeu automatiques
+# Une politique est une fonction (engine, rng) -> action,
+# appelée uniquement quand engine.legal_actions() n'est pas vide.
+# ------------------------------------------------------
+def random_policy(engine, rng):
+    """Joue une action légale au hasard."""
+    return rng.choice(engine.legal_actions())
+
+
+def greedy_policy(engine, rng):
+    """
+    Politique simple :
+    - sur la carte, se rapproche de l'antichambre (en préférant monter) ;
+    - au tirage, prend la salle la moins chère, sans relancer.
+    """
+    actions = engine.legal_actions()
+
+    if engine.phase == PHASE_PICK:
+        picks = [a for a in actions if a[0] == PICK]
+        if not picks:
+            return (REROLL,)
+        return min(picks, key=lambda a: (engine.pending_rooms[a[1]].cost, rng.random()))
+
+    goal_row, goal_col = engine.maison.goal
+
+    def distance(action):
+        dr, dc = DELTAS[action[1]]
+        r = engine.player.row + dr
+        c = engine.player.col + dc
+        return abs(r - goal_row) + abs(c - goal_col), rng.random()
+
+    return min(actions, key=distance)
+
+
+POLICIES = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+    # chargé à la demande (bot.py importe ce module)
+    "mcts": "bot:mcts_policy",
+}
+
+
+def get_policy(name):
+    """
+    Retrouve une politique par son nom ("random", "greedy")
+    ou par un chemin "module:fonction" pour une politique externe.
+    """
+    name = POLICIES.get(name, name)
+    if callable(name):
+        return name
+    if ":" in name:
+        module_name, func_name = name.split(":", 1)
+        return getattr(importlib.import_module(module_name), func_name)
+    raise ValueError(f"Politique inconnue : {name}")
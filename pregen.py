@@ -0,0 +1,171 @@
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# ==== FIX DES IMPORTS ====
+CURRENT_FILE = os.path.abspath(__file__)
+PROJECT_PATH = os.path.dirname(CURRENT_FILE)
+PARENT_PATH = os.path.dirname(PROJECT_PATH)
+
+if PROJECT_PATH not in sys.path:
+    sys.path.append(PROJECT_PATH)
+if PARENT_PATH not in sys.path:
+    sys.path.append(PARENT_PATH)
+# ==========================
+
+from engine import PHASE_MAP, draw_rooms_for
+from utils.direction import DELTAS
+from utils.door_bits import door_keys
+
+
+# ------------------------------------------------------
+# Pré-calcul des tirages du sélecteur
+#
+# Grâce aux flux de hasard par case (utils/rng.py), le prochain tirage
+# d'une case est connu d'avance : il ne dépend que de la graine, de la
+# case, de la direction d'entrée et du numéro de tirage de la case
+# (Engine.draw_key). Pendant que le joueur réfléchit, un thread calcule
+# les 3 cartes de chaque porte qu'il peut atteindre ; `update()`, sur le
+# thread principal, dépose les tirages prêts dans `engine.prefetched` et
+# le moteur les reprend tels quels au moment du déplacement. Le thread
+# ne touche à rien d'autre qu'à son propre calcul. Une clé périmée ne
+# peut jamais servir : elle ne correspond simplement plus à aucun tirage.
+# ------------------------------------------------------
+class DrawPrefetcher:
+    """
+    Tient `engine.prefetched` à jour pour les portes atteignables.
+
+    - background=False : calcul immédiat dans `update()` (tests, bot) ;
+    - on_ready(key) : appelée depuis le thread quand un tirage est prêt
+      (ex. réveiller la boucle principale, qui le récupère dans `update()`) ;
+    - render(rooms) : appelée dans `update()`, sur le thread principal,
+      pour préparer l'affichage des cartes d'un tirage prêt.
+    """
+
+    def __init__(self, engine, background=True, on_ready=None, render=None):
+        self.engine = engine
+        self.on_ready = on_ready
+        self.render = render
+        self.executor = None
+        if background:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pregen")
+        # tirages demandés au thread et pas encore récupérés (thread principal seul)
+        self.pending = {}
+        # tirages dont les cartes ont déjà été préparées, avec les gemmes
+        # de l'inventaire à ce moment-là (les cartes en dépendent)
+        self.rendered = {}
+        self.signature = None
+        self.targets = []
+
+    # --------------------------------------------------
+    def _signature(self):
+        engine = self.engine
+        player = engine.player
+        return (
+            id(engine.maison), engine.maison.version, engine.phase, engine.draws,
+            player.row, player.col, engine.inventory.keys, engine.inventory.has_lockpick,
+            engine.rng.seed,
+        )
+
+    def target_keys(self):
+        """Clés des tirages des portes de la frontière que le joueur peut atteindre."""
+        engine = self.engine
+        if engine.phase != PHASE_MAP:
+            return []
+        maison = engine.maison
+        # case -> clés restantes en y arrivant
+        cells, _ = maison.reachable(engine.player, engine.inventory)
+        lockpick = engine.inventory.has_lockpick
+        keys = []
+        for (r, c, direction), level in maison.frontier.items():
+            if (r, c) in cells and door_keys(level, lockpick) <= cells[(r, c)]:
+                dr, dc = DELTAS[direction]
+                keys.append(engine.draw_key(r + dr, c + dc, direction))
+        return keys
+
+    # --------------------------------------------------
+    def update(self, render_budget=1):
+        """
+        À appeler à chaque image : relance le pré-calcul si la position,
+        l'inventaire ou le hasard ont changé, puis prépare l'affichage
+        d'au plus `render_budget` tirages prêts.
+        """
+        self._collect()
+        signature = self._signature()
+        if signature != self.signature:
+            self.signature = signature
+            self._retarget(self.target_keys())
+
+        if self.render is None or render_budget <= 0:
+            return
+        gems = self.engine.inventory.gems
+        prefetched = self.engine.prefetched
+        for key in self.targets:
+            rooms = prefetched.get(key)
+            if rooms is None or self.rendered.get(key) == gems:
+                continue
+            self.render(rooms)
+            self.rendered[key] = gems
+            render_budget -= 1
+            if render_budget <= 0:
+                return
+
+    def _retarget(self, keys):
+        self.targets = keys
+        wanted = frozenset(keys)
+        prefetched = self.engine.prefetched
+
+        # on oublie ce qui ne sert plus (tirage fait, porte hors d'atteinte)
+        for key in list(prefetched):
+            if key not in wanted:
+                prefetched.pop(key, None)
+        for key in list(self.pending):
+            if key not in wanted:
+                self.pending.pop(key).cancel()
+        for key in list(self.rendered):
+            if key not in wanted:
+                del self.rendered[key]
+
+        for key in keys:
+            if key in prefetched or key in self.pending:
+                continue
+            if self.executor is None:
+                prefetched[key] = draw_rooms_for(key)
+            else:
+                # thread : calcul pur, sans toucher à l'état du moteur
+                future = self.executor.submit(draw_rooms_for, key)
+                if self.on_ready is not None:
+                    future.add_done_callback(self._ready(key))
+                self.pending[key] = future
+
+    def _ready(self, key):
+        # appelée une fois le futur terminé : `update()` le trouvera prêt
+        def callback(future):
+            if not future.cancelled():
+                self.on_ready(key)
+        return callback
+
+    def _collect(self):
+        """Dépose dans `engine.prefetched` les tirages que le thread a finis."""
+        prefetched = self.engine.prefetched
+        for key, future in list(self.pending.items()):
+            if not future.done():
+                continue
+            del self.pending[key]
+            # une erreur de calcul ne coûte rien : le moteur tirera lui-même
+            if future.cancelled() or future.exception() is not None:
+                continue
+            prefetched[key] = future.result()
+
+    def wait(self):
+        """Attend la fin des calculs en cours et récupère leurs tirages."""
+        for future in list(self.pending.values()):
+            if not future.cancelled():
+                future.exception()
+        self._collect()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+        self.pending.clear()
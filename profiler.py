@@ -0,0 +1,215 @@
+import json
+import time
+from collections import deque
+
+import pygame
+
+from settings import BLACK, WHITE, WIDTH, PROFILE_WINDOW, PROFILE_OVERLAY_REFRESH_MS
+from utils.fonts import render_text
+
+
+# ------------------------------------------------------
+# Profilage des images
+#
+# La boucle principale découpe chaque image en phases (entrées, update et
+# dessin de la scène, envoi à l'écran…) avec `lap(nom)` : un seul
+# perf_counter_ns par phase, rien d'autre sur le chemin chaud. Les durées
+# des PROFILE_WINDOW dernières images servent aux percentiles ; la trace
+# complète peut être écrite en CSV ou au format Chrome (chrome://tracing,
+# Perfetto) pour diagnostiquer une borne.
+# ------------------------------------------------------
+class RollingStats:
+    """Dernières durées d'une phase (µs) et leurs percentiles."""
+    __slots__ = ("values",)
+
+    def __init__(self, window=PROFILE_WINDOW):
+        self.values = deque(maxlen=window)
+
+    def add(self, value):
+        self.values.append(value)
+
+    def percentiles(self, qs=(50, 95, 99)):
+        if not self.values:
+            return tuple(0 for _ in qs)
+        ordered = sorted(self.values)
+        last = len(ordered) - 1
+        return tuple(ordered[min(last, int(q / 100 * len(ordered)))] for q in qs)
+
+
+class FrameProfiler:
+    """
+    Chronomètre par phases de la boucle principale.
+
+    begin_frame() → lap("input") → lap("update.MapScene") → … → end_frame()
+    Chaque lap mesure le temps écoulé depuis le précédent.
+    """
+
+    def __init__(self, window=PROFILE_WINDOW, trace_path=None):
+        self.window = window
+        self.stats = {}
+        self.frame = 0
+        self.frame_start = 0
+        self.last = 0
+        # phases de l'image en cours : (nom, début, durée) en ns
+        self.current = []
+        self.trace = _open_trace(trace_path) if trace_path else None
+
+    def begin_frame(self):
+        self.frame_start = self.last = time.perf_counter_ns()
+        self.current.clear()
+
+    def lap(self, name):
+        now = time.perf_counter_ns()
+        self.current.append((name, self.last, now - self.last))
+        self.last = now
+
+    def end_frame(self):
+        stats = self.stats
+        for name, _, duration in self.current:
+            phase = stats.get(name)
+            if phase is None:
+                phase = stats[name] = RollingStats(self.window)
+            phase.add(duration / 1000)
+        total = stats.get("frame")
+        if total is None:
+            total = stats["frame"] = RollingStats(self.window)
+        total.add((self.last - self.frame_start) / 1000)
+
+        if self.trace is not None:
+            self.trace.write_frame(self.frame, self.frame_start, self.current)
+        self.frame += 1
+
+    # --------------------------------------------------
+    def report(self):
+        """Lignes (phase, p50, p95, p99) en µs, l'image entière en dernier."""
+        rows = [(name, *s.percentiles()) for name, s in self.stats.items() if name != "frame"]
+        rows.sort()
+        if "frame" in self.stats:
+            rows.append(("frame", *self.stats["frame"].percentiles()))
+        return rows
+
+    def print_report(self):
+        print(f"{'phase':<22} {'p50 µs':>9} {'p95 µs':>9} {'p99 µs':>9}")
+        for name, p50, p95, p99 in self.report():
+            print(f"{name:<22} {p50:9.0f} {p95:9.0f} {p99:9.0f}")
+
+    def close(self):
+        if self.trace is not None:
+            self.trace.close()
+            self.trace = None
+
+
+# ------------------------------------------------------
+# Traces sur disque
+# ------------------------------------------------------
+def _open_trace(path):
+    if path.endswith(".json"):
+        return _ChromeTrace(path)
+    return _CsvTrace(path)
+
+
+class _CsvTrace:
+    """Une ligne par phase : image, phase, début, durée (µs)."""
+
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8")
+        self.file.write("frame,phase,start_us,duration_us\n")
+        self.origin = None
+
+    def write_frame(self, frame, frame_start, phases):
+        if self.origin is None:
+            self.origin = frame_start
+        origin = self.origin
+        self.file.write("".join(
+            f"{frame},{name},{(start - origin) / 1000:.1f},{duration / 1000:.1f}\n"
+            for name, start, duration in phases
+        ))
+
+    def close(self):
+        self.file.close()
+
+
+class _ChromeTrace:
+    """Format « Trace Event » : tableau JSON d'événements complets (ph = X)."""
+
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8")
+        self.file.write("[\n")
+        self.origin = None
+        self.first = True
+
+    def write_frame(self, frame, frame_start, phases):
+        if self.origin is None:
+            self.origin = frame_start
+        origin = self.origin
+        lines = []
+        for name, start, duration in phases:
+            lines.append(json.dumps({
+                "name": name, "ph": "X", "pid": 1, "tid": 1,
+                "ts": (start - origin) / 1000, "dur": duration / 1000,
+                "args": {"frame": frame},
+            }))
+        if not lines:
+            return
+        if not self.first:
+            self.file.write(",\n")
+        self.first = False
+        self.file.write(",\n".join(lines))
+
+    def close(self):
+        self.file.write("\n]\n")
+        self.file.close()
+
+
+# ------------------------------------------------------
+# Calque à l'écran (touche F3)
+# ------------------------------------------------------
+class ProfilerOverlay:
+    """
+    Tableau des percentiles en haut à droite, remis à jour au plus toutes
+    les PROFILE_OVERLAY_REFRESH_MS pour ne pas fausser ce qu'il mesure.
+    """
+    WIDTH = 340
+    LINE_HEIGHT = 18
+    # bord droit des colonnes p50, p95, p99
+    COLUMNS = (210, 270, 330)
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.visible = False
+        self.rect = pygame.Rect(WIDTH - self.WIDTH, 0, self.WIDTH, 0)
+        self.next_refresh = 0
+
+    def toggle(self):
+        """Affiche / masque ; masqué, la scène doit tout redessiner."""
+        self.visible = not self.visible
+        self.next_refresh = 0
+        if not self.visible:
+            pygame.event.post(pygame.event.Event(pygame.VIDEOEXPOSE))
+
+    def draw(self, screen, force=False):
+        """Redessine le calque s'il est temps (ou si `force`), renvoie les rectangles."""
+        if not self.visible:
+            return []
+        now = pygame.time.get_ticks()
+        if not force and now < self.next_refresh:
+            return []
+        self.next_refresh = now + PROFILE_OVERLAY_REFRESH_MS
+
+        rows = [("phase (µs)", "p50", "p95", "p99")]
+        for name, p50, p95, p99 in self.profiler.report():
+            rows.append((name, f"{p50:.0f}", f"{p95:.0f}", f"{p99:.0f}"))
+
+        old = self.rect
+        self.rect = pygame.Rect(
+            WIDTH - self.WIDTH, 0, self.WIDTH, 10 + len(rows) * self.LINE_HEIGHT
+        )
+        screen.fill(BLACK, self.rect.union(old))
+        # colonnes alignées à droite (la police n'est pas à chasse fixe)
+        for i, row in enumerate(rows):
+            y = 5 + i * self.LINE_HEIGHT
+            screen.blit(render_text(row[0], WHITE, 16), (self.rect.x + 8, y))
+            for right, text in zip(self.COLUMNS, row[1:]):
+                txt = render_text(text, WHITE, 16)
+                screen.blit(txt, (self.rect.x + right - txt.get_width(), y))
+        return [self.rect.union(old)]
@@ -0,0 +1,152 @@
+import pygame
+
+from settings import BLACK, WHITE, GREY, RED, TILE_SIZE, HEIGHT, VIEW_ROWS, VIEW_COLS
+from camera import Camera
+from utils.direction import DELTAS
+from utils.fonts import render_text
+
+
+# ------------------------------------------------------
+# Rendu "retenu" de la carte du manoir
+# ------------------------------------------------------
+class MapRenderer:
+    """
+    Garde la partie visible de la grille (voir camera.Camera) sur une
+    surface de fond et ne redessine que ce qui change :
+    - toute la fenêtre quand la caméra défile ;
+    - les cases visibles posées depuis la dernière image ;
+    - les zones du joueur, de la flèche, du HUD et du journal de messages
+      (events.MessageLog, optionnel) quand elles changent.
+
+    `render()` renvoie la liste des rectangles à passer à
+    `pygame.display.update(rects)` (liste vide si rien n'a changé).
+    """
+
+    PLAYER_RADIUS = 15
+    ARROW_WIDTH = 5
+    HUD_POS = (10, HEIGHT - 40)
+    LOG_POS = (10, VIEW_ROWS * TILE_SIZE + 10)
+    LOG_LINE_HEIGHT = 22
+
+    def __init__(self, screen, maison, message_log=None):
+        self.screen = screen
+        self.maison = maison
+        self.message_log = message_log
+        self.background = pygame.Surface(screen.get_size())
+        self.camera = self._make_camera(maison)
+        self.invalidate()
+
+    @staticmethod
+    def _make_camera(maison):
+        camera = Camera(VIEW_ROWS, VIEW_COLS, maison.rows, maison.cols)
+        camera.center_on(*maison.start)
+        return camera
+
+    # --------------------------------------------------
+    def invalidate(self):
+        """Force une reconstruction complète (ex. retour du sélecteur)."""
+        self.background.fill(BLACK)
+        self.maison.draw(self.background, self.camera)
+        self.seen_placements = len(self.maison.placements)
+
+        self.overlay_key = None
+        self.overlay_rects = []
+        self.full_redraw = True
+
+    def set_maison(self, maison):
+        """Change de manoir (nouvelle partie)."""
+        self.maison = maison
+        self.camera = self._make_camera(maison)
+        self.invalidate()
+
+    # --------------------------------------------------
+    def render(self, player, inventory, selected_direction):
+        dirty = []
+        camera = self.camera
+
+        # 0) Le joueur s'approche du bord de la fenêtre → défilement
+        if camera.follow(player.row, player.col):
+            self.invalidate()
+
+        # 1) Cases visibles posées depuis la dernière image → fond mis à jour
+        placements = self.maison.placements
+        if self.seen_placements < len(placements):
+            for r, c in placements[self.seen_placements:]:
+                if not camera.contains(r, c):
+                    continue
+                x, y = camera.to_screen(r, c)
+                rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
+                self.background.fill(BLACK, rect)
+                self.maison.draw_cell(self.background, r, c, camera)
+                dirty.append(rect)
+            self.seen_placements = len(placements)
+
+        # 2) Joueur, flèche et HUD : seulement s'ils ont changé
+        hud_text = self.hud_text(inventory)
+        log_version = self.message_log.version if self.message_log is not None else 0
+        key = (player.row, player.col, selected_direction, hud_text, log_version)
+
+        if self.full_redraw:
+            self.screen.blit(self.background, (0, 0))
+            self.overlay_rects = self.draw_overlay(player, selected_direction, hud_text)
+            self.overlay_key = key
+            self.full_redraw = False
+            return [self.screen.get_rect()]
+
+        if key == self.overlay_key and not dirty:
+            return []
+
+        # on efface l'ancien calque en recopiant le fond
+        for rect in self.overlay_rects + dirty:
+            self.screen.blit(self.background, rect, rect)
+        dirty.extend(self.overlay_rects)
+
+        self.overlay_rects = self.draw_overlay(player, selected_direction, hud_text)
+        self.overlay_key = key
+        dirty.extend(self.overlay_rects)
+        return dirty
+
+    # --------------------------------------------------
+    @staticmethod
+    def hud_text(inventory):
+        return (
+            f"Steps: {inventory.steps} | "
+            f"Keys: {inventory.keys} | "
+            f"Gems: {inventory.gems} | "
+            f"Dice: {inventory.dice} | "
+            f"Coins: {inventory.coins}"
+        )
+
+    def draw_overlay(self, player, selected_direction, hud_text):
+        """Dessine HUD, joueur et flèche, et renvoie leurs rectangles."""
+        rects = []
+
+        # HUD
+        txt = render_text(hud_text, WHITE, 22)
+        rects.append(self.screen.blit(txt, self.HUD_POS))
+
+        # Journal : derniers messages, le plus récent en blanc
+        if self.message_log is not None:
+            lines = list(self.message_log.lines)
+            x, y = self.LOG_POS
+            for i, line in enumerate(lines):
+                color = WHITE if i == len(lines) - 1 else GREY
+                txt = render_text(line, color, 18)
+                rects.append(self.screen.blit(txt, (x, y + i * self.LOG_LINE_HEIGHT)))
+
+        # Joueur
+        x, y = self.camera.to_screen(player.row, player.col)
+        center = (x + TILE_SIZE // 2, y + TILE_SIZE // 2)
+        rects.append(pygame.draw.circle(self.screen, RED, center, self.PLAYER_RADIUS))
+
+        # Flèche de direction
+        if selected_direction is not None:
+            dr, dc = DELTAS[selected_direction]
+            end = (
+                center[0] + dc * (TILE_SIZE // 2),
+                center[1] + dr * (TILE_SIZE // 2),
+            )
+            rect = pygame.draw.line(self.screen, WHITE, center, end, self.ARROW_WIDTH)
+            rects.append(rect.inflate(self.ARROW_WIDTH, self.ARROW_WIDTH))
+
+        return rects
@@ -0,0 +1,398 @@
+import sys
+import os
+import struct
+
+# ==== FIX DES IMPORTS ====
+CURRENT_FILE = os.path.abspath(__file__)
+PROJECT_PATH = os.path.dirname(CURRENT_FILE)
+PARENT_PATH = os.path.dirname(PROJECT_PATH)
+
+if PROJECT_PATH not in sys.path:
+    sys.path.append(PROJECT_PATH)
+if PARENT_PATH not in sys.path:
+    sys.path.append(PARENT_PATH)
+# ==========================
+
+from engine import Engine, MOVE, PICK, REROLL, PHASE_MAP
+from snapshot import GameState
+from events import EventBus, ConsoleSink, FileSink
+from utils.direction import Direction
+from settings import REPLAY_SNAPSHOT_INTERVAL
+
+# ------------------------------------------------------
+# Format du fichier (petit-boutiste)
+#
+#   en-tête : "MNRP", version (B), options (B), K (H), graine (Q),
+#             taille du manoir (lignes I, colonnes I)
+#   puis une suite d'enregistrements :
+#   - une entrée = 1 octet : code (4 bits de poids fort) | argument ;
+#   - un instantané = OP_SNAPSHOT, taille (I), puis
+#     coup (I), direction choisie (B, 255 = aucune), carte (B), GameState.
+#
+# Un instantané est écrit tous les K coups (entrées qui agissent sur le
+# moteur), ce qui permet de reprendre la partie n'importe où sans la
+# rejouer depuis le début, et un dernier à la fermeture : même une partie
+# de moins de K coups peut être vérifiée.
+# ------------------------------------------------------
+MAGIC = b"MNRP"
+# 2 : trouvailles tirées par loot.LootTable (un tirage par entrée)
+# 3 : taille du manoir dans l'en-tête, grille des instantanés par blocs
+# 4 : instantanés avec table des types de salle, codes en petit-boutiste
+# 5 : instantanés sans la liste des portes franchies (jamais relue)
+VERSION = 5
+_HEADER = struct.Struct("<4sBBHQII")
+_SNAPSHOT_HEADER = struct.Struct("<IBB")
+_OPT_END_HOPELESS = 1
+_NO_DIRECTION = 255
+
+# Entrées du joueur
+OP_DIR = 1        # Z / Q / S / D (argument : Direction.value)
+OP_CONFIRM = 2    # ESPACE : valide le déplacement
+OP_LEFT = 3       # ← dans le sélecteur
+OP_RIGHT = 4      # → dans le sélecteur
+OP_REROLL = 5     # R : relance avec un dé
+OP_ENTER = 6      # ENTRÉE : prend la carte sélectionnée
+OP_CANCEL = 7     # fermeture du sélecteur
+OP_SELECT = 8     # sélection directe d'une carte (bot, argument : index)
+OP_SNAPSHOT = 15
+
+# Entrées qui comptent comme un coup
+ACTION_OPS = frozenset((OP_CONFIRM, OP_REROLL, OP_ENTER, OP_CANCEL))
+
+
+def _encode(op, arg=0):
+    return (op << 4) | arg
+
+
+# ------------------------------------------------------
+# Interprétation des entrées (mêmes règles que Game et RoomPicker)
+# ------------------------------------------------------
+class InputState:
+    """
+    Donne un sens aux entrées sans pygame : direction choisie au clavier
+    et carte sélectionnée dans le sélecteur, appliquées au moteur.
+    """
+    __slots__ = ("engine", "selected", "index")
+
+    def __init__(self, engine, selected=None, index=0):
+        self.engine = engine
+        self.selected = selected
+        self.index = index
+
+    def apply(self, op, arg=0):
+        """Applique une entrée et renvoie le code du moteur (ou None)."""
+        engine = self.engine
+        if op == OP_DIR:
+            self.selected = Direction(arg)
+        elif op == OP_CONFIRM:
+            if self.selected is None or engine.phase != PHASE_MAP:
+                return None
+            result = engine.step((MOVE, self.selected))
+            if result == "NEW_ROOM":
+                self.index = 0
+            elif result == "BLOCKED":
+                self.selected = None
+            return result
+        elif op == OP_LEFT:
+            self.index = (self.index - 1) % 3
+        elif op == OP_RIGHT:
+            self.index = (self.index + 1) % 3
+        elif op == OP_SELECT:
+            self.index = arg
+        elif op == OP_REROLL:
+            result = engine.step((REROLL,))
+            if result == "REROLLED":
+                self.index = 0
+            return result
+        elif op == OP_ENTER:
+            return engine.step((PICK, self.index))
+        elif op == OP_CANCEL:
+            engine.cancel_pick()
+        return None
+
+
+# ------------------------------------------------------
+# Enregistrement
+# ------------------------------------------------------
+class ReplayRecorder:
+    """
+    Écrit les entrées d'une partie au fil de l'eau.
+
+    `record(op, arg)` est appelé *avant* d'appliquer l'entrée,
+    `checkpoint(selected, index)` juste après chaque coup.
+    """
+
+    def __init__(self, path, engine, interval=REPLAY_SNAPSHOT_INTERVAL):
+        self.path = path
+        self.engine = engine
+        self.interval = max(1, interval)
+        self.moves = 0
+        # coup du dernier instantané écrit (-1 : aucun)
+        self.snapshot_move = -1
+        # direction et carte courantes, pour l'instantané final : les
+        # entrées qui ne sont pas des coups ne touchent pas au moteur
+        self.inputs = InputState(None)
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "wb")
+        options = _OPT_END_HOPELESS if engine.end_hopeless else 0
+        self.file.write(_HEADER.pack(
+            MAGIC, VERSION, options, self.interval, engine.seed & ((1 << 64) - 1),
+            engine.maison.rows, engine.maison.cols,
+        ))
+
+    def record(self, op, arg=0):
+        if self.file is not None:
+            self.file.write(bytes((_encode(op, arg),)))
+            if op not in ACTION_OPS:
+                self.inputs.apply(op, arg)
+
+    def checkpoint(self, selected, index):
+        if self.file is None:
+            return
+        self.moves += 1
+        self.inputs.selected, self.inputs.index = selected, index
+        if self.moves % self.interval == 0:
+            self._write_snapshot(selected, index)
+
+    def _write_snapshot(self, selected, index):
+        state = self.engine.snapshot().to_bytes()
+        header = _SNAPSHOT_HEADER.pack(
+            self.moves, _NO_DIRECTION if selected is None else selected.value, index
+        )
+        self.file.write(bytes((_encode(OP_SNAPSHOT),)))
+        self.file.write(struct.pack("<I", len(header) + len(state)))
+        self.file.write(header + state)
+        self.snapshot_move = self.moves
+        # un rapport de bug doit garder la partie même après un plantage
+        self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            # état final, sauf s'il vient d'être écrit
+            if self.snapshot_move != self.moves:
+                self._write_snapshot(self.inputs.selected, self.inputs.index)
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ------------------------------------------------------
+# Lecture
+# ------------------------------------------------------
+class Replay:
+    """
+    Contenu d'un fichier de replay :
+    - inputs : octets des entrées, sans les instantanés ;
+    - snapshots : liste triée de (coup, position dans inputs, direction,
+      carte, données du GameState), décodées à la demande.
+    """
+
+    def __init__(self, seed, interval, end_hopeless, inputs, snapshots, size):
+        self.seed = seed
+        self.size = size
+        self.interval = interval
+        self.end_hopeless = end_hopeless
+        self.inputs = inputs
+        self.snapshots = snapshots
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < 5:
+            raise ValueError("fichier de replay trop court")
+        if data[:4] != MAGIC:
+            raise ValueError("ce n'est pas un fichier de replay")
+        if data[4] != VERSION:
+            raise ValueError(f"version de replay non gérée : {data[4]}")
+        if len(data) < _HEADER.size:
+            raise ValueError("fichier de replay trop court")
+        _, _, options, interval, seed, rows, cols = _HEADER.unpack_from(data)
+
+        inputs = bytearray()
+        snapshots = []
+        pos = _HEADER.size
+        while pos < len(data):
+            byte = data[pos]
+            pos += 1
+            if byte >> 4 != OP_SNAPSHOT:
+                inputs.append(byte)
+                continue
+            if pos + 4 > len(data):
+                break
+            (size,) = struct.unpack_from("<I", data, pos)
+            pos += 4
+            if pos + size > len(data):
+                # instantané tronqué (partie interrompue) : on l'ignore
+                break
+            move, selected, index = _SNAPSHOT_HEADER.unpack_from(data, pos)
+            state = bytes(data[pos + _SNAPSHOT_HEADER.size:pos + size])
+            pos += size
+            direction = None if selected == _NO_DIRECTION else Direction(selected)
+            snapshots.append((move, len(inputs), direction, index, state))
+
+        return cls(seed, interval, bool(options & _OPT_END_HOPELESS),
+                   bytes(inputs), snapshots, (rows, cols))
+
+    @property
+    def total_moves(self):
+        return sum(1 for byte in self.inputs if byte >> 4 in ACTION_OPS)
+
+
+class Replayer:
+    """
+    Rejoue un Replay sans affichage, aussi vite que le processeur le permet.
+
+    `seek(move)` repart de l'instantané le plus proche avant ce coup au
+    lieu de tout rejouer depuis le début.
+    """
+
+    def __init__(self, replay, events=None):
+        self.replay = replay
+        self.engine = Engine(replay.seed, replay.end_hopeless, events=events,
+                             size=replay.size)
+        self.state = InputState(self.engine)
+        self.pos = 0       # prochaine entrée à appliquer
+        self.move = 0      # coups déjà joués
+
+    def rewind(self):
+        self.engine.reset(self.replay.seed)
+        self.state = InputState(self.engine)
+        self.pos = 0
+        self.move = 0
+
+    def step(self):
+        """Applique l'entrée suivante ; faux à la fin du replay."""
+        if self.pos >= len(self.replay.inputs):
+            return False
+        byte = self.replay.inputs[self.pos]
+        self.pos += 1
+        op = byte >> 4
+        self.state.apply(op, byte & 0xF)
+        if op in ACTION_OPS:
+            self.move += 1
+        return True
+
+    def seek(self, move):
+        """Place la partie juste après le coup `move` (0 = début)."""
+        # instantané le plus tardif qui ne dépasse pas la cible
+        best = None
+        for snapshot in self.replay.snapshots:
+            if snapshot[0] > move:
+                break
+            best = snapshot
+
+        if best is not None and (move < self.move or best[0] > self.move):
+            snap_move, pos, selected, index, data = best
+            GameState.from_bytes(data).restore(self.engine)
+            self.state = InputState(self.engine, selected, index)
+            self.pos = pos
+            self.move = snap_move
+        elif move < self.move:
+            self.rewind()
+
+        while self.move < move and self.step():
+            pass
+        return self.engine
+
+    def run(self):
+        """Rejoue jusqu'à la fin et renvoie le moteur final."""
+        while self.step():
+            pass
+        return self.engine
+
+    def verify(self):
+        """
+        Rejoue depuis le début en comparant chaque instantané enregistré à
+        l'état recalculé : position, générateur (compteurs des flux) et
+        pas utilisés. Renvoie le premier coup divergent, ou None (rien à
+        vérifier si le replay n'a aucun instantané).
+        """
+        self.rewind()
+        for snap_move, pos, _, _, data in self.replay.snapshots:
+            while self.pos < pos and self.step():
+                pass
+            saved = GameState.from_bytes(data)
+            state = self.engine.snapshot()
+            if (
+                self.move != snap_move
+                or state != saved
+                or _rng_key(state) != _rng_key(saved)
+                or state.steps_used != saved.steps_used
+            ):
+                return snap_move
+        return None
+
+
+def _rng_key(state):
+    # les graines sont écrites sur 64 bits (GameState.to_bytes)
+    seed, counters = state.rng_state
+    return seed & ((1 << 64) - 1), counters
+
+
+# ------------------------------------------------------
+# Ligne de commande : python main.py replay partie.replay --seek 120
+# ------------------------------------------------------
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog="replay",
+        description="Rejoue une partie enregistrée sans affichage.",
+    )
+    parser.add_argument("path", help="fichier de replay")
+    parser.add_argument("--seek", type=int, default=None,
+                        help="s'arrêter juste après ce coup")
+    parser.add_argument("--verify", action="store_true",
+                        help="vérifier que la partie se rejoue à l'identique")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="afficher les messages de la partie")
+    parser.add_argument("--events", default=None,
+                        help="écrire les événements de la partie (JSON, une ligne chacun)")
+    args = parser.parse_args(argv)
+
+    events = EventBus()
+    if args.verbose:
+        events.subscribe(ConsoleSink())
+    if args.events:
+        events.subscribe(FileSink(args.events))
+
+    replay = Replay.load(args.path)
+    replayer = Replayer(replay, events)
+    print(f"Graine {replay.seed} | manoir {replay.size[0]} x {replay.size[1]} | "
+          f"{replay.total_moves} coups | "
+          f"{len(replay.snapshots)} instantanés (tous les {replay.interval} coups)")
+
+    if args.verify:
+        diverged = replayer.verify()
+        if not replay.snapshots:
+            print("Aucun instantané : rien à vérifier.")
+        elif diverged is None:
+            print("Replay déterministe : tous les instantanés concordent.")
+        else:
+            print(f"Divergence au coup {diverged}.")
+
+    if args.seek is not None:
+        engine = replayer.seek(args.seek)
+    else:
+        engine = replayer.run()
+
+    events.close()
+    player = engine.player
+    print(f"Coup {replayer.move} | phase {engine.phase} | issue {engine.outcome} | "
+          f"joueur ({player.row}, {player.col}) | pas restants {engine.inventory.steps}")
+    return replayer
+
+
+if __name__ == "__main__":
+    main()
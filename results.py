@@ -0,0 +1,297 @@
+import sys
+import os
+import json
+import time
+import queue
+import sqlite3
+import argparse
+import threading
+
+# ==== FIX DES IMPORTS ====
+CURRENT_FILE = os.path.abspath(__file__)
+PROJECT_PATH = os.path.dirname(CURRENT_FILE)
+PARENT_PATH = os.path.dirname(PROJECT_PATH)
+
+if PROJECT_PATH not in sys.path:
+    sys.path.append(PROJECT_PATH)
+if PARENT_PATH not in sys.path:
+    sys.path.append(PARENT_PATH)
+# ==========================
+
+from engine import OUTCOME_WIN
+from settings import RESULTS_DB, RESULTS_BATCH, RESULTS_FLUSH_S
+
+# ------------------------------------------------------
+# Base de résultats des simulations (SQLite)
+#
+# Une ligne par partie jouée (table games) et, pour chaque partie, le
+# nombre de salles posées par nom (table placements). Les configurations
+# du balayage (sweep.py) sont rangées sous leur empreinte (table configs).
+#
+# Les workers ne font aucune entrée-sortie : ils renvoient leurs lignes
+# avec leurs compteurs, le processus principal les passe à ResultsStore
+# qui les écrit depuis un thread, par grosses transactions.
+# ------------------------------------------------------
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS configs (
+    config_hash TEXT PRIMARY KEY,
+    config      TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS games (
+    id          INTEGER PRIMARY KEY,
+    seed        INTEGER NOT NULL,
+    config_hash TEXT NOT NULL,
+    policy      TEXT NOT NULL,
+    map_rows    INTEGER NOT NULL,
+    map_cols    INTEGER NOT NULL,
+    outcome     TEXT NOT NULL,
+    steps_used  INTEGER NOT NULL,
+    keys_spent  INTEGER NOT NULL,
+    gems_spent  INTEGER NOT NULL,
+    coins_spent INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS placements (
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    room    TEXT NOT NULL,
+    count   INTEGER NOT NULL
+);
+-- taux de victoire par configuration (index couvrant)
+CREATE INDEX IF NOT EXISTS games_config_outcome ON games(config_hash, outcome);
+-- fréquence des salles posées, et salles d'une partie
+CREATE INDEX IF NOT EXISTS placements_room ON placements(room, count);
+CREATE INDEX IF NOT EXISTS placements_game ON placements(game_id);
+"""
+
+_INSERT_GAME = "INSERT INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+_INSERT_PLACEMENT = "INSERT INTO placements VALUES (?, ?, ?)"
+_INSERT_CONFIG = "INSERT OR IGNORE INTO configs VALUES (?, ?)"
+
+
+def _connect(path):
+    conn = sqlite3.connect(path)
+    # WAL : les lectures (analyse) ne bloquent pas l'écriture en cours
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+# ------------------------------------------------------
+# Écriture
+# ------------------------------------------------------
+class ResultsStore:
+    """
+    Écrit les parties dans la base `path` depuis un thread dédié.
+
+    `add_games` ne fait que mettre les lignes en file (jamais bloquant) ;
+    le thread les écrit par transactions d'au moins `batch` parties, ou
+    toutes les `flush_every` secondes s'il en arrive peu. `close()` écrit
+    le reste et remonte une éventuelle erreur d'écriture.
+    """
+
+    def __init__(self, path=RESULTS_DB, batch=RESULTS_BATCH, flush_every=RESULTS_FLUSH_S):
+        self.path = path
+        self.batch = batch
+        self.flush_every = flush_every
+        self.queue = queue.Queue()
+        self.error = None
+        self.written = 0
+        self.transactions = 0
+        self.thread = threading.Thread(target=self._run, name="results-writer", daemon=True)
+        self.thread.start()
+
+    def add_config(self, config_hash, config):
+        self.queue.put(("config", (config_hash, json.dumps(config, sort_keys=True))))
+
+    def add_games(self, config_hash, policy, size, records):
+        """
+        Met en file des parties jouées sous une même configuration.
+        records : (graine, issue, pas, clés, gemmes, pièces, ((salle, nombre), …)).
+        """
+        if records:
+            self.queue.put(("games", (config_hash, policy, size, records)))
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+    # --------------------------------------------------
+    def _run(self):
+        try:
+            conn = _connect(self.path)
+        except sqlite3.Error as e:
+            self.error = e
+            return
+        try:
+            (next_id,) = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM games").fetchone()
+            games, placements, configs = [], [], []
+            last_flush = time.monotonic()
+            while True:
+                try:
+                    item = self.queue.get(timeout=self.flush_every)
+                except queue.Empty:
+                    item = ()
+                if item is None:
+                    break
+
+                if item and item[0] == "config":
+                    configs.append(item[1])
+                elif item:
+                    config_hash, policy, (rows, cols), records = item[1]
+                    for seed, outcome, steps, keys, gems, coins, rooms in records:
+                        games.append((next_id, seed, config_hash, policy, rows, cols,
+                                      outcome, steps, keys, gems, coins))
+                        placements.extend((next_id, room, n) for room, n in rooms)
+                        next_id += 1
+
+                now = time.monotonic()
+                if len(games) >= self.batch or (
+                    (games or configs) and now - last_flush >= self.flush_every
+                ):
+                    self._flush(conn, games, placements, configs)
+                    last_flush = now
+
+            self._flush(conn, games, placements, configs)
+        except sqlite3.Error as e:
+            self.error = e
+            # on vide la file pour ne pas garder les lignes en mémoire
+            while self.queue.get() is not None:
+                pass
+        finally:
+            conn.close()
+
+    def _flush(self, conn, games, placements, configs):
+        if not (games or configs):
+            return
+        with conn:
+            conn.executemany(_INSERT_CONFIG, configs)
+            conn.executemany(_INSERT_GAME, games)
+            conn.executemany(_INSERT_PLACEMENT, placements)
+        self.written += len(games)
+        self.transactions += 1
+        games.clear()
+        placements.clear()
+        configs.clear()
+
+
+# ------------------------------------------------------
+# Lecture
+# ------------------------------------------------------
+GAME_FIELDS = (
+    "id", "seed", "config_hash", "policy", "map_rows", "map_cols", "outcome",
+    "steps_used", "keys_spent", "gems_spent", "coins_spent",
+)
+
+
+def _reader(path):
+    # lecture seule : l'analyse ne peut pas toucher à la base
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+
+def iter_games(path=RESULTS_DB, config_hash=None, chunk=RESULTS_BATCH):
+    """
+    Parcourt les parties une à une (dict, avec "rooms" = {salle: nombre})
+    sans charger la base en mémoire : deux curseurs triés par partie, lus
+    par paquets de `chunk` lignes et fusionnés au fil de l'eau.
+    """
+    conn = _reader(path)
+    try:
+        where, args = "", ()
+        if config_hash is not None:
+            where, args = " WHERE config_hash = ?", (config_hash,)
+        games = conn.execute(f"SELECT * FROM games{where} ORDER BY id", args)
+        rooms = conn.execute(
+            "SELECT game_id, room, count FROM placements"
+            + (" WHERE game_id IN (SELECT id FROM games WHERE config_hash = ?)" if where else "")
+            + " ORDER BY game_id",
+            args,
+        )
+        room_rows = _rows(rooms, chunk)
+        pending = next(room_rows, None)
+        for row in _rows(games, chunk):
+            game = dict(zip(GAME_FIELDS, row))
+            placed = {}
+            # les salles des parties sans ligne (filtrées) sont sautées
+            while pending is not None and pending[0] <= game["id"]:
+                if pending[0] == game["id"]:
+                    placed[pending[1]] = pending[2]
+                pending = next(room_rows, None)
+            game["rooms"] = placed
+            yield game
+    finally:
+        conn.close()
+
+
+def _rows(cursor, chunk):
+    while True:
+        rows = cursor.fetchmany(chunk)
+        if not rows:
+            return
+        yield from rows
+
+
+def win_rates(path=RESULTS_DB):
+    """[(empreinte, configuration, parties, victoires)] par configuration."""
+    conn = _reader(path)
+    try:
+        return conn.execute(
+            "SELECT g.config_hash, c.config, COUNT(*), SUM(g.outcome = :win)"
+            " FROM games g LEFT JOIN configs c ON c.config_hash = g.config_hash"
+            " GROUP BY g.config_hash ORDER BY SUM(g.outcome = :win) * 1.0 / COUNT(*) DESC",
+            {"win": OUTCOME_WIN},
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def room_frequencies(path=RESULTS_DB, config_hash=None):
+    """[(salle, nombre de fois posée)], de la plus posée à la moins posée."""
+    conn = _reader(path)
+    try:
+        if config_hash is None:
+            query, args = "SELECT room, SUM(count) FROM placements GROUP BY room", ()
+        else:
+            query = (
+                "SELECT p.room, SUM(p.count) FROM placements p"
+                " JOIN games g ON g.id = p.game_id WHERE g.config_hash = ?"
+                " GROUP BY p.room"
+            )
+            args = (config_hash,)
+        return sorted(conn.execute(query, args).fetchall(), key=lambda r: -r[1])
+    finally:
+        conn.close()
+
+
+# ------------------------------------------------------
+# Ligne de commande : python main.py results [base.sqlite]
+# ------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="results",
+        description="Résumé de la base de résultats des simulations.",
+    )
+    parser.add_argument("db", nargs="?", default=RESULTS_DB, help="fichier SQLite")
+    parser.add_argument("--config", default=None,
+                        help="empreinte de configuration pour les salles posées")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"Pas de base de résultats ({args.db}) : lancer simulate ou sweep avec --db.")
+        return
+
+    print(f"{'empreinte':<16} {'parties':>8} {'victoires':>9}  configuration")
+    for config_hash, config, games, wins in win_rates(args.db):
+        print(f"{config_hash:<16} {games:>8} {wins / games:>9.2%}  {config or '?'}")
+
+    print()
+    print("Salles posées" + (f" ({args.config})" if args.config else "") + " :")
+    rows = room_frequencies(args.db, args.config)
+    total = sum(n for _, n in rows) or 1
+    for room, n in rows:
+        print(f"  {room:<14} {n:>9} {n / total:>7.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,52 +1,107 @@
+from collections import OrderedDict
+
 import pygame
-from settings import WHITE, WIDTH, HEIGHT
-from rooms_catalog import pick_random_rooms
-from utils.direction import Direction
+from settings import WHITE, WIDTH, HEIGHT, PICKER_FPS, CARD_CACHE_SIZE
+from engine import PICK, REROLL
+from replay import OP_LEFT, OP_RIGHT, OP_REROLL, OP_ENTER, OP_CANCEL, OP_SELECT
+from scenes import Scene
+from utils.fonts import render_text
 
 CARD_W = 250
 CARD_H = 250
-
-
-class RoomPicker:
-    def __init__(self, inventory, entry_dir, target_row, target_col):
-        self.inventory = inventory
-        self.entry_dir = entry_dir
-        self.target_row = target_row
-        self.target_col = target_col
-
-        # IMPORTANT : on tient compte de la direction + position
-        self.rooms = pick_random_rooms(entry_dir, target_row, target_col)
+CARD_BG = (30, 30, 30)
+
+
+# ------------------------------------------------------
+# Cartes pré-rendues
+# Le fond, le bandeau et les textes d'une carte ne dépendent que de la
+# salle et de son accessibilité : on garde la surface (LRU) pour que
+# l'ouverture du sélecteur ne fasse que des blits. pregen.py les prépare
+# pour les tirages calculés d'avance.
+# ------------------------------------------------------
+_CARDS = OrderedDict()
+
+
+def card_surface(room, affordable):
+    """Carte de `room` sans sa bordure (qui dépend de la sélection)."""
+    key = (room.name, room.get_color(), room.cost, room.rarity, affordable)
+    surface = _CARDS.get(key)
+    if surface is not None:
+        _CARDS.move_to_end(key)
+        return surface
+
+    surface = pygame.Surface((CARD_W, CARD_H), pygame.SRCALPHA)
+    pygame.draw.rect(surface, CARD_BG, (0, 0, CARD_W, CARD_H), border_radius=12)
+
+    # Bandeau de couleur
+    color_rect = pygame.Rect(20, 20, CARD_W - 40, 70)
+    pygame.draw.rect(surface, room.get_color(), color_rect, border_radius=10)
+
+    # Nom
+    name_color = WHITE if affordable else (150, 150, 150)
+    name = render_text(room.name, name_color, 28)
+    surface.blit(name, (CARD_W // 2 - name.get_width() // 2, 110))
+
+    # Coût
+    cost_text = f"Cost: {room.cost} gem(s)"
+    cost_color = WHITE if affordable else (200, 80, 80)
+    cost = render_text(cost_text, cost_color, 20)
+    surface.blit(cost, (CARD_W // 2 - cost.get_width() // 2, 150))
+
+    # Rareté
+    rare_text = f"Rarity: {room.rarity}"
+    rare = render_text(rare_text, (200, 200, 200), 20)
+    surface.blit(rare, (CARD_W // 2 - rare.get_width() // 2, 180))
+
+    _CARDS[key] = surface
+    if len(_CARDS) > CARD_CACHE_SIZE:
+        _CARDS.popitem(last=False)
+    return surface
+
+
+def prerender_cards(rooms, gems):
+    """Prépare les cartes d'un tirage pour un inventaire de `gems` gemmes."""
+    for room in rooms:
+        card_surface(room, room.cost <= gems)
+
+
+class RoomPicker(Scene):
+    fps = PICKER_FPS
+
+    def __init__(self, engine, bot=None, recorder=None):
+        super().__init__()
+        # Le tirage (direction + position) est fait par le moteur
+        self.engine = engine
+        self.inventory = engine.inventory
         self.index = 0
-
-        self.title_font = pygame.font.SysFont("arial", 40, bold=True)
-        self.card_font = pygame.font.SysFont("arial", 28)
-        self.small_font = pygame.font.SysFont("arial", 20)
+        # bot optionnel qui choisit la carte à la place du joueur
+        self.bot = bot
+        # enregistrement optionnel des entrées (replay.ReplayRecorder)
+        self.recorder = recorder
+        self.direction = engine.pending_dir
+        self.dirty = True
+        self.frames = 0
+
+    def record(self, op, arg=0):
+        if self.recorder is not None:
+            self.recorder.record(op, arg)
+
+    def checkpoint(self):
+        if self.recorder is not None:
+            self.recorder.checkpoint(self.direction, self.index)
+
+    @property
+    def busy(self):
+        # le bot joue sans attendre d'entrée
+        return self.bot is not None and not self.engine.is_over()
+
+    @property
+    def rooms(self):
+        return self.engine.pending_rooms
 
     def draw_card(self, screen, room, x, y, selected):
-        CARD_BG = (30, 30, 30)
-        pygame.draw.rect(screen, CARD_BG, (x, y, CARD_W, CARD_H), border_radius=12)
-
-        # Bandeau de couleur
-        color_rect = pygame.Rect(x + 20, y + 20, CARD_W - 40, 70)
-        pygame.draw.rect(screen, room.get_color(), color_rect, border_radius=10)
-
         affordable = room.cost <= self.inventory.gems
-
-        # Nom
-        name_color = WHITE if affordable else (150, 150, 150)
-        name = self.card_font.render(room.name, True, name_color)
-        screen.blit(name, (x + CARD_W // 2 - name.get_width() // 2, y + 110))
-
-        # Coût
-        cost_text = f"Cost: {room.cost} gem(s)"
-        cost_color = WHITE if affordable else (200, 80, 80)
-        cost = self.small_font.render(cost_text, True, cost_color)
-        screen.blit(cost, (x + CARD_W // 2 - cost.get_width() // 2, y + 150))
-
-        # Rareté
-        rare_text = f"Rarity: {room.rarity}"
-        rare = self.small_font.render(rare_text, True, (200, 200, 200))
-        screen.blit(rare, (x + CARD_W // 2 - rare.get_width() // 2, y + 180))
+        screen.blit(card_surface(room, affordable), (x, y))
 
         # Bordure
         if selected and affordable:
@@ -61,62 +116,99 @@ class RoomPicker:
             width=width, border_radius=12
         )
 
-    def run(self, screen):
-        clock = pygame.time.Clock()
-        running = True
-
-        while running:
-            clock.tick(30)
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return None
-
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_LEFT:
-                        self.index = (self.index - 1) % 3
-                    if event.key == pygame.K_RIGHT:
-                        self.index = (self.index + 1) % 3
-
-                    # Relancer le tirage avec un dé
-                    if event.key == pygame.K_r:
-                        if self.inventory.dice > 0:
-                            self.inventory.dice -= 1
-                            self.rooms = pick_random_rooms(
-                                self.entry_dir, self.target_row, self.target_col
-                            )
-                            self.index = 0
-                            print("Nouveau tirage de salles (dé dépensé).")
-
-                    if event.key == pygame.K_RETURN:
-                        room = self.rooms[self.index]
-                        if room.cost > self.inventory.gems:
-                            print("Pas assez de gemmes pour cette salle.")
-                            continue
-                        if room.cost > 0:
-                            self.inventory.gems -= room.cost
-                            print(f"{room.cost} gemme(s) dépensée(s).")
-                        return room
-
-            # ---- DESSIN ----
-            screen.fill((10, 10, 10))
-
-            title = self.title_font.render("Choose a Room", True, WHITE)
-            screen.blit(title, (WIDTH // 2 - title.get_width() // 2, 40))
-
-            hint = self.small_font.render(
-                "← → pour choisir, ENTER pour valider, R pour relancer (si dé).",
-                True, WHITE,
-            )
-            screen.blit(hint, (WIDTH // 2 - hint.get_width() // 2, HEIGHT - 60))
-
-            spacing = 70
-            total_width = 3 * CARD_W + 2 * spacing
-            start_x = WIDTH // 2 - total_width // 2
-            y = HEIGHT // 2 - CARD_H // 2
-
-            for i, room in enumerate(self.rooms):
-                x = start_x + i * (CARD_W + spacing)
-                self.draw_card(screen, room, x, y, i == self.index)
-
-            pygame.display.flip()
+    # --------------------------------------------------
+    # Scène (voir scenes.py) : la boucle principale appelle handle,
+    # update puis draw ; le sélecteur se retire de la pile une fois la
+    # salle posée.
+    # --------------------------------------------------
+    def enter(self):
+        # on ne redessine qu'après une entrée ou un changement d'état
+        self.dirty = True
+
+    def close(self):
+        # fenêtre fermée pendant le tirage
+        self.record(OP_CANCEL)
+        self.engine.cancel_pick()
+        self.checkpoint()
+
+    def handle(self, event):
+        if event.type == pygame.VIDEOEXPOSE:
+            self.dirty = True
+
+        if event.type != pygame.KEYDOWN:
+            return
+        self.dirty = True
+        if event.key == pygame.K_LEFT:
+            self.record(OP_LEFT)
+            self.index = (self.index - 1) % 3
+        if event.key == pygame.K_RIGHT:
+            self.record(OP_RIGHT)
+            self.index = (self.index + 1) % 3
+
+        # Relancer le tirage avec un dé
+        if event.key == pygame.K_r:
+            self.record(OP_REROLL)
+            if self.engine.step((REROLL,)) == "REROLLED":
+                self.index = 0
+            self.checkpoint()
+
+        if event.key == pygame.K_RETURN:
+            self.record(OP_ENTER)
+            placed = self.engine.step((PICK, self.index)) == "PLACED"
+            self.checkpoint()
+            # sinon : pas assez de gemmes (annoncé par le moteur)
+            if placed:
+                self.stack.pop()
+
+    def update(self):
+        # Partie terminée pendant le tirage (aucune carte jouable)
+        if self.engine.is_over():
+            self.stack.pop()
+            return
+
+        # ---- CHOIX DU BOT ----
+        # (à partir de la 2e image, pour que le tirage soit vu à l'écran)
+        self.frames += 1
+        if self.bot is None or self.frames < 2:
+            return
+        action = self.bot.choose(self.engine)
+        self.dirty = True
+        if action[0] == REROLL:
+            self.record(OP_REROLL)
+            self.engine.step(action)
+            self.index = 0
+            self.checkpoint()
+        else:
+            self.index = action[1]
+            self.record(OP_SELECT, self.index)
+            self.record(OP_ENTER)
+            self.engine.step(action)
+            self.checkpoint()
+            self.stack.pop()
+
+    def draw(self, screen):
+        if not self.dirty:
+            return []
+        self.dirty = False
+
+        screen.fill((10, 10, 10))
+
+        title = render_text("Choose a Room", WHITE, 40, bold=True)
+        screen.blit(title, (WIDTH // 2 - title.get_width() // 2, 40))
+
+        hint = render_text(
+            "← → pour choisir, ENTER pour valider, R pour relancer (si dé).",
+            WHITE, 20,
+        )
+        screen.blit(hint, (WIDTH // 2 - hint.get_width() // 2, HEIGHT - 60))
+
+        spacing = 70
+        total_width = 3 * CARD_W + 2 * spacing
+        start_x = WIDTH // 2 - total_width // 2
+        y = HEIGHT // 2 - CARD_H // 2
+
+        for i, room in enumerate(self.rooms):
+            x = start_x + i * (CARD_W + spacing)
+            self.draw_card(screen, room, x, y, i == self.index)
+
+        return [screen.get_rect()]
@@ -0,0 +1,234 @@
+import sys
+import os
+
+# ==== FIX DES IMPORTS ====
+CURRENT_FILE = os.path.abspath(__file__)
+PROJECT_PATH = os.path.dirname(CURRENT_FILE)
+PARENT_PATH = os.path.dirname(PROJECT_PATH)
+
+if PROJECT_PATH not in sys.path:
+    sys.path.append(PROJECT_PATH)
+if PARENT_PATH not in sys.path:
+    sys.path.append(PARENT_PATH)
+# ==========================
+
+# NumPy est optionnel : seul ce module en a besoin
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import rooms_catalog
+from rooms_catalog import (
+    ROOM_DEFS, EDGE_TOP, EDGE_BOTTOM, EDGE_LEFT, EDGE_RIGHT, EDGE_COMBINATIONS,
+    candidates_by_edges, lock_probabilities, opposite,
+)
+from models import Room, Door, room_type
+from utils.direction import Direction
+from utils.door_bits import DOOR_BITS
+from utils.lock_state import LockState
+
+# ------------------------------------------------------
+# Tirages de salles en masse (études d'équilibrage)
+#
+# Même loi que pick_random_rooms (rareté, "au moins une salle gratuite",
+# verrous par ligne), mais pour n cases d'un coup avec NumPy. Les
+# résultats restent des tableaux d'indices et de niveaux ; les Room ne
+# sont construites qu'à la demande.
+#
+# Le hasard vient d'un numpy.random.Generator : la loi est la même que
+# celle du moteur, pas la suite de tirages d'une partie donnée.
+# ------------------------------------------------------
+_DIRECTIONS = list(Direction)
+_N_DEFS = len(ROOM_DEFS)
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("rooms_batch nécessite NumPy (pip install numpy)")
+
+
+class _Tables:
+    """
+    Le catalogue compilé sous forme de tableaux : une ligne par
+    CandidateTable, poids cumulés complétés par +inf. Les tables ne
+    dépendent que des bords touchés, pas de la taille du manoir.
+    """
+
+    def __init__(self):
+        self.version = rooms_catalog._CATALOG_VERSION[0]
+
+        # table[face, bords + 1] ; l'indice 0 = case inconnue
+        self.table_id = np.zeros((len(_DIRECTIONS), EDGE_COMBINATIONS + 1), dtype=np.int32)
+        tables = []
+        ids = {}
+        for side in _DIRECTIONS:
+            for edges in [None] + list(range(EDGE_COMBINATIONS)):
+                table = candidates_by_edges(side, edges)
+                if id(table) not in ids:
+                    ids[id(table)] = len(tables)
+                    tables.append(table)
+                self.table_id[side.value, 0 if edges is None else edges + 1] = ids[id(table)]
+
+        n = len(tables)
+        index_of = {id(d): i for i, d in enumerate(ROOM_DEFS)}
+        # sous-tables : 0 = toutes, 1 = gratuites, 2 = payantes
+        self.cum = np.full((n, 3, _N_DEFS), np.inf)
+        self.defs = np.zeros((n, 3, _N_DEFS), dtype=np.int16)
+        self.total = np.ones((n, 3))
+        self.size = np.zeros((n, 3), dtype=np.int16)
+        self.pattern_cum = np.full((n, 7), np.inf)
+        self.pattern_total = np.ones(n)
+        self.has_patterns = np.zeros(n, dtype=bool)
+
+        for t, table in enumerate(tables):
+            for k, sub in enumerate((table.all, table.free, table.paid)):
+                m = len(sub.defs)
+                self.size[t, k] = m
+                if m:
+                    self.cum[t, k, :m] = sub.cum_weights
+                    self.defs[t, k, :m] = [index_of[id(d)] for d in sub.defs]
+                    self.total[t, k] = sub.total
+            if table.pattern_cum:
+                self.has_patterns[t] = True
+                # motifs dans l'ordre 1..7 : le motif i+1 est à l'indice i
+                self.pattern_cum[t] = table.pattern_cum
+                self.pattern_total[t] = table.pattern_total
+
+        # portes de chaque définition, par direction
+        self.has_door = np.zeros((_N_DEFS, len(_DIRECTIONS)), dtype=bool)
+        for i, d in enumerate(ROOM_DEFS):
+            for direction in d["doors"]:
+                self.has_door[i, direction.value] = True
+
+        # id du type de salle partagé (codes de case)
+        self.type_id = np.array(
+            [room_type(d["name"], d["color"], d["cost"], d["rarity"]).id for d in ROOM_DEFS],
+            dtype=np.uint32,
+        )
+
+
+_TABLES = [None]
+
+
+def _tables():
+    tables = _TABLES[0]
+    if tables is None or tables.version != rooms_catalog._CATALOG_VERSION[0]:
+        tables = _Tables()
+        _TABLES[0] = tables
+    return tables
+
+
+def _search(cum, u):
+    """bisect_right ligne par ligne : nombre de poids cumulés <= u."""
+    return (cum <= u[..., None]).sum(axis=-1)
+
+
+def _lock_cum(rows, n_rows):
+    """
+    Loi cumulée (p_unlocked, p_unlocked + p_locked) des verrous pour
+    chaque ligne de `rows` (-1 = inconnue) : lock_probabilities n'est
+    appelée qu'une fois par ligne distincte.
+    """
+    unique, inverse = np.unique(rows, return_inverse=True)
+    probs = np.array([
+        lock_probabilities(None if r < 0 else int(r), n_rows) for r in unique
+    ])
+    return np.cumsum(probs, axis=1)[:, :2][inverse]
+
+
+# ------------------------------------------------------
+# Résultat d'un tirage en masse
+# ------------------------------------------------------
+class RoomBatch:
+    """
+    n tirages de 3 cartes :
+    - def_index : (n, 3) indices dans ROOM_DEFS ;
+    - locks : (n, 3, 4) niveau de verrou (0, 1, 2) de chaque porte par
+      Direction.value, -1 s'il n'y a pas de porte.
+    """
+
+    def __init__(self, def_index, locks, type_id):
+        self.def_index = def_index
+        self.locks = locks
+        self._type_id = type_id
+
+    def __len__(self):
+        return len(self.def_index)
+
+    def codes(self):
+        """Codes de case (n, 3), comme Room.code."""
+        bits = np.where(self.locks >= 0, self.locks + 1, 0).astype(np.uint32)
+        shifts = 2 * np.arange(len(_DIRECTIONS), dtype=np.uint32)
+        doors = (bits << shifts).sum(axis=-1, dtype=np.uint32)
+        return (self._type_id[self.def_index] << DOOR_BITS) | doors
+
+    def rooms(self, i):
+        """Les 3 Room du tirage i, construites comme par pick_random_rooms."""
+        rooms = []
+        for slot in range(3):
+            defn = ROOM_DEFS[self.def_index[i, slot]]
+            doors = [
+                Door(d, LockState(int(self.locks[i, slot, d.value])))
+                for d in defn["doors"]
+            ]
+            rooms.append(Room(defn["name"], defn["color"], defn["cost"], defn["rarity"], doors))
+        return rooms
+
+
+def pick_random_rooms_batch(entry_dirs, target_rows, target_cols, rng=None, size=None):
+    """
+    Version vectorisée de pick_random_rooms pour n cases.
+
+    entry_dirs : directions choisies par le joueur (Direction ou valeurs) ;
+    target_rows / target_cols : cases cibles (-1 = case inconnue) ;
+    rng : numpy.random.Generator, ou une graine ;
+    size : (lignes, colonnes) du manoir (taille par défaut du catalogue).
+    """
+    _require_numpy()
+    tables = _tables()
+    n_rows, n_cols = size if size is not None else rooms_catalog._CATALOG_SIZE
+    if not isinstance(rng, np.random.Generator):
+        rng = np.random.default_rng(rng)
+
+    if not isinstance(entry_dirs, np.ndarray):
+        entry_dirs = [d.value if isinstance(d, Direction) else d for d in entry_dirs]
+    entry = np.asarray(entry_dirs, dtype=np.int64)
+    rows = np.asarray(target_rows, dtype=np.int64)
+    cols = np.asarray(target_cols, dtype=np.int64)
+    # une position incomplète compte comme inconnue (comme get_candidates)
+    unknown = (rows < 0) | (cols < 0)
+    if np.any((rows >= n_rows) | (cols >= n_cols)):
+        raise ValueError(f"case hors du manoir {n_rows} x {n_cols}")
+    edges = (
+        np.where(rows == 0, EDGE_TOP, 0)
+        | np.where(rows == n_rows - 1, EDGE_BOTTOM, 0)
+        | np.where(cols == 0, EDGE_LEFT, 0)
+        | np.where(cols == n_cols - 1, EDGE_RIGHT, 0)
+    )
+    edges1 = np.where(unknown, 0, edges + 1)
+    n = len(entry)
+
+    # face d'entrée de la nouvelle salle = opposée de la direction du joueur
+    opposite_value = np.array([opposite(d).value for d in _DIRECTIONS])
+    t = tables.table_id[opposite_value[entry], edges1]
+
+    # 1) motif "gratuite / payante" des 3 cartes (sous-table 0 sans motif)
+    u = rng.random(n) * tables.pattern_total[t]
+    pattern = np.minimum(_search(tables.pattern_cum[t], u), 6) + 1
+    slots = np.arange(3)
+    free = (pattern[:, None] >> slots) & 1
+    sub = np.where(tables.has_patterns[t][:, None], 2 - free, 0)
+
+    # 2) définition de chaque carte dans sa sous-table
+    tt = np.broadcast_to(t[:, None], (n, 3))
+    u = rng.random((n, 3)) * tables.total[tt, sub]
+    pos = np.minimum(_search(tables.cum[tt, sub], u), tables.size[tt, sub] - 1)
+    def_index = tables.defs[tt, sub, pos]
+
+    # 3) verrous : un tirage par porte, loi de la ligne (même sans colonne)
+    cum = _lock_cum(np.where(rows < 0, -1, rows), n_rows)[:, None, None, :]
+    levels = (rng.random((n, 3, len(_DIRECTIONS)))[..., None] >= cum).sum(axis=-1)
+    locks = np.where(tables.has_door[def_index], levels, -1).astype(np.int8)
+
+    return RoomBatch(def_index, locks, tables.type_id)
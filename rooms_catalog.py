@@ -1,7 +1,8 @@
-import random
-from models import Room, Door
-from utils.direction import Direction
+import bisect
+from models import Room, Door, room_type
+from utils.direction import Direction, DELTAS
 from utils.lock_state import LockState
+from utils.rng import default_service, ROOM_DRAW
 from settings import MAP_ROWS, MAP_COLS
 
 
@@ -94,48 +95,76 @@ ROOM_DEFS = [
     },
 ]
 
-def random_lock_state_for_row(row):
-    """
-    Choisit aléatoirement un niveau de verrouillage pour une porte
-    située sur la ligne `row` de la grille.
+# Loi des verrous entre le départ et l'antichambre, par tranche de
+# progression verticale (0 tout en bas, 1 tout en haut) :
+# (borne haute de la tranche, (p_unlocked, p_locked, p_double))
+LOCK_BANDS = [
+    # proche de l'entrée : surtout des portes ouvertes
+    (0.33, (0.7, 0.25, 0.05)),
+    # milieu du manoir : mix équilibré
+    (0.66, (0.5, 0.35, 0.15)),
+    # proche de l'antichambre (mais pas tout en haut) : portes plus dures
+    (1.0, (0.3, 0.4, 0.3)),
+]
 
-    - Rangée de départ (MAP_ROWS - 1) : toujours UNLOCKED (niveau 0)
-    - Rangée de l'antichambre (0)    : toujours DOUBLE_LOCKED (niveau 2)
-    - Entre les deux : mélange, avec plus de portes difficiles en remontant.
+
+def lock_probabilities(row, rows=None):
     """
+    Loi du niveau de verrou d'une porte sur la ligne `row` d'un manoir de
+    `rows` lignes (taille du catalogue par défaut) :
+    (p_unlocked, p_locked, p_double).
+    """
+    if rows is None:
+        rows = _CATALOG_SIZE[0]
+
     # Sécurité au cas où
     if row is None:
-        return LockState.UNLOCKED
+        return (1.0, 0.0, 0.0)
 
     # Rangée de départ : que des portes ouvertes
-    if row == MAP_ROWS - 1:
-        return LockState.UNLOCKED
+    if row == rows - 1:
+        return (1.0, 0.0, 0.0)
 
     # Rangée de l'antichambre : que des portes double-tour
     if row == 0:
-        return LockState.DOUBLE_LOCKED
+        return (0.0, 0.0, 1.0)
 
     # Progression verticale : 0 tout en bas, 1 tout en haut
-    progress = (MAP_ROWS - 1 - row) / (MAP_ROWS - 1)
-
-    # On définit des probabilités simples selon la progression
-    if progress < 0.33:
-        # proche de l'entrée : surtout des portes ouvertes
-        p_unlocked = 0.7
-        p_locked = 0.25
-        p_double = 0.05
-    elif progress < 0.66:
-        # milieu du manoir : mix équilibré
-        p_unlocked = 0.5
-        p_locked = 0.35
-        p_double = 0.15
-    else:
-        # proche de l'antichambre (mais pas tout en haut) : portes plus dures
-        p_unlocked = 0.3
-        p_locked = 0.4
-        p_double = 0.3
+    progress = (rows - 1 - row) / (rows - 1)
 
-    r = random.random()
+    # Loi de la tranche de progression (voir LOCK_BANDS)
+    for bound, probabilities in LOCK_BANDS:
+        if progress < bound:
+            return probabilities
+    return LOCK_BANDS[-1][1]
+
+
+def random_lock_state_for_row(row, rng=None, rows=None):
+    """
+    Choisit aléatoirement un niveau de verrouillage pour une porte
+    située sur la ligne `row` d'un manoir de `rows` lignes.
+
+    - Rangée de départ (rows - 1)    : toujours UNLOCKED (niveau 0)
+    - Rangée de l'antichambre (0)    : toujours DOUBLE_LOCKED (niveau 2)
+    - Entre les deux : mélange, avec plus de portes difficiles en remontant.
+
+    `rng` : générateur utilisé pour le tirage (par défaut, un flux du
+    service de hasard partagé pour cette ligne).
+    """
+    if rows is None:
+        rows = _CATALOG_SIZE[0]
+
+    # Lignes du départ et de l'antichambre : niveau imposé, sans tirage
+    if row is None or row == rows - 1:
+        return LockState.UNLOCKED
+    if row == 0:
+        return LockState.DOUBLE_LOCKED
+
+    p_unlocked, p_locked, _ = lock_probabilities(row, rows)
+
+    if rng is None:
+        rng = default_service().stream(ROOM_DRAW, row, None)
+    r = rng.random()
     if r < p_unlocked:
         return LockState.UNLOCKED
     elif r < p_unlocked + p_locked:
@@ -144,70 +173,150 @@ def random_lock_state_for_row(row):
         return LockState.DOUBLE_LOCKED
 
 
-def _make_room(defn, target_row=None):
+def _make_room(defn, target_row, rng, rows=None):
     """
     Crée une Room à partir de sa définition, en donnant à chacune
     de ses portes un niveau de verrouillage adapté à la ligne.
     """
     doors = [
-        Door(d, random_lock_state_for_row(target_row))
+        Door(d, random_lock_state_for_row(target_row, rng, rows))
         for d in defn["doors"]
     ]
     return Room(defn["name"], defn["color"], defn["cost"], defn["rarity"], doors)
 
 
+def rarity_weight(rarity):
+    """Poids de tirage d'une rareté : rareté 1 → prob divisée par 3, etc."""
+    return 1 / (3 ** rarity)
 
-def _weighted_choice(candidates):
-    """Choisit une définition de pièce en fonction de la rareté."""
-    weights = []
-    for d in candidates:
-        r = d["rarity"]
-        w = 1 / (3 ** r)   # rareté 1 → prob divisée par 3, etc.
-        weights.append(w)
 
-    idx = random.choices(range(len(candidates)), weights=weights, k=1)[0]
+def _weighted_choice(candidates, rng):
+    """Choisit une définition de pièce en fonction de la rareté."""
+    weights = [rarity_weight(d["rarity"]) for d in candidates]
+    idx = rng.choices(range(len(candidates)), weights=weights, k=1)[0]
     return candidates[idx]
 
 
-def pick_random_rooms(entry_dir, target_row=None, target_col=None):
+# ======================================================
+# Catalogue compilé : candidats précalculés par (ligne, colonne, face)
+# ======================================================
+class _WeightedTable:
+    """Liste de définitions avec poids cumulés, tirée par bisection."""
+
+    def __init__(self, defs):
+        self.defs = defs
+        self.cum_weights = []
+        total = 0.0
+        for d in defs:
+            total += rarity_weight(d["rarity"])
+            self.cum_weights.append(total)
+        self.total = total
+
+    def draw(self, rng):
+        i = bisect.bisect_right(self.cum_weights, rng.random() * self.total)
+        return self.defs[min(i, len(self.defs) - 1)]
+
+
+class CandidateTable:
     """
-    Tire 3 pièces compatibles avec la direction d'entrée.
+    Candidats d'une case pour une face d'entrée donnée.
 
-    entry_dir = direction choisie par le joueur (haut/bas/gauche/droite)
-    target_row / target_col = case où la pièce sera posée (pour éviter de
-    mettre des portes qui sortent du manoir).
+    On garde les pièces gratuites et payantes séparément, ainsi que la loi
+    exacte des 7 motifs "gratuite / payante" sur les 3 cartes, conditionnée
+    au fait qu'au moins une carte soit gratuite.
     """
-    entry_side = opposite(entry_dir)
 
+    def __init__(self, defs):
+        self.all = _WeightedTable(defs)
+        # toutes les portes qu'une pièce tirée ici peut avoir
+        self.door_directions = frozenset(d for defn in defs for d in defn["doors"])
+        self.free = _WeightedTable([d for d in defs if d["cost"] == 0])
+        self.paid = _WeightedTable([d for d in defs if d["cost"] != 0])
+
+        # motifs : bit i à 1 → la carte i est gratuite
+        self.patterns = []
+        self.pattern_cum = []
+        if self.free.defs and self.paid.defs:
+            p = self.free.total / self.all.total
+            total = 0.0
+            for mask in range(1, 8):
+                k = bin(mask).count("1")
+                total += p ** k * (1 - p) ** (3 - k)
+                self.patterns.append(mask)
+                self.pattern_cum.append(total)
+            self.pattern_total = total
+
+    def draw_defs(self, rng):
+        """Tire 3 définitions en temps constant."""
+        # Pas de pièce gratuite possible (ou que des gratuites) :
+        # le tirage libre est déjà la bonne loi.
+        if not self.pattern_cum:
+            return [self.all.draw(rng) for _ in range(3)]
+
+        u = rng.random() * self.pattern_total
+        i = bisect.bisect_right(self.pattern_cum, u)
+        mask = self.patterns[min(i, len(self.patterns) - 1)]
+        return [
+            self.free.draw(rng) if mask & (1 << slot) else self.paid.draw(rng)
+            for slot in range(3)
+        ]
+
+
+# ======================================================
+# Catalogue compilé
+#
+# Les candidats d'une case ne dépendent que de la face d'entrée et des
+# bords du manoir qu'elle touche : une table par (bords, face) suffit,
+# quelle que soit la taille du manoir.
+# ======================================================
+_CATALOG = {}
+# taille par défaut du manoir (lignes, colonnes)
+_CATALOG_SIZE = [MAP_ROWS, MAP_COLS]
+# augmente à chaque compilation (pour les caches dérivés, ex. rooms_batch)
+_CATALOG_VERSION = [0]
+
+# bits des bords touchés par une case
+EDGE_TOP = 1
+EDGE_BOTTOM = 2
+EDGE_LEFT = 4
+EDGE_RIGHT = 8
+EDGE_COMBINATIONS = 16
+
+# bord du manoir vers lequel donne chaque direction
+_EDGE_OF_DIRECTION = {
+    Direction.TOP: EDGE_TOP,
+    Direction.BOTTOM: EDGE_BOTTOM,
+    Direction.LEFT: EDGE_LEFT,
+    Direction.RIGHT: EDGE_RIGHT,
+}
+
+
+def cell_edges(row, col, rows=None, cols=None):
+    """Bords du manoir touchés par la case (None si la case est inconnue)."""
+    if row is None or col is None:
+        return None
+    if rows is None:
+        rows, cols = _CATALOG_SIZE
+    return (
+        (EDGE_TOP if row == 0 else 0)
+        | (EDGE_BOTTOM if row == rows - 1 else 0)
+        | (EDGE_LEFT if col == 0 else 0)
+        | (EDGE_RIGHT if col == cols - 1 else 0)
+    )
+
+
+def _fits_in_map(defn, edges):
+    """Vrai si aucune porte de la pièce ne donne hors du manoir."""
+    return not any(_EDGE_OF_DIRECTION[d] & edges for d in defn["doors"])
+
+
+def _candidates_for(entry_side, edges):
     # 1) Candidats dont les portes contiennent au moins la face d'entrée
     candidates = [d for d in ROOM_DEFS if entry_side in d["doors"]]
 
     # 2) Optionnel : filtrer les pièces dont une porte donnerait hors du manoir
-    if target_row is not None and target_col is not None:
-        filtered = []
-        for d in candidates:
-            ok = True
-            for door_dir in d["doors"]:
-                dr = dc = 0
-                if door_dir == Direction.TOP:
-                    dr = -1
-                elif door_dir == Direction.BOTTOM:
-                    dr = 1
-                elif door_dir == Direction.LEFT:
-                    dc = -1
-                elif door_dir == Direction.RIGHT:
-                    dc = 1
-
-                r2 = target_row + dr
-                c2 = target_col + dc
-
-                if not (0 <= r2 < MAP_ROWS and 0 <= c2 < MAP_COLS):
-                    # cette porte mènerait dehors → pièce illégale
-                    ok = False
-                    break
-            if ok:
-                filtered.append(d)
-
+    if edges is not None:
+        filtered = [d for d in candidates if _fits_in_map(d, edges)]
         if filtered:
             candidates = filtered
 
@@ -215,16 +324,66 @@ def pick_random_rooms(entry_dir, target_row=None, target_col=None):
     if not candidates:
         candidates = ROOM_DEFS
 
-    # 3) Tirage de 3 pièces, avec rareté
-        # 3) Tirage de 3 pièces, avec rareté
-    while True:
-        defs = [_weighted_choice(candidates) for _ in range(3)]
-        # On passe target_row pour choisir les niveaux de verrouillage
-        rooms = [_make_room(d, target_row) for d in defs]
+    return candidates
+
+
+def compile_catalog(rows=MAP_ROWS, cols=MAP_COLS):
+    """
+    (Re)construit la table des candidats pour toutes les combinaisons de
+    bords et faces d'entrée, et fixe la taille par défaut du manoir.
+    À rappeler après toute modification de ROOM_DEFS.
+    """
+    _CATALOG.clear()
+    _CATALOG_SIZE[:] = [rows, cols]
+    _CATALOG_VERSION[0] += 1
+
+    # types de salle partagés, enregistrés dans l'ordre du catalogue
+    # pour que leurs ids (codes de case) soient stables
+    for d in ROOM_DEFS:
+        room_type(d["name"], d["color"], d["cost"], d["rarity"])
+
+    for side in Direction:
+        for edges in [None] + list(range(EDGE_COMBINATIONS)):
+            _CATALOG[(edges, side)] = CandidateTable(_candidates_for(side, edges))
 
-        # 4) On s'assure qu'au moins une coûte 0, comme demandé dans l'énoncé
-        if any(r.cost == 0 for r in rooms):
-            return rooms
 
+def candidates_by_edges(entry_side, edges):
+    """Table des candidats pour une face d'entrée et des bords (None = inconnus)."""
+    return _CATALOG[(edges, entry_side)]
 
 
+def get_candidates(entry_side, target_row=None, target_col=None, rows=None, cols=None):
+    """
+    Table des candidats pour une face d'entrée et une case cible d'un
+    manoir rows x cols (taille par défaut si non précisée).
+    """
+    return _CATALOG[(cell_edges(target_row, target_col, rows, cols), entry_side)]
+
+
+compile_catalog()
+
+
+def pick_random_rooms(entry_dir, target_row=None, target_col=None, rng=None,
+                      rows=None, cols=None):
+    """
+    Tire 3 pièces compatibles avec la direction d'entrée.
+
+    entry_dir = direction choisie par le joueur (haut/bas/gauche/droite)
+    target_row / target_col = case où la pièce sera posée (pour éviter de
+    mettre des portes qui sortent du manoir).
+    rows / cols = taille du manoir (taille par défaut du catalogue sinon).
+    rng = générateur du tirage, normalement `RngService.stream(ROOM_DRAW,
+    ligne, colonne)` fourni par le moteur ; à défaut, le prochain flux du
+    service partagé pour cette case.
+
+    Au moins une des 3 pièces coûte 0 dès que la case le permet : on tire
+    directement selon la loi conditionnelle, sans boucle de rejet.
+    """
+    if rng is None:
+        rng = default_service().stream(ROOM_DRAW, target_row, target_col)
+    if rows is None:
+        rows, cols = _CATALOG_SIZE
+    table = get_candidates(opposite(entry_dir), target_row, target_col, rows, cols)
+    defs = table.draw_defs(rng)
+    # On passe target_row pour choisir les niveaux de verrouillage
+    return [_make_room(d, target_row, rng, rows) for d in defs]
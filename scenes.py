@@ -0,0 +1,270 @@
+import pygame
+
+from settings import BLACK, WHITE, WIDTH, HEIGHT, FPS, GAME_OVER_FPS, GAME_OVER_DELAY_MS
+from events import GameOver
+from utils.direction import Direction
+from utils.fonts import render_text
+from utils.input import WALK_STEP
+
+
+# ------------------------------------------------------
+# Scènes
+#
+# Chaque écran (carte, sélecteur de salle, fin de partie) est une scène
+# sans boucle propre : une seule boucle principale (Game.run) lit les
+# entrées avec une seule horloge et les passe à la scène du dessus.
+# Sans écran, on pilote la pile en appelant seulement `dispatch`.
+# ------------------------------------------------------
+class Scene:
+    """Écran du jeu : reçoit les entrées, avance, se dessine."""
+    # cadence voulue tant que la scène est au-dessus de la pile
+    fps = FPS
+
+    def __init__(self):
+        self.stack = None
+
+    def enter(self):
+        """Appelée quand la scène devient celle du dessus (empilée ou découverte)."""
+
+    def handle(self, event):
+        """Traite une entrée pygame."""
+
+    @property
+    def busy(self):
+        """
+        Vrai tant que la scène avance d'elle-même (bot, animation, calcul
+        en cours) : la boucle ne doit alors pas attendre une entrée.
+        """
+        return False
+
+    def update(self):
+        """Avance d'une image (bot, fin de partie…), une fois les entrées traitées."""
+
+    def draw(self, screen):
+        """Dessine la scène et renvoie les rectangles modifiés."""
+        return []
+
+    def close(self):
+        """Fermeture de la fenêtre pendant que la scène est empilée."""
+
+
+class SceneStack:
+    """Pile de scènes : seule celle du dessus reçoit entrées et dessin."""
+
+    def __init__(self):
+        self.scenes = []
+
+    def __len__(self):
+        return len(self.scenes)
+
+    @property
+    def top(self):
+        return self.scenes[-1] if self.scenes else None
+
+    @property
+    def fps(self):
+        top = self.top
+        return top.fps if top is not None else FPS
+
+    @property
+    def busy(self):
+        top = self.top
+        return top is not None and top.busy
+
+    # --------------------------------------------------
+    def push(self, scene):
+        scene.stack = self
+        self.scenes.append(scene)
+        scene.enter()
+        return scene
+
+    def pop(self):
+        scene = self.scenes.pop()
+        scene.stack = None
+        if self.scenes:
+            self.scenes[-1].enter()
+        return scene
+
+    def replace(self, scene):
+        """Remplace la scène du dessus."""
+        old = self.scenes.pop()
+        old.stack = None
+        return self.push(scene)
+
+    def clear(self):
+        while self.scenes:
+            self.scenes.pop().stack = None
+
+    # --------------------------------------------------
+    def dispatch(self, events):
+        """
+        Passe les entrées de l'image à la scène du dessus (qui peut changer
+        en cours de route), puis la fait avancer d'une image.
+        """
+        for event in events:
+            if not self.scenes:
+                return
+            if event.type == pygame.QUIT:
+                for scene in reversed(self.scenes):
+                    scene.close()
+                self.clear()
+                return
+            self.scenes[-1].handle(event)
+        if self.scenes:
+            self.scenes[-1].update()
+
+    def draw(self, screen):
+        top = self.top
+        return top.draw(screen) if top is not None else []
+
+
+# ------------------------------------------------------
+# Carte du manoir
+# ------------------------------------------------------
+_DIRECTION_KEYS = {
+    pygame.K_z: Direction.TOP,
+    pygame.K_s: Direction.BOTTOM,
+    pygame.K_q: Direction.LEFT,
+    pygame.K_d: Direction.RIGHT,
+}
+
+
+class MapScene(Scene):
+    """Déplacements sur la carte (ZQSD + ESPACE, ou clic sur une salle posée), bot avec B."""
+
+    def __init__(self, game):
+        super().__init__()
+        self.game = game
+
+    def enter(self):
+        # retour du sélecteur : il a dessiné sur tout l'écran
+        self.game.renderer.invalidate()
+
+    @property
+    def busy(self):
+        game = self.game
+        if game.engine.is_over():
+            return False
+        prefetcher = game.prefetcher
+        return (
+            game.bot is not None
+            or bool(game.walk)
+            or (prefetcher is not None and bool(prefetcher.pending))
+        )
+
+    def handle(self, event):
+        game = self.game
+        # Fenêtre ré-exposée : on renvoie toute l'image
+        if event.type == pygame.VIDEOEXPOSE:
+            game.renderer.invalidate()
+
+        # Pas suivant du déplacement automatique
+        if event.type == WALK_STEP:
+            game.walk_step()
+            return
+
+        # Clic sur une salle posée : on s'y rend tout seul
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            cell = game.renderer.camera.from_screen(*event.pos)
+            if cell is not None:
+                game.walk_to(*cell)
+            return
+
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key == pygame.K_ESCAPE:
+            self.stack.clear()
+            return
+        # une touche de jeu reprend la main sur le déplacement automatique
+        if event.key in _DIRECTION_KEYS or event.key in (pygame.K_SPACE, pygame.K_b):
+            game.stop_walk()
+
+        # Sélection de direction avec ZQSD
+        direction = _DIRECTION_KEYS.get(event.key)
+        if direction is not None:
+            game.select_direction(direction)
+
+        # Validation du déplacement
+        if event.key == pygame.K_SPACE:
+            game.try_move()
+
+        # Active / coupe le bot
+        if event.key == pygame.K_b:
+            game.toggle_bot()
+
+    def update(self):
+        game = self.game
+        # une entrée a ouvert le sélecteur : il passe avant le reste
+        if self.stack.top is not self:
+            return
+
+        # Le bot choisit la direction puis valide
+        if game.bot is not None and not game.engine.is_over():
+            action = game.bot.choose(game.engine)
+            game.select_direction(action[1])
+            game.try_move()
+
+        # Conditions de fin (évaluées et annoncées par le moteur)
+        if self.stack.top is self and game.engine.is_over():
+            self.stack.push(GameOverScene(game))
+            return
+
+        # Tirages des portes atteignables (voir pregen.py)
+        if self.stack.top is self and game.prefetcher is not None:
+            game.prefetcher.update()
+
+    def draw(self, screen):
+        # seules les zones modifiées sont envoyées à l'écran
+        game = self.game
+        return game.renderer.render(game.player, game.inventory, game.selected_direction)
+
+
+# ------------------------------------------------------
+# Fin de partie
+# ------------------------------------------------------
+class GameOverScene(Scene):
+    """
+    Affiche l'issue par-dessus la carte, puis ferme le jeu après une
+    touche ou GAME_OVER_DELAY_MS.
+    """
+    fps = GAME_OVER_FPS
+
+    def __init__(self, game):
+        super().__init__()
+        self.game = game
+        self.drawn = False
+        self.deadline = None
+
+    def enter(self):
+        self.deadline = pygame.time.get_ticks() + GAME_OVER_DELAY_MS
+
+    def handle(self, event):
+        if event.type == pygame.VIDEOEXPOSE:
+            self.game.renderer.invalidate()
+            self.drawn = False
+        if event.type == pygame.KEYDOWN:
+            self.stack.clear()
+
+    def update(self):
+        if pygame.time.get_ticks() >= self.deadline:
+            self.stack.clear()
+
+    def draw(self, screen):
+        if self.drawn:
+            return []
+        self.drawn = True
+
+        # la carte finale reste visible sous le bandeau
+        rects = self.game.renderer.render(
+            self.game.player, self.game.inventory, self.game.selected_direction
+        )
+        engine = self.game.engine
+        text = GameOver(engine.outcome, engine.steps_used).text()
+        label = render_text(text, WHITE, 32, bold=True)
+        hint = render_text("Appuie sur une touche pour quitter.", WHITE, 20)
+        band = pygame.Rect(0, HEIGHT // 2 - 60, WIDTH, 120)
+        screen.fill(BLACK, band)
+        screen.blit(label, (WIDTH // 2 - label.get_width() // 2, band.y + 25))
+        screen.blit(hint, (WIDTH // 2 - hint.get_width() // 2, band.y + 75))
+        rects.append(band)
+        return rects
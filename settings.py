@@ -1,3 +1,9 @@
+import os
+
+# Dossier du projet : les fichiers écrits par le jeu (caches, replays) y
+# sont rangés quel que soit le dossier de lancement
+PROJECT_PATH = os.path.dirname(os.path.abspath(__file__))
+
 # ===========================
 #        GAME SETTINGS
 # ===========================
@@ -10,7 +16,86 @@ MAP_COLS = 9
 
 TILE_SIZE = 96
 
+# Fenêtre de la carte (en cases) : au-delà, la caméra défile
+# en gardant le joueur à CAMERA_MARGIN cases du bord.
+VIEW_ROWS = 5
+VIEW_COLS = WIDTH // TILE_SIZE
+CAMERA_MARGIN = 2
+
 FPS = 60
+PICKER_FPS = 30
+GAME_OVER_FPS = 10
+# L'écran de fin reste affiché ce temps-là (ou jusqu'à une touche)
+GAME_OVER_DELAY_MS = 3000
+
+# Mode veille : la boucle attend les événements (avec un délai maximum)
+# au lieu de tourner en continu, et ne redessine que si quelque chose change.
+IDLE_MODE = True
+IDLE_TIMEOUT_MS = 500
+
+# Arrêter la partie dès que l'antichambre devient inatteignable
+# (voir Maison.goal_reachable), au lieu de la jouer jusqu'au bout.
+END_HOPELESS_RUNS = True
+# États développés au plus par cette vérification : au-delà elle ne
+# conclut pas et la partie continue. 5x9 en demande une trentaine ; la
+# borne tient la vérification sous ~10 ms sur un grand manoir (bench
+# "solver").
+HOPELESS_MAX_STATES = 200
+
+# Enregistrement des parties (voir replay.py, ou python main.py --record) :
+# un fichier par partie dans REPLAY_DIR, avec un instantané tous les
+# REPLAY_SNAPSHOT_INTERVAL coups.
+RECORD_REPLAYS = False
+REPLAY_DIR = os.path.join(PROJECT_PATH, "replays")
+REPLAY_SNAPSHOT_INTERVAL = 20
+
+# Profilage des images (profiler.py) : percentiles sur les
+# PROFILE_WINDOW dernières images, calque (F3) rafraîchi toutes les
+# PROFILE_OVERLAY_REFRESH_MS ; PROFILE_TRACE = chemin .csv ou .json pour
+# écrire la trace de chaque image (ou python main.py --trace fichier).
+PROFILE_WINDOW = 300
+PROFILE_OVERLAY_REFRESH_MS = 250
+PROFILE_TRACE = None
+
+# Banc d'essai (bench.py) : durée minimale et nombre de séries par
+# mesure, baisse de débit tolérée, hausse du pic mémoire tolérée (au-delà
+# de BENCH_MEMORY_SLACK octets), fichier de référence (propre à la machine)
+BENCH_MIN_TIME = 0.2
+BENCH_REPEAT = 5
+BENCH_THRESHOLD = 0.2
+BENCH_MEMORY_THRESHOLD = 0.5
+BENCH_MEMORY_SLACK = 4096
+BENCH_BASELINE = os.path.join(PROJECT_PATH, "bench_baseline.json")
+
+# Pré-calcul des tirages (pregen.py) : pendant que le joueur est sur la
+# carte, les 3 cartes de chaque porte atteignable sont tirées en tâche de
+# fond ; CARD_CACHE_SIZE cartes rendues sont gardées en cache (LRU).
+PREGEN_DRAWS = True
+CARD_CACHE_SIZE = 64
+
+# Déplacement automatique (clic sur une salle déjà posée, pathing.py) :
+# une clé dépensée compte comme AUTOWALK_KEY_COST pas dans le choix du
+# chemin ; un pas toutes les AUTOWALK_STEP_MS ; arbres des plus courts
+# chemins gardés pour les AUTOWALK_TREES dernières cases de départ.
+AUTOWALK_KEY_COST = 10
+AUTOWALK_STEP_MS = 90
+AUTOWALK_TREES = 16
+
+# Balayage de paramètres (sweep.py) : un résultat par configuration
+# jouée, gardé sous l'empreinte (configuration, moteur, graines)
+SWEEP_CACHE_DIR = os.path.join(PROJECT_PATH, ".sweep_cache")
+
+# Base de résultats des simulations (results.py, option --db) : parties
+# écrites par transactions d'au moins RESULTS_BATCH lignes, ou toutes les
+# RESULTS_FLUSH_S secondes s'il en arrive peu
+RESULTS_DB = os.path.join(PROJECT_PATH, "results.sqlite")
+RESULTS_BATCH = 5000
+RESULTS_FLUSH_S = 1.0
+
+# Messages de la partie (events.py) : journal à l'écran, et copie console
+# si LOG_TO_CONSOLE (ou python main.py --log)
+MESSAGE_LOG_LINES = 6
+LOG_TO_CONSOLE = False
 
 # ===========================
 #         COLORS
@@ -36,3 +121,15 @@ ROOM_COLORS = {
 }
 
 FONT_NAME = "arial"
+# Fichiers de police trouvés (ou non) au premier lancement (évite le
+# scan des polices du système aux démarrages suivants)
+FONT_CACHE = os.path.join(PROJECT_PATH, ".font_cache.json")
+# Polices créées dès le démarrage : (taille, gras)
+FONT_PRELOAD = ((16, False), (18, False), (20, False), (22, False),
+                (28, False), (32, True), (40, True))
+
+# Journal des temps de démarrage (une ligne JSON par lancement), ou None
+STARTUP_LOG = None
+
+# Nombre de surfaces de texte gardées en cache (LRU)
+TEXT_CACHE_SIZE = 256
@@ -0,0 +1,264 @@
+import sys
+import os
+import time
+import random
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+# ==== FIX DES IMPORTS ====
+CURRENT_FILE = os.path.abspath(__file__)
+PROJECT_PATH = os.path.dirname(CURRENT_FILE)
+PARENT_PATH = os.path.dirname(PROJECT_PATH)
+
+if PROJECT_PATH not in sys.path:
+    sys.path.append(PROJECT_PATH)
+if PARENT_PATH not in sys.path:
+    sys.path.append(PARENT_PATH)
+# ==========================
+
+from engine import (
+    Engine, OUTCOME_WIN, OUTCOME_NO_STEPS, OUTCOME_STUCK, OUTCOME_HOPELESS,
+)
+from policies import get_policy
+from settings import END_HOPELESS_RUNS, MAP_ROWS, MAP_COLS, RESULTS_DB
+
+# Nombre de lots par worker : assez pour équilibrer la charge,
+# assez peu pour que le coût d'envoi reste négligeable.
+SHARDS_PER_WORKER = 8
+
+
+# ------------------------------------------------------
+# Une partie complète sans affichage
+# ------------------------------------------------------
+def play_game(seed, policy, end_hopeless=END_HOPELESS_RUNS, size=None):
+    """Joue une partie avec la graine donnée et renvoie le moteur final."""
+    engine = Engine(seed, end_hopeless, size=size)
+    # graine distincte pour la politique, pour ne pas perturber le moteur
+    policy_rng = random.Random(seed ^ 0x5EED)
+    while not engine.is_over():
+        engine.step(policy(engine, policy_rng))
+    return engine
+
+
+def play_recorded(seed, policy, end_hopeless=END_HOPELESS_RUNS, size=None):
+    """
+    Comme play_game, et renvoie aussi la ligne de la partie pour la base
+    de résultats (voir results.py) : (graine, issue, pas, clés, gemmes et
+    pièces dépensées, ((salle, nombre de fois posée), …)).
+
+    Les trouvailles ne font que s'ajouter à l'inventaire : toute baisse de
+    clés ou de pièces pendant un coup est une dépense (porte, magasin).
+    """
+    engine = Engine(seed, end_hopeless, size=size)
+    policy_rng = random.Random(seed ^ 0x5EED)
+    inventory = engine.inventory
+    keys_spent = coins_spent = 0
+    while not engine.is_over():
+        keys, coins = inventory.keys, inventory.coins
+        engine.step(policy(engine, policy_rng))
+        if inventory.keys < keys:
+            keys_spent += keys - inventory.keys
+        if inventory.coins < coins:
+            coins_spent += coins - inventory.coins
+
+    # chaque salle posée a été payée en gemmes
+    maison = engine.maison
+    rooms = Counter(maison.room_at(r, c) for r, c in maison.placements)
+    placed = Counter()
+    gems_spent = 0
+    for room, n in rooms.items():
+        placed[room.name] += n
+        gems_spent += room.cost * n
+    record = (seed, engine.outcome, engine.steps_used, keys_spent, gems_spent,
+              coins_spent, tuple(sorted(placed.items())))
+    return engine, record
+
+
+def _run_shard(args):
+    """
+    Joue un lot de graines dans un worker et renvoie des compteurs partiels,
+    avec les lignes des parties si `record` (sinon une liste vide).
+    """
+    seeds, policy_name, end_hopeless, size, record = args
+    policy = get_policy(policy_name)
+    outcomes = Counter()
+    steps_used = Counter()
+    records = []
+
+    # le bus d'événements du moteur n'a aucun sink : rien n'est affiché
+    for seed in seeds:
+        if record:
+            engine, line = play_recorded(seed, policy, end_hopeless, size)
+            records.append(line)
+        else:
+            engine = play_game(seed, policy, end_hopeless, size)
+        outcomes[engine.outcome] += 1
+        steps_used[engine.steps_used] += 1
+
+    return outcomes, steps_used, records
+
+
+def _shard_seeds(seeds, n_shards):
+    """Découpe la liste des graines en lots contigus de tailles voisines."""
+    n_shards = max(1, min(n_shards, len(seeds)))
+    size, extra = divmod(len(seeds), n_shards)
+    shards = []
+    start = 0
+    for i in range(n_shards):
+        end = start + size + (1 if i < extra else 0)
+        shards.append(seeds[start:end])
+        start = end
+    return shards
+
+
+# ------------------------------------------------------
+# Simulation Monte Carlo
+# ------------------------------------------------------
+def simulate(n_games, policy="random", workers=None, first_seed=0,
+             end_hopeless=END_HOPELESS_RUNS, size=None, store=None):
+    """
+    Joue `n_games` parties (graines first_seed .. first_seed + n_games - 1)
+    réparties sur un pool de processus et renvoie les statistiques agrégées.
+
+    `policy` est un nom accepté par `policies.get_policy`.
+    `workers` = nombre de processus (tous les cœurs par défaut, 1 = sans pool).
+    `end_hopeless` = arrêter les parties dont l'antichambre est inatteignable.
+    `size` = (lignes, colonnes) du manoir (MAP_ROWS x MAP_COLS par défaut).
+    `store` = results.ResultsStore qui reçoit une ligne par partie.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    seeds = list(range(first_seed, first_seed + n_games))
+    shards = _shard_seeds(seeds, workers * SHARDS_PER_WORKER)
+    tasks = [(shard, policy, end_hopeless, size, store is not None) for shard in shards]
+
+    outcomes = Counter()
+    steps_used = Counter()
+    if store is not None:
+        from sweep import config_hash
+        # parties jouées avec les valeurs du jeu
+        baseline = config_hash({})
+        store.add_config(baseline, {})
+
+    def collect(shard_outcomes, shard_steps, records):
+        outcomes.update(shard_outcomes)
+        steps_used.update(shard_steps)
+        if store is not None:
+            # simple mise en file : l'écriture se fait dans le thread du store
+            store.add_games(baseline, policy, size or (MAP_ROWS, MAP_COLS), records)
+
+    start = time.perf_counter()
+    if workers == 1:
+        for result in map(_run_shard, tasks):
+            collect(*result)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for result in pool.map(_run_shard, tasks):
+                collect(*result)
+    elapsed = time.perf_counter() - start
+
+    stats = {
+        "games": n_games,
+        "policy": policy,
+        "size": size,
+        "workers": workers,
+    }
+    stats.update(summarize(outcomes, steps_used))
+    stats["elapsed"] = elapsed
+    stats["games_per_second"] = n_games / elapsed if elapsed > 0 else float("inf")
+    return stats
+
+
+def summarize(outcomes, steps_used):
+    """Taux de chaque issue et distribution des pas à partir des compteurs."""
+    total = max(1, sum(outcomes.values()))
+    return {
+        "win_rate": outcomes[OUTCOME_WIN] / total,
+        "stuck_rate": outcomes[OUTCOME_STUCK] / total,
+        "step_out_rate": outcomes[OUTCOME_NO_STEPS] / total,
+        "hopeless_rate": outcomes[OUTCOME_HOPELESS] / total,
+        "steps_used": dict(sorted(steps_used.items())),
+    }
+
+
+def _percentile(distribution, q):
+    """Percentile q (0..100) d'une distribution {valeur: effectif}."""
+    total = sum(distribution.values())
+    if total == 0:
+        return 0
+    threshold = q / 100 * total
+    seen = 0
+    for value, count in sorted(distribution.items()):
+        seen += count
+        if seen >= threshold:
+            return value
+    return value
+
+
+def print_report(stats):
+    steps = stats["steps_used"]
+    n = sum(steps.values()) or 1
+    mean = sum(v * c for v, c in steps.items()) / n
+
+    rows, cols = stats["size"] or (MAP_ROWS, MAP_COLS)
+    print(f"Parties        : {stats['games']} (politique {stats['policy']}, "
+          f"manoir {rows} x {cols}, {stats['workers']} worker(s))")
+    print(f"Victoires      : {stats['win_rate']:.2%}")
+    print(f"Bloqué         : {stats['stuck_rate']:.2%}")
+    print(f"Plus de pas    : {stats['step_out_rate']:.2%}")
+    print(f"Sans issue     : {stats['hopeless_rate']:.2%}")
+    print(f"Pas utilisés   : moyenne {mean:.1f} | "
+          f"p50 {_percentile(steps, 50)} | p90 {_percentile(steps, 90)} | "
+          f"max {max(steps) if steps else 0}")
+    print(f"Débit          : {stats['games_per_second']:.0f} parties/s "
+          f"({stats['elapsed']:.2f} s)")
+
+
+# ------------------------------------------------------
+# Ligne de commande : python main.py simulate -n 10000
+# ------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="simulate",
+        description="Simulation Monte Carlo de parties sans affichage.",
+    )
+    parser.add_argument("-n", "--games", type=int, default=1000,
+                        help="nombre de parties à jouer")
+    parser.add_argument("-p", "--policy", default="random",
+                        help="politique : random, greedy ou module:fonction")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="nombre de processus (défaut : tous les cœurs)")
+    parser.add_argument("-s", "--seed", type=int, default=0,
+                        help="première graine")
+    parser.add_argument("--prune", dest="prune", action="store_true",
+                        default=END_HOPELESS_RUNS,
+                        help="arrêter les parties sans issue (solver)")
+    parser.add_argument("--no-prune", dest="prune", action="store_false",
+                        help="jouer toutes les parties jusqu'au bout")
+    parser.add_argument("--rows", type=int, default=MAP_ROWS,
+                        help="nombre de lignes du manoir")
+    parser.add_argument("--cols", type=int, default=MAP_COLS,
+                        help="nombre de colonnes du manoir")
+    parser.add_argument("--db", nargs="?", const=RESULTS_DB, default=None,
+                        help=f"enregistrer chaque partie dans une base SQLite "
+                             f"(défaut : {RESULTS_DB})")
+    args = parser.parse_args(argv)
+
+    store = None
+    if args.db:
+        from results import ResultsStore
+        store = ResultsStore(args.db)
+    stats = simulate(args.games, args.policy, args.workers, args.seed, args.prune,
+                     (args.rows, args.cols), store)
+    print_report(stats)
+    if store is not None:
+        store.close()
+        print(f"Base           : {store.written} parties écrites dans {args.db} "
+              f"({store.transactions} transaction(s))")
+    return stats
+
+
+if __name__ == "__main__":
+    main()
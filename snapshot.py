@@ -0,0 +1,293 @@
+import sys
+import os
+import struct
+import hashlib
+
+# ==== FIX DES IMPORTS ====
+CURRENT_FILE = os.path.abspath(__file__)
+PROJECT_PATH = os.path.dirname(CURRENT_FILE)
+PARENT_PATH = os.path.dirname(PROJECT_PATH)
+
+if PROJECT_PATH not in sys.path:
+    sys.path.append(PROJECT_PATH)
+if PARENT_PATH not in sys.path:
+    sys.path.append(PARENT_PATH)
+# ==========================
+
+from models import Room, Inventory, ROOM_TYPES, room_type
+from chunks import ChunkedCells
+from utils.direction import Direction
+from utils.door_bits import cell_code, cell_type, cell_doors
+
+INVENTORY_FIELDS = Inventory.__slots__
+_PHASES = ("MAP", "PICK", "OVER")
+_OUTCOMES = (None, "WIN", "NO_STEPS", "STUCK", "HOPELESS")
+_MASK64 = (1 << 64) - 1
+
+
+# ------------------------------------------------------
+# Instantané d'une partie
+# ------------------------------------------------------
+class GameState:
+    """
+    Copie figée et compacte d'une partie : grille (codes de case), joueur,
+    inventaire, tirage en cours et état du générateur aléatoire.
+
+    Égalité et hash portent sur la *position* (tout sauf le générateur et
+    les statistiques) : deux instantanés égaux ont les mêmes actions et les
+    mêmes issues possibles, ce qu'attend une table de transposition.
+    Le hash est calculé avec blake2b, donc identique d'un processus à l'autre.
+    """
+    __slots__ = (
+        "cells", "player", "inventory", "phase", "outcome",
+        "pending_cell", "pending_dir", "pending_rooms",
+        "rng_state", "seed", "steps_used", "frontier", "_hash",
+    )
+
+    def __init__(self, cells, player, inventory, phase, outcome,
+                 pending_cell, pending_dir, pending_rooms,
+                 rng_state, seed=None, steps_used=0, frontier=None):
+        self.cells = cells                  # bytes (ChunkedCells.tobytes)
+        self.player = player                # (row, col)
+        self.inventory = inventory          # tuple dans l'ordre INVENTORY_FIELDS
+        self.phase = phase
+        self.outcome = outcome
+        self.pending_cell = pending_cell
+        self.pending_dir = pending_dir      # Direction.value ou None
+        self.pending_rooms = pending_rooms  # tuple de codes de case
+        self.rng_state = rng_state
+        self.seed = seed
+        self.steps_used = steps_used
+        self.frontier = frontier            # index des portes, pour restaurer vite
+        self._hash = None
+
+    # --------------------------------------------------
+    @classmethod
+    def capture(cls, engine):
+        """Instantané d'un Engine."""
+        maison = engine.maison
+        inventory = engine.inventory
+        return cls(
+            maison.cells.tobytes(),
+            (engine.player.row, engine.player.col),
+            tuple(getattr(inventory, f) for f in INVENTORY_FIELDS),
+            engine.phase,
+            engine.outcome,
+            engine.pending_cell,
+            None if engine.pending_dir is None else engine.pending_dir.value,
+            tuple(room.code for room in engine.pending_rooms),
+            maison.rng.getstate(),
+            engine.seed,
+            engine.steps_used,
+            tuple(maison.frontier.items()),
+        )
+
+    def restore(self, engine):
+        """Remet un Engine (et ses objets) dans l'état de l'instantané."""
+        self.restore_into(engine.maison, engine.inventory, engine.player)
+        engine.size = (engine.maison.rows, engine.maison.cols)
+        engine.seed = self.seed
+        engine.phase = self.phase
+        engine.outcome = self.outcome
+        engine.steps_used = self.steps_used
+        engine.pending_cell = self.pending_cell
+        engine.pending_dir = (
+            None if self.pending_dir is None else Direction(self.pending_dir)
+        )
+        engine.pending_rooms = [Room.from_code(code) for code in self.pending_rooms]
+        return engine
+
+    def restore_into(self, maison, inventory, player):
+        """Restaure la grille, l'inventaire, le joueur et le générateur."""
+        maison.load_cells(ChunkedCells.frombytes(self.cells), self.frontier)
+        maison.rng.setstate(self.rng_state)
+
+        for field, value in zip(INVENTORY_FIELDS, self.inventory):
+            setattr(inventory, field, value)
+        player.row, player.col = self.player
+
+    # --------------------------------------------------
+    def key(self):
+        """Position de jeu (sans générateur ni statistiques)."""
+        return (
+            self.cells, self.player, self.inventory, self.phase,
+            self.pending_cell, self.pending_dir, self.pending_rooms,
+        )
+
+    def digest(self):
+        """Empreinte 64 bits stable de la position."""
+        if self._hash is None:
+            h = hashlib.blake2b(digest_size=8)
+            h.update(self.cells)
+            h.update(struct.pack("<2i", *self.player))
+            h.update(struct.pack(f"<{len(self.inventory)}i", *self.inventory))
+            h.update(struct.pack("<B", _PHASES.index(self.phase)))
+            if self.pending_cell is not None:
+                h.update(struct.pack("<3i", *self.pending_cell, self.pending_dir))
+                h.update(struct.pack(f"<{len(self.pending_rooms)}I", *self.pending_rooms))
+            self._hash = int.from_bytes(h.digest(), "little", signed=True)
+        return self._hash
+
+    def __hash__(self):
+        return self.digest()
+
+    def __eq__(self, other):
+        if not isinstance(other, GameState):
+            return NotImplemented
+        return self.digest() == other.digest() and self.key() == other.key()
+
+    # --------------------------------------------------
+    # Sérialisation binaire (fichiers de replay)
+    # --------------------------------------------------
+    def to_bytes(self):
+        """
+        Encodage binaire compact, petit-boutiste, indépendant de la version
+        de Python. Les graines sont ramenées sur 64 bits, ce qui ne change
+        aucun tirage (le générateur ne lit que ces 64 bits).
+
+        Les ids de types de salle (models.room_type) dépendent de l'ordre
+        de création dans le processus : le fichier porte une table des
+        types utilisés (nom, couleur, coût, rareté) et les codes de case y
+        renvoient par leur rang, retraduit en ids locaux à la lecture.
+        """
+        cells = ChunkedCells.frombytes(self.cells)
+        type_ids = {cell_type(code) for _, _, code in cells.items()}
+        type_ids.update(cell_type(code) for code in self.pending_rooms)
+        type_ids = sorted(type_ids)
+        ranks = {type_id: rank for rank, type_id in enumerate(type_ids, 1)}
+
+        def to_rank(code):
+            return cell_code(ranks[cell_type(code)], cell_doors(code))
+
+        out = bytearray()
+        out += struct.pack("<H", len(type_ids))
+        for type_id in type_ids:
+            kind = ROOM_TYPES[type_id]
+            out += _pack_text(kind.name) + _pack_text(kind.color)
+            out += struct.pack("<2i", kind.cost, kind.rarity)
+
+        cells.map_codes(to_rank)
+        cells = cells.tobytes()
+        out += struct.pack("<I", len(cells))
+        out += cells
+        out += struct.pack("<2i", *self.player)
+
+        # types de l'inventaire : "?" pour les objets permanents, "i" sinon
+        fmt = "".join("?" if isinstance(v, bool) else "i" for v in self.inventory)
+        out += struct.pack("<B", len(fmt)) + fmt.encode("ascii")
+        out += struct.pack("<" + fmt, *self.inventory)
+
+        out += struct.pack("<2B", _PHASES.index(self.phase), _OUTCOMES.index(self.outcome))
+        if self.pending_cell is None:
+            out += struct.pack("<B", 0)
+        else:
+            out += struct.pack("<B3iB", 1, *self.pending_cell, self.pending_dir,
+                               len(self.pending_rooms))
+            out += struct.pack(f"<{len(self.pending_rooms)}I",
+                               *map(to_rank, self.pending_rooms))
+
+        rng_seed, counters = self.rng_state
+        out += struct.pack("<QI", rng_seed & _MASK64, len(counters))
+        for (kind, row, col), count in counters:
+            out += struct.pack("<B2iI", kind, _opt(row), _opt(col), count)
+
+        out += struct.pack("<?QI", self.seed is not None, (self.seed or 0) & _MASK64,
+                           self.steps_used)
+
+        if self.frontier is None:
+            out += struct.pack("<i", -1)
+        else:
+            out += struct.pack("<i", len(self.frontier))
+            for (r, c, direction), level in self.frontier:
+                out += struct.pack("<2iBB", r, c, direction.value, level)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Inverse de `to_bytes`."""
+        reader = _Reader(data)
+        type_ids = [None]
+        for _ in range(reader.read("<H")[0]):
+            name, color = reader.text(), reader.text()
+            cost, rarity = reader.read("<2i")
+            type_ids.append(room_type(name, color, cost, rarity).id)
+
+        def from_rank(code):
+            return cell_code(type_ids[cell_type(code)], cell_doors(code))
+
+        cells = ChunkedCells.frombytes(reader.raw(reader.read("<I")[0]))
+        cells.map_codes(from_rank)
+        cells = cells.tobytes()
+        player = reader.read("<2i")
+
+        fmt = reader.raw(reader.read("<B")[0]).decode("ascii")
+        inventory = reader.read("<" + fmt)
+
+        phase, outcome = reader.read("<2B")
+        pending_cell = pending_dir = None
+        pending_rooms = ()
+        if reader.read("<B")[0]:
+            r, c, pending_dir, n = reader.read("<3iB")
+            pending_cell = (r, c)
+            pending_rooms = tuple(map(from_rank, reader.read(f"<{n}I")))
+
+        rng_seed, n = reader.read("<QI")
+        counters = []
+        for _ in range(n):
+            kind, row, col, count = reader.read("<B2iI")
+            counters.append(((kind, _unopt(row), _unopt(col)), count))
+
+        has_seed, seed, steps_used = reader.read("<?QI")
+
+        frontier = None
+        n = reader.read("<i")[0]
+        if n >= 0:
+            frontier = []
+            for _ in range(n):
+                r, c, d, level = reader.read("<2iBB")
+                frontier.append(((r, c, Direction(d)), level))
+            frontier = tuple(frontier)
+
+        return cls(
+            cells, player, inventory, _PHASES[phase], _OUTCOMES[outcome],
+            pending_cell, pending_dir, pending_rooms,
+            (rng_seed, tuple(counters)), seed if has_seed else None,
+            steps_used, frontier,
+        )
+
+
+def _opt(value):
+    return -1 if value is None else value
+
+
+def _unopt(value):
+    return None if value == -1 else value
+
+
+def _pack_text(text):
+    data = text.encode("utf-8")
+    return struct.pack("<B", len(data)) + data
+
+
+class _Reader:
+    """Lecture séquentielle d'un tampon avec struct."""
+    __slots__ = ("data", "pos")
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+
+    def read(self, fmt):
+        values = struct.unpack_from(fmt, self.data, self.pos)
+        self.pos += struct.calcsize(fmt)
+        return values
+
+    def text(self):
+        return self.raw(self.read("<B")[0]).decode("utf-8")
+
+    def raw(self, n):
+        chunk = bytes(self.data[self.pos:self.pos + n])
+        if len(chunk) != n:
+            raise ValueError("instantané tronqué")
+        self.pos += n
+        return chunk
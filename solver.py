@@ -0,0 +1,207 @@
+import sys
+import os
+import heapq
+
+# ==== FIX DES IMPORTS ====
+CURRENT_FILE = os.path.abspath(__file__)
+PROJECT_PATH = os.path.dirname(CURRENT_FILE)
+PARENT_PATH = os.path.dirname(PROJECT_PATH)
+
+if PROJECT_PATH not in sys.path:
+    sys.path.append(PROJECT_PATH)
+if PARENT_PATH not in sys.path:
+    sys.path.append(PARENT_PATH)
+# ==========================
+
+from rooms_catalog import candidates_by_edges, cell_edges
+from utils.direction import DIRECTIONS, DIRECTION_STEPS
+from utils.door_bits import known_doors, door_keys
+from models import SHOP_PRICES
+from loot import FOODS, COIN_AMOUNTS
+from settings import HOPELESS_MAX_STATES
+
+# Clés maximum suivies dans la recherche optimiste : au-delà,
+# toutes les portes sont de toute façon ouvrables.
+KEY_CAP = 8
+
+
+class Solution:
+    """Résultat d'une recherche : chemin et coût pour atteindre l'antichambre."""
+    __slots__ = ("reachable", "steps", "keys", "path")
+
+    def __init__(self, reachable, steps=None, keys=None, path=None):
+        self.reachable = reachable  # None : recherche arrêtée sans conclure
+        self.steps = steps          # pas (minimum sans exploration)
+        self.keys = keys            # clés dépensées sur ce chemin
+        self.path = path or []      # directions à suivre
+
+    def __repr__(self):
+        if self.reachable is None:
+            return "Solution(undecided)"
+        if not self.reachable:
+            return "Solution(unreachable)"
+        return f"Solution(steps={self.steps}, keys={self.keys})"
+
+
+def _unexplored_doors(r, c, entry_side, rows, cols):
+    """
+    Portes possibles d'une salle encore à tirer en (r, c), entrée par la
+    face `entry_side` (valeur) : union des portes des candidats du
+    catalogue, avec le verrou le plus faible possible pour cette ligne.
+    """
+    table = candidates_by_edges(DIRECTIONS[entry_side], cell_edges(r, c, rows, cols))
+    key = (table, r == 0)
+    doors = _UNEXPLORED_DOORS.get(key)
+    if doors is None:
+        level = 2 if r == 0 else 0
+        doors = [(d.value, level) for d in table.door_directions]
+        _UNEXPLORED_DOORS[key] = doors
+    return doors
+
+
+# (table des candidats, ligne de l'antichambre) -> portes
+_UNEXPLORED_DOORS = {}
+
+
+def room_step_gain():
+    """
+    Majorant des pas qu'une salle peut rapporter à son entrée : le plus
+    gros repas, ou le plus gros tas de pièces converti au magasin.
+    """
+    pack, per_pack = SHOP_PRICES["steps_pack"], SHOP_PRICES["steps_per_pack"]
+    coins = -(-max(COIN_AMOUNTS) * per_pack // pack)
+    return max(max(steps for _, steps, _ in FOODS), coins)
+
+
+def step_budget(inventory):
+    """Pas disponibles au mieux : ceux de l'inventaire, plus les pièces converties."""
+    pack, per_pack = SHOP_PRICES["steps_pack"], SHOP_PRICES["steps_per_pack"]
+    return inventory.steps + -(-inventory.coins * per_pack // pack)
+
+
+# ------------------------------------------------------
+# Recherche
+# ------------------------------------------------------
+def solve(maison, inventory, player, explore=False, max_states=None):
+    """
+    L'antichambre est-elle encore atteignable, et à quel coût ?
+
+    Recherche A* (distance de Manhattan) sur les états (case, clés
+    restantes, kit de crochetage), qui respecte la consommation de
+    Door.open. Chaque état garde le plus de pas restants possible et
+    n'est développé à nouveau que s'il en gagne.
+
+    - explore=False : uniquement par les salles déjà posées (exact, coût
+      minimal), dans la limite des pas restants.
+    - explore=True : relaxation optimiste qui passe aussi par les cases
+      inexplorées (salle la plus favorable du catalogue, une clé et
+      `room_step_gain()` pas trouvés à chaque entrée, pièces converties en
+      pas). Si même ainsi l'antichambre est inatteignable, la partie est
+      perdue.
+
+    `max_states` borne le nombre d'états développés : au-delà, la
+    recherche s'arrête sans conclure (Solution.reachable vaut None).
+    """
+    goal_r, goal_c = maison.goal
+    rows, cols = maison.rows, maison.cols
+    code_at = maison.cells.get
+    lockpick = inventory.has_lockpick
+    if explore:
+        keys0 = min(inventory.keys, KEY_CAP)
+        budget = step_budget(inventory)
+        gain = room_step_gain()
+        # au-delà, des pas en plus ne servent plus : un chemin simple ne
+        # traverse pas plus de salles posées qu'il n'y en a
+        cap = max(budget, len(maison.cells))
+    else:
+        keys0 = inventory.keys
+        budget = cap = inventory.steps
+        gain = 0
+
+    # état : (r, c, clés, face d'entrée si la case est inexplorée) — le
+    # kit de crochetage ne change pas pendant la recherche
+    start = (player.row, player.col, keys0, -1)
+    # file : (pas + estimation, clés dépensées, -pas, compteur, pas,
+    # pas restants, état, chemin) ; à égalité, le plus avancé d'abord :
+    # sur un grand manoir, A* ne balaie pas tous les chemins de même
+    # longueur. Le chemin est une liste chaînée (précédent, direction) :
+    # un état amélioré plus tard ne réécrit pas les chemins déjà en file.
+    queue = [(abs(player.row - goal_r) + abs(player.col - goal_c), 0, 0, 0, 0, budget, start, None)]
+    best = {start: budget}
+    counter = 0
+    expanded = 0
+
+    while queue:
+        _, spent, _, _, steps, left, state, path = heapq.heappop(queue)
+        if best[state] > left:
+            continue
+        r, c, keys, side = state
+
+        if r == goal_r and c == goal_c:
+            return Solution(True, steps, spent, _rebuild_path(path))
+
+        expanded += 1
+        if max_states is not None and expanded > max_states:
+            return Solution(None)
+
+        code = code_at(r, c)
+        doors = known_doors(code) if code else _unexplored_doors(r, c, side, rows, cols)
+
+        for direction, level in doors:
+            dr, dc, back = DIRECTION_STEPS[direction]
+            r2, c2 = r + dr, c + dc
+            if not (0 <= r2 < rows and 0 <= c2 < cols):
+                continue
+            target_known = code_at(r2, c2) != 0
+            if not target_known and not explore:
+                continue
+
+            # coût d'ouverture (mêmes règles que Door.open)
+            cost = door_keys(level, lockpick)
+            if cost > keys:
+                continue
+
+            # un pas de plus, sans tomber à court
+            left2 = left - 1
+            if left2 < 0:
+                continue
+            keys2 = keys - cost
+            if target_known:
+                side2 = -1
+            else:
+                # trouvailles optimistes dans la nouvelle salle
+                keys2 = min(keys2 + 1, KEY_CAP)
+                left2 = min(left2 + gain, cap)
+                side2 = back
+
+            nxt = (r2, c2, keys2, side2)
+            if left2 > best.get(nxt, -1):
+                best[nxt] = left2
+                counter += 1
+                steps2 = steps + 1
+                estimate = abs(r2 - goal_r) + abs(c2 - goal_c)
+                heapq.heappush(
+                    queue,
+                    (steps2 + estimate, spent + cost, -steps2, counter, steps2, left2, nxt,
+                     (path, direction)),
+                )
+
+    return Solution(False)
+
+
+def _rebuild_path(link):
+    path = []
+    while link is not None:
+        link, direction = link
+        path.append(DIRECTIONS[direction])
+    path.reverse()
+    return path
+
+
+def goal_reachable(maison, inventory, player, max_states=HOPELESS_MAX_STATES):
+    """
+    Vrai si l'antichambre reste atteignable, même en explorant. Une
+    recherche arrêtée par `max_states` ne conclut pas : elle compte comme
+    atteignable, pour ne jamais arrêter une partie à tort.
+    """
+    return solve(maison, inventory, player, explore=True, max_states=max_states).reachable is not False
@@ -0,0 +1,513 @@
+import sys
+import os
+import json
+import time
+import random
+import hashlib
+import argparse
+import itertools
+import importlib.util
+from collections import Counter
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# ==== FIX DES IMPORTS ====
+CURRENT_FILE = os.path.abspath(__file__)
+PROJECT_PATH = os.path.dirname(CURRENT_FILE)
+PARENT_PATH = os.path.dirname(PROJECT_PATH)
+
+if PROJECT_PATH not in sys.path:
+    sys.path.append(PROJECT_PATH)
+if PARENT_PATH not in sys.path:
+    sys.path.append(PARENT_PATH)
+# ==========================
+
+import rooms_catalog
+from models import STARTING_INVENTORY, SHOP_PRICES
+from rooms_catalog import ROOM_DEFS, LOCK_BANDS, compile_catalog
+from simulate import _run_shard, _shard_seeds, summarize, SHARDS_PER_WORKER
+from policies import POLICIES
+from settings import END_HOPELESS_RUNS, MAP_ROWS, MAP_COLS, SWEEP_CACHE_DIR, RESULTS_DB
+
+# ------------------------------------------------------
+# Balayage de paramètres (équilibrage)
+#
+# Une configuration est un dict {paramètre: valeur} appliqué par-dessus
+# les valeurs du jeu :
+# - inventory.<champ>        : STARTING_INVENTORY (steps, keys, gems…)
+# - room.<Nom>.cost / rarity : définitions de ROOM_DEFS
+# - locks.<i>                : loi (p_unlocked, p_locked, p_double) de la
+#                              tranche i de LOCK_BANDS (normalisée)
+# - locks.<i>.until          : borne haute de la tranche i
+# - shop.<prix>              : SHOP_PRICES (key, steps_pack, steps_per_pack)
+#
+# Chaque configuration est jouée sans affichage sur les mêmes graines, les
+# lots de parties de toutes les configurations partageant un même pool de
+# processus. Les résultats sont gardés sur disque sous l'empreinte de
+# (configuration, version du moteur, graines, politique, taille) : relancer
+# un balayage ne calcule que les configurations nouvelles ou dont les
+# règles ont changé.
+# ------------------------------------------------------
+
+# Fichiers dont dépend l'issue d'une partie : leur contenu fait la
+# « version du moteur » des clés du cache. Une politique externe
+# ("module:fonction", dont "mcts" -> bot.py) y ajoute son propre module,
+# voir policy_version.
+RULE_MODULES = (
+    "engine.py", "maison.py", "models.py", "rooms_catalog.py", "loot.py",
+    "solver.py", "chunks.py", "snapshot.py", "policies.py", "simulate.py",
+    "settings.py", "utils/rng.py", "utils/door_bits.py", "utils/direction.py",
+    "utils/lock_state.py",
+)
+
+_ROOMS = {d["name"]: d for d in ROOM_DEFS}
+
+
+# ------------------------------------------------------
+# Application d'une configuration
+# ------------------------------------------------------
+def _probabilities(value):
+    if len(value) != 3 or min(value) < 0 or sum(value) <= 0:
+        raise ValueError(f"loi de verrous invalide : {value}")
+    total = sum(value)
+    return tuple(p / total for p in value)
+
+
+def _set_parameter(name, value):
+    parts = name.split(".")
+    kind = parts[0]
+
+    if kind == "inventory" and len(parts) == 2 and parts[1] in STARTING_INVENTORY:
+        STARTING_INVENTORY[parts[1]] = int(value)
+        return
+
+    if kind == "shop" and len(parts) == 2 and parts[1] in SHOP_PRICES:
+        if int(value) < 1:
+            raise ValueError(f"prix invalide pour {name} : {value}")
+        SHOP_PRICES[parts[1]] = int(value)
+        return
+
+    if kind == "room" and len(parts) == 3 and parts[1] in _ROOMS:
+        if parts[2] in ("cost", "rarity"):
+            _ROOMS[parts[1]][parts[2]] = int(value)
+            return
+
+    if kind == "locks" and len(parts) in (2, 3) and parts[1].isdigit():
+        i = int(parts[1])
+        if i < len(LOCK_BANDS):
+            bound, probabilities = LOCK_BANDS[i]
+            if len(parts) == 2:
+                LOCK_BANDS[i] = (bound, _probabilities(value))
+                return
+            if parts[2] == "until":
+                LOCK_BANDS[i] = (float(value), probabilities)
+                return
+
+    raise ValueError(f"Paramètre inconnu : {name}")
+
+
+@contextmanager
+def configured(config):
+    """Applique `config` le temps du bloc, puis remet les valeurs du jeu."""
+    if not config:
+        yield
+        return
+    saved_inventory = dict(STARTING_INVENTORY)
+    saved_prices = dict(SHOP_PRICES)
+    saved_bands = list(LOCK_BANDS)
+    saved_defs = [dict(d) for d in ROOM_DEFS]
+    size = tuple(rooms_catalog._CATALOG_SIZE)
+    try:
+        for name, value in sorted(config.items()):
+            _set_parameter(name, value)
+        # les tables de candidats dépendent des coûts et raretés
+        compile_catalog(*size)
+        yield
+    finally:
+        STARTING_INVENTORY.update(saved_inventory)
+        SHOP_PRICES.update(saved_prices)
+        LOCK_BANDS[:] = saved_bands
+        for defn, saved in zip(ROOM_DEFS, saved_defs):
+            defn.update(saved)
+        compile_catalog(*size)
+
+
+# ------------------------------------------------------
+# Empreintes et cache sur disque
+# ------------------------------------------------------
+def _digest(data):
+    text = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def config_hash(config):
+    """Empreinte courte d'une configuration (l'ordre des paramètres ne compte pas)."""
+    return _digest(config)[:16]
+
+
+_ENGINE_VERSION = []
+
+
+def engine_version():
+    """Empreinte du code des règles (RULE_MODULES), calculée une fois."""
+    if not _ENGINE_VERSION:
+        h = hashlib.sha256()
+        for name in RULE_MODULES:
+            with open(os.path.join(PROJECT_PATH, name), "rb") as f:
+                h.update(name.encode("utf-8"))
+                h.update(f.read())
+        _ENGINE_VERSION.append(h.hexdigest()[:16])
+    return _ENGINE_VERSION[0]
+
+
+def _file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def policy_version(policy):
+    """
+    Empreinte du code d'une politique : "" pour celles de policies.py (déjà
+    dans RULE_MODULES), celle du fichier du module pour "module:fonction",
+    None si ce fichier est introuvable (résultats alors jamais mis en
+    cache). Seul ce module compte, pas ceux qu'il importe hors des règles.
+    """
+    name = POLICIES.get(policy, policy)
+    if callable(name):
+        return ""
+    if ":" not in name:
+        return None
+    try:
+        spec = importlib.util.find_spec(name.split(":", 1)[0])
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.origin or not os.path.isfile(spec.origin):
+        return None
+    return _file_digest(spec.origin)
+
+
+def cache_key(config, first_seed, n_games, policy, end_hopeless, size):
+    return _digest({
+        "config": config,
+        "engine": engine_version(),
+        "seeds": [first_seed, n_games],
+        "policy": policy,
+        "policy_code": policy_version(policy),
+        "end_hopeless": end_hopeless,
+        "size": list(size),
+    })
+
+
+class ResultCache:
+    """Un fichier JSON par résultat, nommé par sa clé."""
+
+    def __init__(self, directory=SWEEP_CACHE_DIR):
+        self.directory = directory
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, key):
+        try:
+            with open(self.path(key), encoding="utf-8") as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # JSON n'a que des clés texte
+        result["steps_used"] = {int(k): v for k, v in result["steps_used"].items()}
+        return result
+
+    def put(self, key, result):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # écriture atomique : jamais de fichier à moitié écrit dans le cache
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(result, f, sort_keys=True)
+        os.replace(tmp, path)
+
+
+# ------------------------------------------------------
+# Espaces de recherche
+# ------------------------------------------------------
+def _choices(spec):
+    """Valeurs d'un paramètre pour la grille : liste, ou {"min", "max"[, "step"]} entiers."""
+    if isinstance(spec, dict):
+        return list(range(spec["min"], spec["max"] + 1, spec.get("step", 1)))
+    return list(spec)
+
+
+def grid(space):
+    """Toutes les combinaisons de `space` = {paramètre: valeurs}."""
+    names = sorted(space)
+    for values in itertools.product(*(_choices(space[name]) for name in names)):
+        yield dict(zip(names, values))
+
+
+def _sample(spec, rng):
+    if isinstance(spec, dict):
+        low, high = spec["min"], spec["max"]
+        if isinstance(low, int) and isinstance(high, int):
+            return rng.randint(low, high)
+        return round(rng.uniform(low, high), 4)
+    return rng.choice(spec)
+
+
+def random_search(space, samples, seed=0):
+    """`samples` configurations tirées au hasard dans `space` ({"min", "max"} = uniforme)."""
+    rng = random.Random(seed)
+    names = sorted(space)
+    for _ in range(samples):
+        yield {name: _sample(space[name], rng) for name in names}
+
+
+# ------------------------------------------------------
+# Balayage
+# ------------------------------------------------------
+def _run_config_shard(args):
+    """Joue un lot de graines sous une configuration (dans un worker)."""
+    key, config, seeds, policy, end_hopeless, size, record = args
+    start = time.perf_counter()
+    with configured(config):
+        outcomes, steps_used, records = _run_shard((seeds, policy, end_hopeless, size, record))
+    return key, outcomes, steps_used, records, time.perf_counter() - start
+
+
+def sweep(configs, n_games, policy="random", workers=None, first_seed=0,
+          end_hopeless=END_HOPELESS_RUNS, size=None, cache=None, progress=None,
+          store=None):
+    """
+    Joue `n_games` parties par configuration (mêmes graines pour toutes) et
+    renvoie un résultat par configuration distincte, dans l'ordre.
+
+    `cache` = ResultCache (None, ou politique sans code connu : tout
+    recalculer) ; `progress(résultat)`
+    est appelée à chaque configuration terminée ; `store` =
+    results.ResultsStore qui reçoit les parties des configurations jouées
+    (celles lues dans le cache n'y ajoutent rien).
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    size = tuple(size) if size is not None else (MAP_ROWS, MAP_COLS)
+    if policy_version(policy) is None:
+        cache = None
+
+    # configurations distinctes, vérifiées avant de lancer les workers
+    unique = {}
+    for config in configs:
+        with configured(config):
+            pass
+        key = cache_key(config, first_seed, n_games, policy, end_hopeless, size)
+        unique.setdefault(key, config)
+
+    results = {}
+    todo = []
+    for key, config in unique.items():
+        result = cache.get(key) if cache is not None else None
+        if result is not None:
+            result["cached"] = True
+            results[key] = result
+            if progress is not None:
+                progress(result)
+        else:
+            todo.append((key, config))
+
+    # lots : assez pour occuper tous les workers, même avec peu de configurations
+    seeds = list(range(first_seed, first_seed + n_games))
+    n_shards = -(-workers * SHARDS_PER_WORKER // max(1, len(todo)))
+    shards = _shard_seeds(seeds, n_shards)
+    tasks = [
+        (key, config, shard, policy, end_hopeless, size, store is not None)
+        for key, config in todo
+        for shard in shards
+    ]
+    if store is not None:
+        for key, config in todo:
+            store.add_config(config_hash(config), config)
+    remaining = Counter(task[0] for task in tasks)
+    partial = {key: (Counter(), Counter(), [0.0]) for key, _ in todo}
+
+    def collect(key, outcomes, steps_used, records, elapsed):
+        if store is not None:
+            store.add_games(config_hash(unique[key]), policy, size, records)
+        total_outcomes, total_steps, total_elapsed = partial[key]
+        total_outcomes.update(outcomes)
+        total_steps.update(steps_used)
+        total_elapsed[0] += elapsed
+        remaining[key] -= 1
+        if remaining[key]:
+            return
+        config = unique[key]
+        result = {
+            "config": config,
+            "config_hash": config_hash(config),
+            "engine": engine_version(),
+            "seeds": [first_seed, n_games],
+            "policy": policy,
+            "end_hopeless": end_hopeless,
+            "size": list(size),
+            # temps de calcul cumulé des lots (tous workers confondus)
+            "elapsed": total_elapsed[0],
+        }
+        result.update(summarize(total_outcomes, total_steps))
+        if cache is not None:
+            cache.put(key, result)
+        result["cached"] = False
+        results[key] = result
+        if progress is not None:
+            progress(result)
+
+    if workers == 1:
+        for task in tasks:
+            collect(*_run_config_shard(task))
+    elif tasks:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_config_shard, task) for task in tasks]
+            for future in as_completed(futures):
+                collect(*future.result())
+
+    return [results[key] for key in unique]
+
+
+# ------------------------------------------------------
+# Rapport
+# ------------------------------------------------------
+def describe(config):
+    if not config:
+        return "(valeurs du jeu)"
+    return " ".join(f"{name}={json.dumps(value)}" for name, value in sorted(config.items()))
+
+
+def _mean_steps(distribution):
+    n = sum(distribution.values()) or 1
+    return sum(v * c for v, c in distribution.items()) / n
+
+
+def print_report(results, top=None):
+    ranked = sorted(results, key=lambda r: -r["win_rate"])
+    if top is not None:
+        ranked = ranked[:top]
+    print(f"{'victoires':>9} {'bloqué':>7} {'pas':>7} {'sans issue':>10} "
+          f"{'pas moy.':>8}  configuration")
+    for result in ranked:
+        print(f"{result['win_rate']:9.2%} {result['stuck_rate']:7.2%} "
+              f"{result['step_out_rate']:7.2%} {result['hopeless_rate']:10.2%} "
+              f"{_mean_steps(result['steps_used']):8.1f}  {describe(result['config'])}")
+
+
+# ------------------------------------------------------
+# Ligne de commande :
+#   python main.py sweep -P inventory.steps=[50,70,90] -P room.Shop.cost=[0,1,2]
+#   python main.py sweep --random 30 -P 'inventory.gems={"min":0,"max":6}'
+# ------------------------------------------------------
+def _parse_parameter(text):
+    name, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"attendu nom=valeurs : {text}")
+    try:
+        value = json.loads(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"valeurs JSON invalides pour {name} : {value}")
+    if not isinstance(value, (list, dict)):
+        value = [value]
+    return name, value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="sweep",
+        description="Balayage de paramètres d'équilibrage, résultats en cache.",
+    )
+    parser.add_argument("-P", "--param", dest="params", action="append", default=[],
+                        type=_parse_parameter, metavar="NOM=VALEURS",
+                        help="paramètre et valeurs en JSON (liste, ou {\"min\", \"max\"})")
+    parser.add_argument("--spec", help="fichier JSON {paramètre: valeurs}")
+    parser.add_argument("--random", type=int, default=None, metavar="N",
+                        help="N configurations tirées au hasard au lieu de la grille")
+    parser.add_argument("--search-seed", type=int, default=0,
+                        help="graine du tirage des configurations (--random)")
+    parser.add_argument("-n", "--games", type=int, default=1000,
+                        help="parties par configuration")
+    parser.add_argument("-p", "--policy", default="random",
+                        help="politique : random, greedy ou module:fonction")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="nombre de processus (défaut : tous les cœurs)")
+    parser.add_argument("-s", "--seed", type=int, default=0,
+                        help="première graine des parties")
+    parser.add_argument("--prune", dest="prune", action="store_true",
+                        default=END_HOPELESS_RUNS,
+                        help="arrêter les parties sans issue (solver)")
+    parser.add_argument("--no-prune", dest="prune", action="store_false",
+                        help="jouer toutes les parties jusqu'au bout")
+    parser.add_argument("--rows", type=int, default=MAP_ROWS,
+                        help="nombre de lignes du manoir")
+    parser.add_argument("--cols", type=int, default=MAP_COLS,
+                        help="nombre de colonnes du manoir")
+    parser.add_argument("--cache", default=SWEEP_CACHE_DIR,
+                        help="dossier du cache des résultats")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="tout recalculer sans lire ni écrire le cache")
+    parser.add_argument("--no-baseline", action="store_true",
+                        help="ne pas jouer les valeurs du jeu en référence")
+    parser.add_argument("--top", type=int, default=None,
+                        help="n'afficher que les N meilleures configurations")
+    parser.add_argument("--json", help="écrire tous les résultats dans ce fichier")
+    parser.add_argument("--db", nargs="?", const=RESULTS_DB, default=None,
+                        help=f"enregistrer chaque partie jouée dans une base SQLite "
+                             f"(défaut : {RESULTS_DB})")
+    args = parser.parse_args(argv)
+
+    space = {}
+    if args.spec:
+        with open(args.spec, encoding="utf-8") as f:
+            space.update(json.load(f))
+    space.update(dict(args.params))
+
+    if args.random is not None:
+        configs = list(random_search(space, args.random, args.search_seed))
+    else:
+        configs = list(grid(space)) if space else []
+    if not args.no_baseline:
+        configs.insert(0, {})
+
+    cache = None if args.no_cache else ResultCache(args.cache)
+    store = None
+    if args.db:
+        from results import ResultsStore
+        store = ResultsStore(args.db)
+    done = [0]
+
+    def progress(result):
+        done[0] += 1
+        origin = "cache" if result["cached"] else f"{result['elapsed']:.1f} s"
+        print(f"[{done[0]}] {result['win_rate']:7.2%}  {describe(result['config'])} ({origin})")
+
+    if cache is not None and policy_version(args.policy) is None:
+        print(f"Code de la politique {args.policy} introuvable : résultats non mis en cache.")
+
+    start = time.perf_counter()
+    try:
+        results = sweep(configs, args.games, args.policy, args.workers, args.seed,
+                        args.prune, (args.rows, args.cols), cache, progress, store)
+    except (ValueError, TypeError) as e:
+        parser.error(str(e))
+    finally:
+        if store is not None:
+            store.close()
+    elapsed = time.perf_counter() - start
+
+    computed = sum(not r["cached"] for r in results)
+    print()
+    print(f"{len(results)} configuration(s), {len(results) - computed} en cache, "
+          f"{computed} calculée(s) en {elapsed:.1f} s "
+          f"({args.games} parties chacune, moteur {engine_version()})")
+    print_report(results, args.top)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    return results
+
+
+if __name__ == "__main__":
+    main()
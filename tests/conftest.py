@@ -0,0 +1,14 @@
+import sys
+import os
+
+# ==== FIX DES IMPORTS ====
+CURRENT_FILE = os.path.abspath(__file__)
+TESTS_PATH = os.path.dirname(CURRENT_FILE)
+PROJECT_PATH = os.path.dirname(TESTS_PATH)
+
+if PROJECT_PATH not in sys.path:
+    sys.path.insert(0, PROJECT_PATH)
+# ==========================
+
+# les tests ne doivent jamais ouvrir de fenêtre
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
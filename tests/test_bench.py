@@ -0,0 +1,42 @@
+import json
+
+from bench import compare, main
+
+# une seule série très courte : seul le code de sortie compte ici
+FAST = ["rules.can_move", "--min-time", "0.01", "--repeat", "1"]
+
+
+def _result(ops, peak):
+    return {"ops_per_sec": ops, "peak_bytes": peak, "ops": 1}
+
+
+def test_compare_flags_speed_and_memory():
+    baseline = {"results": {
+        "slow": _result(1000, 10000),
+        "fat": _result(1000, 10000),
+        "noise": _result(1000, 100),
+        "steady": _result(1000, 10000),
+    }}
+    results = {
+        "slow": _result(700, 10000),
+        "fat": _result(1000, 20000),
+        # pic triplé, mais de quelques centaines d'octets seulement
+        "noise": _result(1000, 300),
+        "steady": _result(900, 14000),
+        "new": _result(1, 10 ** 9),
+    }
+    assert compare(results, baseline) == [
+        ("slow", "débit", 0.7),
+        ("fat", "pic mémoire", 2.0),
+    ]
+
+
+def test_missing_baseline_fails_unless_saving(tmp_path):
+    path = str(tmp_path / "bench_baseline.json")
+    assert main(FAST + ["--baseline", path]) != 0
+
+    assert main(FAST + ["--baseline", path, "--save"]) == 0
+    with open(path, encoding="utf-8") as f:
+        assert "rules.can_move" in json.load(f)["results"]
+    # contre sa propre référence (seuil large : la série est très courte)
+    assert main(FAST + ["--baseline", path, "--threshold", "0.9"]) == 0
@@ -0,0 +1,62 @@
+import os
+import json
+
+import pygame
+
+import utils.fonts as fonts
+
+
+def _setup(monkeypatch, tmp_path, found):
+    """Cache dans tmp_path, dossier de polices factice, scan compté."""
+    cache = tmp_path / "fonts.json"
+    font_dir = tmp_path / "fonts"
+    font_dir.mkdir()
+    monkeypatch.setattr(fonts, "FONT_CACHE", str(cache))
+    monkeypatch.setattr(fonts, "_FONT_DIRS", (str(font_dir),))
+    monkeypatch.setattr(fonts, "_PATHS", None)
+    scans = []
+
+    def match_font(name, bold=False):
+        scans.append((name, bold))
+        return found
+    monkeypatch.setattr(pygame.font, "match_font", match_font)
+    return cache, font_dir, scans
+
+
+def _new_process(monkeypatch):
+    monkeypatch.setattr(fonts, "_PATHS", None)
+
+
+def test_missing_font_is_remembered_across_starts(monkeypatch, tmp_path):
+    cache, font_dir, scans = _setup(monkeypatch, tmp_path, None)
+    assert fonts.font_paths("nofont")["regular"] is None
+    assert len(scans) == 2
+    assert json.loads(cache.read_text())["nofont"]["regular"] is None
+
+    # démarrage suivant : pas de nouveau scan
+    _new_process(monkeypatch)
+    assert fonts.font_paths("nofont")["bold"] is None
+    assert len(scans) == 2
+
+    # une police installée depuis : on cherche à nouveau
+    (font_dir / "newfont").mkdir()
+    os.utime(font_dir / "newfont", ns=(1, 2 ** 62))
+    _new_process(monkeypatch)
+    fonts.font_paths("nofont")
+    assert len(scans) == 4
+
+
+def test_found_font_rescanned_only_if_file_disappears(monkeypatch, tmp_path):
+    font_file = tmp_path / "arial.ttf"
+    font_file.write_bytes(b"")
+    cache, font_dir, scans = _setup(monkeypatch, tmp_path, str(font_file))
+    assert fonts.font_paths("somefont")["regular"] == str(font_file)
+
+    _new_process(monkeypatch)
+    fonts.font_paths("somefont")
+    assert len(scans) == 2
+
+    font_file.unlink()
+    _new_process(monkeypatch)
+    fonts.font_paths("somefont")
+    assert len(scans) == 4
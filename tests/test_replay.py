@@ -0,0 +1,70 @@
+import random
+
+from engine import Engine, MOVE, PICK, REROLL
+from policies import get_policy
+from snapshot import GameState
+from replay import (
+    Replay, Replayer, ReplayRecorder, OP_DIR, OP_CONFIRM, OP_REROLL, OP_SELECT, OP_ENTER,
+)
+
+
+def _record(path, seed, moves=None, interval=20):
+    """Joue une partie avec la politique aléatoire en enregistrant ses entrées."""
+    policy = get_policy("random")
+    rng = random.Random(seed)
+    engine = Engine(seed)
+    recorder = ReplayRecorder(str(path), engine, interval)
+    played = 0
+    while not engine.is_over() and (moves is None or played < moves):
+        action = policy(engine, rng)
+        if action[0] == MOVE:
+            recorder.record(OP_DIR, action[1].value)
+            recorder.record(OP_CONFIRM)
+            result = engine.step(action)
+            recorder.checkpoint(None if result == "BLOCKED" else action[1], 0)
+        elif action[0] == PICK:
+            recorder.record(OP_SELECT, action[1])
+            recorder.record(OP_ENTER)
+            engine.step(action)
+            recorder.checkpoint(None, action[1])
+        else:
+            recorder.record(OP_REROLL)
+            engine.step((REROLL,))
+            recorder.checkpoint(None, 0)
+        played += 1
+    recorder.close()
+    return engine
+
+
+def test_record_then_verify(tmp_path):
+    for seed in range(5):
+        path = tmp_path / f"{seed}.replay"
+        engine = _record(path, seed, interval=3)
+        replay = Replay.load(str(path))
+        assert replay.snapshots
+        assert Replayer(replay).verify() is None
+        final = Replayer(replay).run()
+        assert final.snapshot() == engine.snapshot()
+
+
+def test_short_game_still_has_a_final_snapshot(tmp_path):
+    path = tmp_path / "short.replay"
+    _record(path, 1, moves=4, interval=20)
+    replay = Replay.load(str(path))
+    assert len(replay.snapshots) == 1
+    assert replay.snapshots[0][0] == replay.total_moves
+    assert Replayer(replay).verify() is None
+
+
+def test_verify_detects_rng_divergence(tmp_path):
+    path = tmp_path / "rng.replay"
+    _record(path, 2, moves=6, interval=20)
+    replay = Replay.load(str(path))
+
+    # même position, mais un flux de hasard de plus a servi
+    move, pos, selected, index, data = replay.snapshots[-1]
+    state = GameState.from_bytes(data)
+    seed, counters = state.rng_state
+    state.rng_state = (seed, counters + (((99, 0, 0), 1),))
+    replay.snapshots[-1] = (move, pos, selected, index, state.to_bytes())
+    assert Replayer(replay).verify() == move
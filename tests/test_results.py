@@ -0,0 +1,72 @@
+import sqlite3
+
+import pytest
+
+from engine import OUTCOME_WIN
+from results import ResultsStore, iter_games, win_rates, room_frequencies
+
+
+def _records(n, first_seed=0):
+    """n parties : une sur deux gagnée, salles posées selon la graine."""
+    return [
+        (seed, OUTCOME_WIN if seed % 2 == 0 else "NO_STEPS", 40, 1, 2, 3,
+         (("Blue", 1 + seed % 3), ("Green", 1)))
+        for seed in range(first_seed, first_seed + n)
+    ]
+
+
+def test_close_flushes_everything(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    # petit lot, délai long : seule la taille du lot (et close) déclenche l'écriture
+    store = ResultsStore(path, batch=4, flush_every=60)
+    store.add_config("a", {"inventory.steps": 50})
+    store.add_games("a", "random", (5, 9), _records(5))
+    store.add_games("a", "random", (5, 9), _records(4, first_seed=5))
+    store.add_games("a", "random", (5, 9), [])
+    store.add_games("a", "random", (5, 9), _records(1, first_seed=9))
+    store.close()
+
+    assert store.written == 10
+    # 5 puis 4 parties : deux transactions pleines, le reste écrit par close()
+    assert store.transactions == 3
+
+    games = list(iter_games(path))
+    assert [g["seed"] for g in games] == list(range(10))
+    assert [g["id"] for g in games] == list(range(1, 11))
+    assert games[4]["rooms"] == {"Blue": 2, "Green": 1}
+    assert (games[0]["map_rows"], games[0]["map_cols"], games[0]["policy"]) == (5, 9, "random")
+
+
+def test_reopen_appends_and_summaries(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    store = ResultsStore(path, batch=100, flush_every=60)
+    store.add_config("a", {"inventory.steps": 50})
+    store.add_games("a", "random", (5, 9), _records(4))
+    store.close()
+    assert store.transactions == 1
+
+    # une seconde écriture reprend la numérotation des parties
+    store = ResultsStore(path, batch=100, flush_every=60)
+    store.add_config("b", {"inventory.steps": 70})
+    store.add_games("b", "greedy", (5, 9), _records(2, first_seed=100))
+    store.close()
+
+    games = list(iter_games(path, config_hash="b"))
+    assert [(g["id"], g["seed"]) for g in games] == [(5, 100), (6, 101)]
+    assert games[1]["rooms"] == {"Blue": 3, "Green": 1}
+
+    rates = {h: (config, n, wins) for h, config, n, wins in win_rates(path)}
+    assert rates == {
+        "a": ('{"inventory.steps": 50}', 4, 2),
+        "b": ('{"inventory.steps": 70}', 2, 1),
+    }
+    assert room_frequencies(path) == [("Blue", 12), ("Green", 6)]
+    assert room_frequencies(path, "b") == [("Blue", 5), ("Green", 2)]
+
+
+def test_close_raises_write_error(tmp_path):
+    store = ResultsStore(str(tmp_path / "absent" / "results.sqlite"))
+    store.add_games("a", "random", (5, 9), _records(3))
+    with pytest.raises(sqlite3.Error):
+        store.close()
+    assert store.written == 0
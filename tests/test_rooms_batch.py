@@ -0,0 +1,66 @@
+from collections import Counter
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from rooms_batch import pick_random_rooms_batch
+from rooms_catalog import pick_random_rooms
+from utils.direction import Direction
+from utils.rng import CounterRandom
+
+N = 10000
+# écart total toléré entre les deux lois empiriques (bruit ~ 0.01 à N tirages)
+TOLERANCE = 0.03
+
+# direction du joueur, case cible : milieu, coin, bord, case inconnue
+CASES = [
+    (Direction.TOP, 2, 4),
+    (Direction.LEFT, 0, 0),
+    (Direction.BOTTOM, 4, 8),
+    (Direction.RIGHT, -1, -1),
+]
+
+
+def _summary(draws):
+    """Lois empiriques : (emplacement, nom), nombre de cartes gratuites, niveaux de verrou."""
+    names, free, locks = Counter(), Counter(), Counter()
+    for rooms in draws:
+        for slot, room in enumerate(rooms):
+            names[slot, room.name] += 1
+            for door in room.doors:
+                locks[door.lock_state.value] += 1
+        free[sum(room.cost == 0 for room in rooms)] += 1
+    return names, free, locks
+
+
+def _distance(a, b):
+    """Distance en variation totale entre deux comptages."""
+    na, nb = sum(a.values()), sum(b.values())
+    return sum(abs(a[k] / na - b[k] / nb) for k in set(a) | set(b)) / 2
+
+
+@pytest.mark.parametrize("direction, row, col", CASES)
+def test_batch_matches_scalar_law(direction, row, col):
+    scalar_row = None if row < 0 else row
+    scalar_col = None if col < 0 else col
+    scalar = [
+        pick_random_rooms(direction, scalar_row, scalar_col, rng=CounterRandom(i))
+        for i in range(N)
+    ]
+    batch = pick_random_rooms_batch([direction] * N, [row] * N, [col] * N, rng=1234)
+    assert len(batch) == N
+    batch = [batch.rooms(i) for i in range(N)]
+
+    for a, b in zip(_summary(scalar), _summary(batch)):
+        assert _distance(a, b) < TOLERANCE, (a, b)
+
+
+def test_batch_codes_match_rooms():
+    batch = pick_random_rooms_batch(
+        [d for d, _, _ in CASES] * 50, [r for _, r, _ in CASES] * 50,
+        [c for _, _, c in CASES] * 50, rng=7,
+    )
+    codes = batch.codes()
+    for i in range(len(batch)):
+        assert [int(code) for code in codes[i]] == [room.code for room in batch.rooms(i)]
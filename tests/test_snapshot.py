@@ -0,0 +1,89 @@
+import os
+import random
+import subprocess
+import sys
+
+from chunks import ChunkedCells
+from engine import Engine
+from policies import get_policy
+from snapshot import GameState
+
+PROJECT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _states(seeds=range(20)):
+    """Instantanés de chaque coup de quelques parties aléatoires."""
+    policy = get_policy("random")
+    for seed in seeds:
+        engine = Engine(seed)
+        rng = random.Random(seed)
+        while True:
+            yield engine, GameState.capture(engine)
+            if engine.is_over():
+                break
+            engine.step(policy(engine, rng))
+
+
+def test_round_trip():
+    for _, state in _states():
+        back = GameState.from_bytes(state.to_bytes())
+        assert back == state
+        assert back.rng_state == state.rng_state
+        assert back.steps_used == state.steps_used
+        assert back.to_bytes() == state.to_bytes()
+
+
+def test_restore_plays_on_identically():
+    policy = get_policy("random")
+    engine = Engine(3)
+    rng = random.Random(3)
+    for _ in range(6):
+        engine.step(policy(engine, rng))
+    data = engine.snapshot().to_bytes()
+    state_rng = rng.getstate()
+
+    copy = Engine(0)
+    GameState.from_bytes(data).restore(copy)
+    copy_rng = random.Random()
+    copy_rng.setstate(state_rng)
+    while not engine.is_over():
+        engine.step(policy(engine, rng))
+        copy.step(policy(copy, copy_rng))
+    assert copy.snapshot() == engine.snapshot()
+    assert copy.outcome == engine.outcome
+
+
+def test_cells_are_little_endian():
+    cells = ChunkedCells(2, 2)
+    cells.set(0, 1, 0x01020304)
+    data = cells.tobytes()
+    assert b"\x04\x03\x02\x01" in data
+    assert ChunkedCells.frombytes(data).get(0, 1) == 0x01020304
+
+
+def test_room_types_survive_another_registry(tmp_path):
+    # un autre processus crée ses types de salle dans un autre ordre :
+    # les ids diffèrent, les salles relues doivent rester les mêmes
+    engine, state = list(_states([5]))[-1]
+    path = tmp_path / "state.bin"
+    path.write_bytes(state.to_bytes())
+    expected = sorted(
+        (r, c, engine.maison.room_at(r, c).name, engine.maison.room_at(r, c).cost)
+        for r, c, _ in engine.maison.cells.items()
+    )
+
+    script = (
+        "import sys; sys.path.insert(0, {root!r})\n"
+        "import models\n"
+        "models.room_type('Extra', 'red', 9, 3)\n"
+        "from engine import Engine\n"
+        "from snapshot import GameState\n"
+        "e = Engine(0)\n"
+        "GameState.from_bytes(open({path!r}, 'rb').read()).restore(e)\n"
+        "rooms = sorted((r, c, e.maison.room_at(r, c).name, e.maison.room_at(r, c).cost)\n"
+        "               for r, c, _ in e.maison.cells.items())\n"
+        "print(repr(rooms))\n"
+    ).format(root=PROJECT_PATH, path=str(path))
+    out = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True,
+                         check=True).stdout
+    assert out.strip() == repr(expected)
@@ -0,0 +1,68 @@
+import time
+
+from engine import Engine, OUTCOME_WIN, OUTCOME_HOPELESS
+from policies import get_policy
+from simulate import play_game
+from solver import solve, goal_reachable
+
+
+def test_hopeless_only_for_lost_games():
+    greedy = get_policy("greedy")
+    hopeless = 0
+    for seed in range(200):
+        if play_game(seed, greedy).outcome != OUTCOME_HOPELESS:
+            continue
+        hopeless += 1
+        # jouée jusqu'au bout, la partie n'est jamais gagnée
+        assert play_game(seed, greedy, end_hopeless=False).outcome != OUTCOME_WIN
+    assert hopeless > 0
+
+
+def test_search_budget_leaves_verdict_open():
+    engine = Engine(0, size=(1000, 1000))
+    args = (engine.maison, engine.inventory, engine.player)
+    assert solve(*args, explore=True, max_states=50).reachable is None
+    # sans conclusion, la partie continue
+    assert goal_reachable(*args, max_states=50)
+
+
+def test_check_fits_a_frame_on_huge_maps():
+    engine = Engine(0, size=(3000, 3000))
+    start = time.perf_counter()
+    for _ in range(5):
+        assert goal_reachable(engine.maison, engine.inventory, engine.player)
+    # borné par HOPELESS_MAX_STATES : quelques ms (plusieurs centaines avant)
+    assert (time.perf_counter() - start) / 5 < 0.05
+
+
+def test_large_map_game_stays_fast():
+    start = time.perf_counter()
+    engine = play_game(0, get_policy("greedy"), size=(1000, 1000))
+    assert engine.is_over()
+    # ~0.5 s ici ; plus de 30 s quand la vérification parcourait le manoir
+    assert time.perf_counter() - start < 10
+
+
+def test_verdict_cached_until_a_room_is_placed(monkeypatch):
+    engine = Engine(0)
+    maison, inventory, player = engine.maison, engine.inventory, engine.player
+    calls = []
+
+    def counted(*args, **kwargs):
+        calls.append(args)
+        return goal_reachable(*args, **kwargs)
+    monkeypatch.setattr("maison.goal_reachable", counted)
+
+    # verdict déjà tranché par Engine.reset, et plus de pas n'y change rien
+    assert maison.goal_reachable(player, inventory)
+    inventory.steps += 5
+    assert maison.goal_reachable(player, inventory)
+    assert calls == []
+
+    # une salle posée : la vérification est refaite, une seule fois
+    engine.step(engine.legal_actions()[0])
+    engine.step(engine.legal_actions()[0])
+    assert maison.placements
+    assert len(calls) == 1
+    assert maison.goal_reachable(player, inventory)
+    assert len(calls) == 1
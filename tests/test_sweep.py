@@ -0,0 +1,80 @@
+import copy
+
+import pytest
+
+import rooms_catalog
+import sweep
+from models import STARTING_INVENTORY, SHOP_PRICES, Inventory
+from rooms_catalog import ROOM_DEFS, LOCK_BANDS
+
+
+def _globals():
+    return (
+        dict(STARTING_INVENTORY), dict(SHOP_PRICES), list(LOCK_BANDS),
+        copy.deepcopy(ROOM_DEFS), tuple(rooms_catalog._CATALOG_SIZE),
+    )
+
+
+def _draws():
+    """Tirages fixes du catalogue compilé : (nom, coût) des cartes."""
+    from utils.direction import Direction
+    from utils.rng import CounterRandom
+    rng = CounterRandom(0)
+    return [
+        [(room.name, room.cost) for room in rooms_catalog.pick_random_rooms(Direction.TOP, 2, 4, rng=rng)]
+        for _ in range(50)
+    ]
+
+
+CONFIG = {
+    "inventory.steps": 12,
+    "shop.key": 7,
+    "room.Blue.cost": 5,
+    "locks.0": [1, 1, 1],
+    "locks.1.until": 0.5,
+}
+
+
+def test_configured_applies_then_restores():
+    before = _globals()
+    draws = _draws()
+    with sweep.configured(CONFIG):
+        assert ("Blue", 5) in {card for draw in _draws() for card in draw}
+        assert Inventory().steps == 12
+        assert SHOP_PRICES["key"] == 7
+        assert next(d for d in ROOM_DEFS if d["name"] == "Blue")["cost"] == 5
+        assert LOCK_BANDS[0][1] == pytest.approx((1 / 3, 1 / 3, 1 / 3))
+        assert LOCK_BANDS[1][0] == 0.5
+    assert _globals() == before
+    # le catalogue est recompilé avec les valeurs du jeu
+    assert _draws() == draws
+
+
+def test_configured_restores_after_an_error():
+    before = _globals()
+    with pytest.raises(ValueError):
+        with sweep.configured({"inventory.steps": 12, "room.Nope.cost": 1}):
+            pass
+    with pytest.raises(RuntimeError):
+        with sweep.configured(CONFIG):
+            raise RuntimeError
+    assert _globals() == before
+
+
+def test_cache_key_follows_config_and_policy_code():
+    key = sweep.cache_key(CONFIG, 0, 10, "random", True, (5, 9))
+    assert key == sweep.cache_key(dict(reversed(CONFIG.items())), 0, 10, "random", True, (5, 9))
+    assert key != sweep.cache_key({}, 0, 10, "random", True, (5, 9))
+    assert sweep.policy_version("random") == ""
+    assert sweep.policy_version("mcts")
+    assert sweep.policy_version("no_such_module:f") is None
+
+
+def test_sweep_uses_the_cache(tmp_path):
+    cache = sweep.ResultCache(str(tmp_path))
+    configs = [{}, {"inventory.steps": 20}]
+    first = sweep.sweep(configs, 20, workers=1, cache=cache)
+    again = sweep.sweep(configs, 20, workers=1, cache=cache)
+    assert [r["cached"] for r in first] == [False, False]
+    assert [r["cached"] for r in again] == [True, True]
+    assert [r["win_rate"] for r in again] == [r["win_rate"] for r in first]
@@ -5,3 +5,20 @@ class Direction(Enum):
     RIGHT = 1
     BOTTOM = 2
     LEFT = 3
+
+
+# Décalage (dr, dc) associé à chaque direction dans la grille
+DELTAS = {
+    Direction.TOP: (-1, 0),
+    Direction.RIGHT: (0, 1),
+    Direction.BOTTOM: (1, 0),
+    Direction.LEFT: (0, -1),
+}
+
+# Directions rangées par valeur, et pour chaque valeur :
+# (dr, dc, valeur de la direction opposée)
+DIRECTIONS = list(Direction)
+DIRECTION_STEPS = [
+    (dr, dc, next(o.value for o, delta in DELTAS.items() if delta == (-dr, -dc)))
+    for dr, dc in (DELTAS[d] for d in DIRECTIONS)
+]
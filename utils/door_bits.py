@@ -0,0 +1,79 @@
+from utils.direction import Direction
+from utils.lock_state import LockState
+
+# ------------------------------------------------------
+# Représentation compacte des portes d'une case
+#
+# 2 bits par direction (bits 2*d et 2*d+1, d = Direction.value) :
+#   0 = pas de porte, 1 = UNLOCKED, 2 = LOCKED, 3 = DOUBLE_LOCKED
+# Un code de case complet vaut (id du type de salle << 8) | portes,
+# l'id 0 étant réservé à la case vide.
+# ------------------------------------------------------
+DOOR_BITS = 8
+DOOR_MASK = (1 << DOOR_BITS) - 1
+NO_DOOR = -1
+
+_DIRECTIONS = list(Direction)
+_LOCK_STATES = list(LockState)
+
+
+def door_bits(direction, lock_state):
+    return (lock_state.value + 1) << (2 * direction.value)
+
+
+def pack_doors(doors):
+    """Liste de Door -> entier sur 8 bits."""
+    mask = 0
+    for door in doors:
+        mask |= door_bits(door.direction, door.lock_state)
+    return mask
+
+
+def unpack_doors(mask):
+    """Entier sur 8 bits -> liste de (Direction, LockState)."""
+    doors = []
+    for direction in _DIRECTIONS:
+        bits = (mask >> (2 * direction.value)) & 3
+        if bits:
+            doors.append((direction, _LOCK_STATES[bits - 1]))
+    return doors
+
+
+def door_level(mask, direction):
+    """Niveau de verrou de la porte dans `direction`, ou NO_DOOR."""
+    return ((mask >> (2 * direction.value)) & 3) - 1
+
+
+def door_keys(level, lockpick):
+    """Clés consommées par Door.open pour ce niveau de verrou (0 ou 1)."""
+    if level <= 0 or (level == 1 and lockpick):
+        return 0
+    return 1
+
+
+_KNOWN_DOORS = {}
+
+
+def known_doors(code):
+    """Portes (valeur de direction, niveau) d'une salle posée, par code de case."""
+    doors = _KNOWN_DOORS.get(code)
+    if doors is None:
+        mask = cell_doors(code)
+        doors = [
+            (d.value, door_level(mask, d))
+            for d in _DIRECTIONS if door_level(mask, d) >= 0
+        ]
+        _KNOWN_DOORS[code] = doors
+    return doors
+
+
+def cell_code(type_id, mask):
+    return (type_id << DOOR_BITS) | mask
+
+
+def cell_type(code):
+    return code >> DOOR_BITS
+
+
+def cell_doors(code):
+    return code & DOOR_MASK
@@ -0,0 +1,177 @@
+import os
+import sys
+import json
+from collections import OrderedDict
+
+import pygame
+
+from settings import FONT_NAME, TEXT_CACHE_SIZE, FONT_CACHE, FONT_PRELOAD
+
+
+# ------------------------------------------------------
+# Fichiers de police
+# Trouver une police du système (SysFont / match_font) lance un scan
+# complet des polices (fc-list…) : on le fait une seule fois, et le
+# résultat est gardé sur disque (FONT_CACHE) pour les démarrages
+# suivants. Un chemin trouvé reste valable tant que le fichier existe ;
+# une police introuvable le reste tant que les dossiers de polices du
+# système n'ont pas changé (fonts_stamp). Supprimer FONT_CACHE force un
+# nouveau scan.
+# ------------------------------------------------------
+_PATHS = None
+
+# dossiers de polices du système : installer une police y change une date
+if sys.platform == "win32":
+    _FONT_DIRS = (
+        os.path.join(os.environ.get("WINDIR", r"C:\Windows"), "Fonts"),
+        os.path.join(os.environ.get("LOCALAPPDATA", ""), "Microsoft", "Windows", "Fonts"),
+    )
+elif sys.platform == "darwin":
+    _FONT_DIRS = (
+        "/System/Library/Fonts", "/Library/Fonts", os.path.expanduser("~/Library/Fonts"),
+    )
+else:
+    _FONT_DIRS = (
+        "/usr/share/fonts", "/usr/local/share/fonts",
+        os.path.expanduser("~/.fonts"), os.path.expanduser("~/.local/share/fonts"),
+    )
+
+
+def fonts_stamp():
+    """
+    Empreinte des polices du système : version de pygame et date de
+    modification la plus récente des dossiers de polices et de leurs
+    sous-dossiers directs (où les paquets déposent leurs fichiers).
+    """
+    newest = 0
+    for top in _FONT_DIRS:
+        try:
+            newest = max(newest, os.stat(top).st_mtime_ns)
+            with os.scandir(top) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        newest = max(newest, entry.stat().st_mtime_ns)
+        except OSError:
+            continue
+    return f"{pygame.version.ver}:{newest}"
+
+
+def _load_paths():
+    global _PATHS
+    _PATHS = {}
+    if FONT_CACHE and os.path.exists(FONT_CACHE):
+        try:
+            with open(FONT_CACHE, encoding="utf-8") as f:
+                _PATHS = json.load(f)
+        except (OSError, ValueError):
+            _PATHS = {}
+    return _PATHS
+
+
+def _still_valid(entry):
+    found = (entry.get("regular"), entry.get("bold"))
+    if None not in found:
+        return all(os.path.exists(p) for p in found)
+    # police (en partie) introuvable : rien n'a été installé depuis ?
+    return entry.get("stamp") == fonts_stamp()
+
+
+def font_paths(name=FONT_NAME):
+    """
+    Fichiers de la police `name` : {"regular": chemin, "bold": chemin}
+    (None = police par défaut de pygame). Même choix que SysFont.
+    """
+    paths = _PATHS if _PATHS is not None else _load_paths()
+    entry = paths.get(name)
+    if entry is not None and _still_valid(entry):
+        return entry
+
+    # scan des polices du système (lent)
+    entry = {
+        "regular": pygame.font.match_font(name),
+        "bold": pygame.font.match_font(name, bold=True),
+        "stamp": fonts_stamp(),
+    }
+    paths[name] = entry
+    if FONT_CACHE:
+        try:
+            with open(FONT_CACHE, "w", encoding="utf-8") as f:
+                json.dump(paths, f, indent=2)
+        except OSError:
+            pass
+    return entry
+
+
+# ------------------------------------------------------
+# Registre de polices : une seule Font par (nom, taille, gras)
+# ------------------------------------------------------
+_FONTS = {}
+
+
+def get_font(size, bold=False, name=FONT_NAME):
+    """Retourne la police partagée correspondant à (nom, taille, gras)."""
+    key = (name, size, bold)
+    font = _FONTS.get(key)
+    if font is None:
+        paths = font_paths(name)
+        path = paths["bold"] if bold else paths["regular"]
+        font = pygame.font.Font(path, size)
+        # pas de fichier gras distinct : gras simulé, comme SysFont
+        if bold and (path is None or path == paths["regular"]):
+            font.set_bold(True)
+        _FONTS[key] = font
+    return font
+
+
+def preload_fonts(sizes=FONT_PRELOAD, name=FONT_NAME):
+    """Crée d'avance les polices de l'interface (tailles, gras)."""
+    for size, bold in sizes:
+        get_font(size, bold, name)
+
+
+# ------------------------------------------------------
+# Cache LRU des surfaces de texte
+# ------------------------------------------------------
+class TextCache:
+    """
+    Garde les derniers textes rendus, indexés par (police, texte, couleur).
+    Les compteurs hits / misses permettent de vérifier qu'une image
+    stable ne crée plus aucune surface.
+    """
+
+    def __init__(self, maxsize=TEXT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, color, size, bold=False, name=FONT_NAME):
+        key = ((name, size, bold), text, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = get_font(size, bold, name).render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self.surfaces.clear()
+        self.reset_stats()
+
+
+TEXT_CACHE = TextCache()
+
+
+def render_text(text, color, size, bold=False, name=FONT_NAME):
+    """Rend un texte via le cache partagé."""
+    return TEXT_CACHE.render(text, color, size, bold, name)
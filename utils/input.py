@@ -0,0 +1,31 @@
+import pygame
+
+from settings import IDLE_MODE, IDLE_TIMEOUT_MS
+
+# Événements propres au jeu (réveillent la boucle en mode veille)
+# - DRAW_READY : un tirage calculé d'avance est prêt (pregen.py) ;
+# - WALK_STEP : pas suivant du déplacement automatique.
+DRAW_READY = pygame.USEREVENT + 1
+WALK_STEP = pygame.USEREVENT + 2
+
+
+def next_events(clock, fps, busy=False):
+    """
+    Renvoie les événements à traiter pour l'image suivante.
+
+    En mode veille (IDLE_MODE), on bloque sur `pygame.event.wait` jusqu'à
+    une entrée ou au plus IDLE_TIMEOUT_MS : le processus ne consomme
+    presque rien pendant que le joueur réfléchit. Sinon, ou si la scène
+    avance d'elle-même (`busy` : bot, déplacement automatique, tirages en
+    calcul), boucle classique cadencée à `fps`.
+    """
+    if not IDLE_MODE or busy:
+        clock.tick(fps)
+        return pygame.event.get()
+
+    first = pygame.event.wait(IDLE_TIMEOUT_MS)
+    events = [] if first.type == pygame.NOEVENT else [first]
+    events.extend(pygame.event.get())
+    # garde la limite de fps quand les entrées s'enchaînent
+    clock.tick(fps)
+    return events
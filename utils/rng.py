@@ -0,0 +1,139 @@
+import os
+import random
+
+# ------------------------------------------------------
+# Hasard déterministe "par compteur"
+#
+# Chaque tirage est dérivé de (graine, type de tirage, case, n° de tirage) :
+# le contenu d'une case ne dépend pas de l'ordre dans lequel les autres cases
+# ont été tirées, peut être calculé indépendamment (et en parallèle), et une
+# partie entière se rejoue à l'identique à partir de sa seule graine.
+# ------------------------------------------------------
+MASK64 = (1 << 64) - 1
+GOLDEN = 0x9E3779B97F4A7C15
+_MIX1 = 0xBF58476D1CE4E5B9
+_MIX2 = 0x94D049BB133111EB
+_INV_2_53 = 1.0 / (1 << 53)
+
+# Types de tirage
+ROOM_DRAW = 1    # 3 cartes + verrous des portes
+LOOT = 2         # trouvailles de Room.on_enter
+
+
+def _splitmix64(x):
+    x = (x + GOLDEN) & MASK64
+    x = ((x ^ (x >> 30)) * _MIX1) & MASK64
+    x = ((x ^ (x >> 27)) * _MIX2) & MASK64
+    return x ^ (x >> 31)
+
+
+def _cell_word(kind, row, col):
+    """Type (8 bits), ligne et colonne (28 bits chacune) dans un mot 64 bits."""
+    row = 0xFFFFFFF if row is None else row & 0xFFFFFFF
+    col = 0xFFFFFFF if col is None else col & 0xFFFFFFF
+    return (kind & 0xFF) | (row << 8) | (col << 36)
+
+
+def derive_key(seed, kind, row, col, index):
+    """Clé 64 bits d'un flux, fonction pure de ses coordonnées."""
+    h = _splitmix64(seed & MASK64)
+    h = _splitmix64(h ^ _cell_word(kind, row, col))
+    return _splitmix64(h ^ (index & MASK64))
+
+
+class CounterRandom(random.Random):
+    """
+    Générateur basé sur un compteur : la n-ième valeur vaut
+    splitmix64(clé + n). Hérite de random.Random, donc choice, choices,
+    randint... fonctionnent comme d'habitude.
+    """
+
+    def __init__(self, key=0):
+        self._key = 0
+        self._counter = 0
+        super().__init__(key)
+
+    def seed(self, key=0, version=2):
+        self._key = key & MASK64
+        self._counter = 0
+
+    def getstate(self):
+        return (self._key, self._counter)
+
+    def setstate(self, state):
+        self._key, self._counter = state
+
+    def _next64(self):
+        # splitmix64 déroulé : c'est le chemin le plus chaud
+        self._counter += 1
+        x = (self._key + self._counter * GOLDEN) & MASK64
+        x = ((x ^ (x >> 30)) * _MIX1) & MASK64
+        x = ((x ^ (x >> 27)) * _MIX2) & MASK64
+        return x ^ (x >> 31)
+
+    def random(self):
+        self._counter += 1
+        x = (self._key + self._counter * GOLDEN) & MASK64
+        x = ((x ^ (x >> 30)) * _MIX1) & MASK64
+        x = ((x ^ (x >> 27)) * _MIX2) & MASK64
+        return ((x ^ (x >> 31)) >> 11) * _INV_2_53
+
+    def getrandbits(self, k):
+        bits = 0
+        filled = 0
+        while filled < k:
+            bits |= self._next64() << filled
+            filled += 64
+        return bits & ((1 << k) - 1)
+
+
+# ------------------------------------------------------
+# Service de hasard d'une partie
+# ------------------------------------------------------
+class RngService:
+    """
+    Point d'entrée unique de tout le hasard d'une partie.
+
+    `stream(kind, row, col)` renvoie le générateur du prochain tirage de ce
+    type sur cette case (le compteur de la case avance), ou celui d'un
+    tirage précis avec `index=`. L'état complet tient dans la graine et
+    les compteurs par case.
+    """
+
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), "little")
+        self.seed = seed
+        self.counters = {}
+
+    def reseed(self, seed):
+        """Change la graine en gardant les compteurs (hasards alternatifs)."""
+        self.seed = seed
+
+    def next_index(self, kind, row, col):
+        """Numéro du prochain tirage de ce type sur cette case."""
+        return self.counters.get((kind, row, col), 0)
+
+    def stream(self, kind, row, col, index=None):
+        if index is None:
+            index = self.counters.get((kind, row, col), 0)
+            self.counters[(kind, row, col)] = index + 1
+        return CounterRandom(derive_key(self.seed, kind, row, col, index))
+
+    def getstate(self):
+        return (self.seed, tuple(sorted(self.counters.items())))
+
+    def setstate(self, state):
+        self.seed, counters = state
+        self.counters = dict(counters)
+
+
+_DEFAULT_SERVICE = None
+
+
+def default_service():
+    """Service partagé, pour les appels faits hors d'une partie."""
+    global _DEFAULT_SERVICE
+    if _DEFAULT_SERVICE is None:
+        _DEFAULT_SERVICE = RngService()
+    return _DEFAULT_SERVICE
@@ -0,0 +1,49 @@
+import time
+
+
+# ------------------------------------------------------
+# Temps de démarrage
+#
+# main.py importe ce module en premier : les étapes (imports, init de
+# pygame, fenêtre, polices, première image) sont datées à partir de là.
+# ------------------------------------------------------
+class StartupTimer:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.marks = []
+
+    def mark(self, name):
+        """Fin de l'étape `name`."""
+        self.marks.append((name, time.perf_counter()))
+
+    def steps(self):
+        """[(étape, durée en ms)], dans l'ordre."""
+        result = []
+        previous = self.start
+        for name, t in self.marks:
+            result.append((name, (t - previous) * 1000))
+            previous = t
+        return result
+
+    @property
+    def total_ms(self):
+        return (self.marks[-1][1] - self.start) * 1000 if self.marks else 0.0
+
+    def print_report(self):
+        for name, ms in self.steps():
+            print(f"{name:<14} {ms:8.1f} ms")
+        print(f"{'total':<14} {self.total_ms:8.1f} ms")
+
+    def append_log(self, path):
+        """Ajoute une ligne JSON au journal des démarrages (suivi dans le temps)."""
+        import json
+        entry = {
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "total_ms": round(self.total_ms, 1),
+            "steps": {name: round(ms, 1) for name, ms in self.steps()},
+        }
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+STARTUP = StartupTimer()